@@ -0,0 +1 @@
+# Motores de cálculo del dashboard ICATEX (sin dependencia de Streamlit)
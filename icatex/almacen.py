@@ -0,0 +1,292 @@
+import argparse
+import itertools
+import sqlite3
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+from icatex import esquema
+from icatex.datos import AÑO_INICIAL, HOJAS, completar_pm_matrix, leer_libro
+
+# Almacén analítico embebido (SQLite) como alternativa al libro de Excel. Cada hoja es una
+# tabla en formato largo con la planta como primera columna de la clave primaria, así que
+# varias plantas conviven en la misma base. El libro sigue siendo el formato de importación:
+#
+#   python -m icatex.almacen importar ICATEX_Lingo_4Anios.xlsx icatex.db --planta lima
+#   python -m icatex.almacen plantas icatex.db
+#
+# Los filtros de las secciones (productos, insumos, procesos, años) se resuelven en la
+# consulta sobre los índices (ID, Periodo_Index): solo se materializa el corte pedido.
+
+PLANTA_DEFECTO = 'principal'
+
+HOJAS_RESULTADOS = ['RES_PRODUCCION', 'RES_VENTAS', 'RES_INVENTARIO', 'RES_H_EXTRAS']
+
+# Clave de cada tabla (sin la planta)
+CLAVES = {
+    'SET_PRODUCTOS': ('ID_Producto',),
+    'SET_MESES': ('Mes',),
+    'SET_INSUMOS': ('ID_Insumo',),
+    'SET_PROCESOS': ('ID_Proceso',),
+    'DAT_PI_MATRIX': ('ID_Producto', 'ID_Insumo'),
+    'DAT_PP_MATRIX': ('ID_Producto', 'ID_Proceso'),
+    'DAT_PM_MATRIX': ('ID_Producto', 'Periodo_Index'),
+    'DAT_PJM_MATRIX': ('ID_Proceso', 'Periodo_Index'),
+    'DAT_KM_MATRIX': ('ID_Insumo', 'Periodo_Index'),
+    'DAT_PRODUCTOS_FIJOS': ('ID_Producto',),
+    'RES_PRODUCCION': ('ID_Producto', 'Periodo_Index'),
+    'RES_VENTAS': ('ID_Producto', 'Periodo_Index'),
+    'RES_INVENTARIO': ('ID_Producto', 'Periodo_Index'),
+    'RES_H_EXTRAS': ('ID_Proceso', 'Periodo_Index'),
+}
+
+# Matrices anchas del libro (una columna por insumo/proceso) que se guardan en formato largo
+# para que plantas con distintos insumos o procesos compartan la tabla
+ANCHAS = {
+    'DAT_PI_MATRIX': ('ID_Insumo', 'Cantidad'),
+    'DAT_PP_MATRIX': ('ID_Proceso', 'Minutos'),
+}
+
+# Columna de cada filtro
+FILTROS = {'productos': 'ID_Producto', 'insumos': 'ID_Insumo', 'procesos': 'ID_Proceso'}
+
+# Identificadores como máximo en cada lista IN (...) de una consulta: con los tres filtros de
+# identificadores y los rangos de años se queda bajo el límite de 999 variables ligadas de
+# SQLite anterior a 3.32
+TROZO_IDS = 250
+
+
+def _q(nombre):
+    return '"' + nombre.replace('"', '""') + '"'
+
+
+def _tipo(serie):
+    if pd.api.types.is_integer_dtype(serie) or pd.api.types.is_bool_dtype(serie):
+        return 'INTEGER'
+    if pd.api.types.is_float_dtype(serie):
+        return 'REAL'
+    return 'TEXT'
+
+
+def conectar(ruta):
+    con = sqlite3.connect(ruta, check_same_thread=False)
+    # WAL: varios lectores (sesiones, API, reporte) mientras se importa otra planta
+    con.execute('PRAGMA journal_mode=WAL')
+    con.execute('CREATE TABLE IF NOT EXISTS PLANTAS (Planta TEXT PRIMARY KEY, Origen TEXT, Importado TEXT)')
+    return con
+
+
+def _largo(hoja, df):
+    if hoja not in ANCHAS or df.empty:
+        return df
+    columna, valor = ANCHAS[hoja]
+    return df.melt(id_vars='ID_Producto', var_name=columna, value_name=valor)
+
+
+def _ancho(hoja, df, columnas):
+    if hoja not in ANCHAS:
+        return df
+    columna, valor = ANCHAS[hoja]
+    filas = pd.unique(df['ID_Producto'])
+    columnas = [c for c in columnas if c in set(df[columna])] if columnas is not None else pd.unique(df[columna])
+    matriz = np.zeros((len(filas), len(columnas)))
+    i = pd.Index(filas).get_indexer(df['ID_Producto'])
+    j = pd.Index(columnas).get_indexer(df[columna])
+    validos = j >= 0
+    matriz[i[validos], j[validos]] = df[valor].to_numpy(dtype=float)[validos]
+    ancho = pd.DataFrame(matriz, columns=columnas)
+    # Columnas enteras como en el libro
+    for c in ancho.columns:
+        if np.all(ancho[c] == np.round(ancho[c])):
+            ancho[c] = ancho[c].astype('int64')
+    ancho.insert(0, 'ID_Producto', filas)
+    return ancho
+
+
+def _asegurar_tabla(con, hoja, df):
+    clave = CLAVES[hoja]
+    existentes = [fila[1] for fila in con.execute(f'PRAGMA table_info({_q(hoja)})')]
+    if not existentes:
+        columnas = ', '.join(f'{_q(c)} {_tipo(df[c])}' for c in df.columns)
+        con.execute(f'CREATE TABLE {_q(hoja)} ("Planta" TEXT NOT NULL, {columnas}, '
+                    f'PRIMARY KEY ("Planta", {", ".join(map(_q, clave))}))')
+        if 'Periodo_Index' in clave:
+            # Consultas entre plantas por entidad y periodo, y por periodo dentro de una planta
+            con.execute(f'CREATE INDEX {_q("ix_" + hoja)} ON {_q(hoja)} ({_q(clave[0])}, "Periodo_Index")')
+            con.execute(f'CREATE INDEX {_q("ix_" + hoja + "_periodo")} ON {_q(hoja)} ("Planta", "Periodo_Index")')
+        return
+    for c in df.columns:
+        if c not in existentes:
+            con.execute(f'ALTER TABLE {_q(hoja)} ADD COLUMN {_q(c)} {_tipo(df[c])}')
+
+
+# Guarda el dataset `data` como la planta `planta`, reemplazando lo que hubiera de ella,
+# en una sola transacción
+def guardar_datos(ruta, data, planta=PLANTA_DEFECTO, origen=''):
+    con = conectar(ruta)
+    try:
+        with con:
+            for hoja in HOJAS + HOJAS_RESULTADOS:
+                df = _largo(hoja, data.get(hoja, pd.DataFrame()))
+                existe = con.execute("SELECT 1 FROM sqlite_master WHERE type='table' AND name=?", (hoja,)).fetchone()
+                if existe:
+                    con.execute(f'DELETE FROM {_q(hoja)} WHERE "Planta" = ?', (planta,))
+                if df.empty:
+                    continue
+                _asegurar_tabla(con, hoja, df)
+                columnas = ', '.join(['"Planta"'] + [_q(c) for c in df.columns])
+                marcadores = ', '.join('?' * (len(df.columns) + 1))
+                filas = ((planta, *fila) for fila in df.astype(object).where(df.notna(), None).itertuples(index=False))
+                con.executemany(f'INSERT INTO {_q(hoja)} ({columnas}) VALUES ({marcadores})', filas)
+            con.execute('INSERT OR REPLACE INTO PLANTAS VALUES (?, ?, ?)',
+                        (planta, str(origen), datetime.now().isoformat(timespec='seconds')))
+    finally:
+        con.close()
+
+
+# Importa un libro de Excel de LINGO como la planta `planta`
+def importar_libro(ruta_libro, ruta, planta=PLANTA_DEFECTO):
+    data, avisos = leer_libro(ruta_libro)
+    guardar_datos(ruta, data, planta, ruta_libro)
+    return avisos
+
+
+def plantas(ruta):
+    con = conectar(ruta)
+    try:
+        return pd.read_sql_query('SELECT * FROM PLANTAS ORDER BY rowid', con)
+    finally:
+        con.close()
+
+
+def _condiciones(columnas, planta, filtros):
+    condiciones, parametros = ['"Planta" = ?'], [planta]
+    for nombre, valores in filtros.items():
+        if valores is None:
+            continue
+        valores = list(valores)
+        if nombre == 'años':
+            if 'Periodo_Index' not in columnas:
+                continue
+            # Un rango de periodos por año: la consulta recorre el índice por rangos
+            rangos = [((a - AÑO_INICIAL) * 12 + 1, (a - AÑO_INICIAL + 1) * 12) for a in valores]
+            condiciones.append('(' + ' OR '.join('"Periodo_Index" BETWEEN ? AND ?' for _ in rangos) + ')')
+            parametros += [p for rango in rangos for p in rango]
+        elif FILTROS[nombre] in columnas:
+            condiciones.append(f'{_q(FILTROS[nombre])} IN ({", ".join("?" * len(valores))})')
+            parametros += valores
+    return ' AND '.join(condiciones), parametros
+
+
+# Filtros con las listas de identificadores partidas en trozos de TROZO_IDS: cada combinación
+# de trozos es una consulta y sus filas no se repiten entre consultas
+def _trozos(filtros):
+    partes = []
+    for nombre, valores in filtros.items():
+        if valores is None or nombre == 'años':
+            partes.append([(nombre, valores)])
+        else:
+            valores = list(valores)
+            partes.append([(nombre, valores[i:i + TROZO_IDS]) for i in range(0, len(valores), TROZO_IDS)]
+                          or [(nombre, valores)])
+    return [dict(combinacion) for combinacion in itertools.product(*partes)]
+
+
+# Lee una tabla de la planta con los filtros resueltos en SQLite, en el orden de importación
+def consultar(con, hoja, planta, productos=None, insumos=None, procesos=None, años=None):
+    columnas = [fila[1] for fila in con.execute(f'PRAGMA table_info({_q(hoja)})')]
+    if not columnas:
+        return pd.DataFrame()
+    seleccion = ', '.join(_q(c) for c in columnas if c != 'Planta')
+    partes = []
+    for filtros in _trozos({'productos': productos, 'insumos': insumos, 'procesos': procesos, 'años': años}):
+        donde, parametros = _condiciones(columnas, planta, filtros)
+        partes.append(pd.read_sql_query(f'SELECT rowid AS "_fila", {seleccion} FROM {_q(hoja)} WHERE {donde}',
+                                        con, params=parametros))
+    df = pd.concat(partes, ignore_index=True) if len(partes) > 1 else partes[0]
+    df = df.sort_values('_fila', kind='stable', ignore_index=True).drop(columns='_fila')
+    # Columnas agregadas por otras plantas que esta planta no tiene
+    return df.dropna(axis=1, how='all') if len(df) else df
+
+
+# Mismos filtros aplicados a un DataFrame ya cargado (origen Excel)
+def filtrar(df, productos=None, insumos=None, procesos=None, años=None):
+    if df.empty:
+        return df
+    mascara = np.ones(len(df), dtype=bool)
+    for nombre, valores in [('productos', productos), ('insumos', insumos), ('procesos', procesos)]:
+        if valores is not None and FILTROS[nombre] in df.columns:
+            mascara &= df[FILTROS[nombre]].isin(list(valores)).to_numpy()
+    if años is not None and 'Periodo_Index' in df.columns:
+        mascara &= np.isin(AÑO_INICIAL + (df['Periodo_Index'].to_numpy() - 1) // 12, list(años))
+    return df[mascara].reset_index(drop=True)
+
+
+# Una tabla de la planta con los filtros resueltos en la consulta, con la misma forma y el
+# mismo esquema tipado (categorías de los conjuntos de la planta) que en el dataset cargado
+def leer_corte(ruta, planta, hoja, productos=None, insumos=None, procesos=None, años=None):
+    con = conectar(ruta)
+    try:
+        df = consultar(con, hoja, planta, productos, insumos, procesos, años)
+        if df.empty:
+            return df
+        conjuntos = {h: consultar(con, h, planta) for h in esquema.HOJAS_CATALOGO + ('DAT_PRODUCTOS_FIJOS',)}
+    finally:
+        con.close()
+    if hoja in ANCHAS:
+        columna, _ = ANCHAS[hoja]
+        conjunto = conjuntos['SET_INSUMOS' if columna == 'ID_Insumo' else 'SET_PROCESOS']
+        df = _ancho(hoja, df, conjunto[columna].tolist() if not conjunto.empty else None)
+    df, _ = esquema.tipar(hoja, df, esquema.catalogos(conjuntos))
+    return completar_pm_matrix(df) if hoja == 'DAT_PM_MATRIX' else df
+
+
+# Dataset de una planta con la misma forma que leer_libro; con filtros solo se leen las
+# filas de esos productos, insumos, procesos y años
+def leer_datos(ruta, planta=None, productos=None, insumos=None, procesos=None, años=None):
+    data, avisos = {}, []
+    con = conectar(ruta)
+    try:
+        disponibles = [fila[0] for fila in con.execute('SELECT Planta FROM PLANTAS ORDER BY rowid')]
+        if planta is None and disponibles:
+            planta = disponibles[0]
+            if len(disponibles) > 1:
+                avisos.append(f"Varias plantas en {ruta}; se cargó {planta}")
+        if planta not in disponibles:
+            avisos.append(f"La planta {planta} no está en {ruta}")
+        filtros = {'productos': productos, 'insumos': insumos, 'procesos': procesos, 'años': años}
+        for hoja in HOJAS + HOJAS_RESULTADOS:
+            data[hoja] = consultar(con, hoja, planta, **filtros)
+        for hoja, (columna, _) in ANCHAS.items():
+            if not data[hoja].empty:
+                conjunto = data['SET_INSUMOS' if columna == 'ID_Insumo' else 'SET_PROCESOS']
+                orden = conjunto[columna].tolist() if not conjunto.empty else None
+                data[hoja] = _ancho(hoja, data[hoja], orden)
+    finally:
+        con.close()
+    data['PLANTA'] = planta
+    return data, avisos
+
+
+def main(argumentos=None):
+    parser = argparse.ArgumentParser(description="Almacén embebido de datasets de ICATEX")
+    comandos = parser.add_subparsers(dest='comando', required=True)
+    importar = comandos.add_parser('importar', help="Importa un libro de Excel como una planta")
+    importar.add_argument('libro')
+    importar.add_argument('base')
+    importar.add_argument('--planta', default=PLANTA_DEFECTO)
+    listar = comandos.add_parser('plantas', help="Lista las plantas de la base")
+    listar.add_argument('base')
+    opciones = parser.parse_args(argumentos)
+
+    if opciones.comando == 'importar':
+        for aviso in importar_libro(opciones.libro, opciones.base, opciones.planta):
+            print(f"Aviso: {aviso}")
+        print(f"{opciones.libro} -> {opciones.base} (planta {opciones.planta})")
+    else:
+        print(plantas(opciones.base).to_string(index=False))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,274 @@
+import argparse
+import hashlib
+import json
+import threading
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qsl, urlsplit
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+
+from icatex import cubo, escenarios, motores
+from icatex.caches import CacheLRU
+from icatex.datos import RUTA_LIBRO, cargar_datos, nombres_procesos
+
+# API HTTP de solo lectura con los indicadores del dashboard para sistemas externos (MES, BI).
+# Lee el dataset ya cargado (el mismo que usa el dashboard) y nunca vuelve a abrir el Excel.
+#
+#   python -m icatex.api --puerto 8765
+#   GET /api/categorias?año=2023 (o ?anio=2023)  JSON
+#   GET /api/plan?producto=P001&formato=arrow     Arrow IPC
+#
+# Las respuestas se cachean por (huella, vista, parámetros, formato) y llevan un ETag que
+# solo depende de esa clave: un If-None-Match coincidente se responde con 304 sin calcular.
+
+PUERTO = 8765
+TIPO_ARROW = 'application/vnd.apache.arrow.stream'
+
+# Respuestas ya serializadas por (huella, vista, parámetros, formato)
+CACHE_RESPUESTAS = CacheLRU('respuestas_api', max_entradas=512, max_bytes=64 * 1024 * 1024)
+
+# Dataset servido; se reemplaza al cargar un libro nuevo en el dashboard
+_ESTADO = {'data': None, 'servidor': None}
+_LOCK = threading.Lock()
+
+
+class ParametroInvalido(ValueError):
+    pass
+
+
+def _año(parametros):
+    if 'año' not in parametros:
+        return None
+    try:
+        return int(parametros['año'])
+    except ValueError:
+        raise ParametroInvalido(f"año inválido: {parametros['año']}")
+
+
+def _seleccion(ids, parametros, nombre):
+    if nombre not in parametros:
+        return np.arange(len(ids))
+    posiciones = np.flatnonzero(np.asarray(ids) == parametros[nombre])
+    if len(posiciones) == 0:
+        raise ParametroInvalido(f"{nombre} desconocido: {parametros[nombre]}")
+    return posiciones
+
+
+def _cubo(data):
+    if data['DAT_PM_MATRIX'].empty:
+        raise ParametroInvalido("el libro no tiene DAT_PM_MATRIX")
+    return motores.cubo_agregados(data['HUELLA'], data)
+
+
+def _años_validos(cubo_agregados, año):
+    if año is not None and año not in cubo.años_disponibles(cubo_agregados):
+        raise ParametroInvalido(f"año sin datos: {año}")
+    return año
+
+
+# ===== VISTAS =====
+# Cada vista recibe el dataset y los parámetros de la consulta y devuelve un DataFrame
+# (tabla, disponible en JSON y Arrow) o un dict (indicadores sueltos, solo JSON)
+
+def vista_categorias(data, parametros):
+    cubo_agregados = _cubo(data)
+    return cubo.resumen_grupos(cubo_agregados, 'categoria', _años_validos(cubo_agregados, _año(parametros)))
+
+
+def vista_lineas(data, parametros):
+    cubo_agregados = _cubo(data)
+    return cubo.resumen_grupos(cubo_agregados, 'linea', _años_validos(cubo_agregados, _año(parametros)))
+
+
+def vista_productos(data, parametros):
+    cubo_agregados = _cubo(data)
+    return cubo.resumen_productos(cubo_agregados, _años_validos(cubo_agregados, _año(parametros)))
+
+
+# Plan óptimo de LINGO (producción, ventas, inventario) por producto y periodo
+def vista_plan(data, parametros):
+    tensores = motores.tensores(data['HUELLA'], data)
+    p = _seleccion(tensores['productos'], parametros, 'producto')
+    periodos = tensores['periodos']
+    return pd.DataFrame({
+        'ID_Producto': np.repeat(tensores['productos'][p], len(periodos)),
+        'Periodo_Index': np.tile(periodos, len(p)),
+        'Produccion': tensores['produccion'][p].ravel(),
+        'Ventas': tensores['ventas'][p].ravel(),
+        'Inventario': tensores['inventario'][p].ravel(),
+    })
+
+
+# Horas extra del plan por proceso y periodo, con la capacidad y el costo de cada una
+def vista_horas_extra(data, parametros):
+    tensores = motores.tensores(data['HUELLA'], data)
+    j = _seleccion(tensores['procesos'], parametros, 'proceso')
+    periodos = tensores['periodos']
+    procesos = tensores['procesos'][j]
+    return pd.DataFrame({
+        'ID_Proceso': np.repeat(procesos, len(periodos)),
+        'Proceso': np.repeat([nombres_procesos.get(c, c) for c in procesos], len(periodos)),
+        'Periodo_Index': np.tile(periodos, len(j)),
+        'CapacidadMinutos': tensores['capacidad'][j].ravel(),
+        'HorasExtrasMinutos': tensores['horas_extra'][j].ravel(),
+        'Costo_Horas_Extra': (tensores['costo_he'][j] * tensores['horas_extra'][j]).ravel(),
+    })
+
+
+def vista_objetivo(data, parametros):
+    return motores.valor_objetivo(data['HUELLA'], motores.tensores(data['HUELLA'], data))
+
+
+# Cumplimiento de las metas de utilidad y horas extra del modelo de programación por metas
+# de LINGO, los mismos indicadores que muestra la página de metas del dashboard
+def vista_metas(data, parametros):
+    return escenarios.kpis_metas_lingo(data)
+
+
+VISTAS = {
+    'categorias': vista_categorias,
+    'lineas': vista_lineas,
+    'productos': vista_productos,
+    'plan': vista_plan,
+    'horas_extra': vista_horas_extra,
+    'objetivo': vista_objetivo,
+    'metas': vista_metas,
+}
+
+
+def _json(valor):
+    if isinstance(valor, pd.DataFrame):
+        return valor.to_json(orient='records', force_ascii=False).encode('utf-8')
+    return json.dumps(valor, ensure_ascii=False, default=float).encode('utf-8')
+
+
+def _arrow(valor):
+    if not isinstance(valor, pd.DataFrame):
+        valor = pd.DataFrame([valor])
+    tabla = pa.Table.from_pandas(valor, preserve_index=False)
+    salida = pa.BufferOutputStream()
+    with pa.ipc.new_stream(salida, tabla.schema) as escritor:
+        escritor.write_table(tabla)
+    return salida.getvalue().to_pybytes()
+
+
+def etag(huella, vista, parametros, formato):
+    clave = repr((huella, vista, sorted(parametros.items()), formato)).encode('utf-8')
+    return '"' + hashlib.blake2b(clave, digest_size=12).hexdigest() + '"'
+
+
+# Cuerpo y tipo de contenido de una vista, calculados una vez por dataset y consulta
+def responder(data, vista, parametros, formato='json'):
+    def calcular():
+        valor = VISTAS[vista](data, parametros)
+        if formato == 'arrow':
+            return _arrow(valor), TIPO_ARROW
+        return _json(valor), 'application/json; charset=utf-8'
+
+    clave = (data['HUELLA'], vista, tuple(sorted(parametros.items())), formato)
+    return CACHE_RESPUESTAS.obtener_o_calcular(clave, calcular, lambda r: len(r[0]))
+
+
+class _Manejador(BaseHTTPRequestHandler):
+    server_version = 'ICATEX-API'
+
+    def do_GET(self):
+        data = _ESTADO['data']
+        url = urlsplit(self.path)
+        parametros = dict(parse_qsl(url.query))
+        # `anio` para clientes que no codifican la ñ en la URL
+        if 'anio' in parametros:
+            parametros['año'] = parametros.pop('anio')
+        partes = [p for p in url.path.split('/') if p]
+        if data is None:
+            return self._error(HTTPStatus.SERVICE_UNAVAILABLE, "no hay un dataset cargado")
+        if partes == ['api']:
+            return self._enviar(HTTPStatus.OK, _json({'huella': data['HUELLA'], 'vistas': list(VISTAS)}),
+                                'application/json; charset=utf-8')
+        if len(partes) != 2 or partes[0] != 'api' or partes[1] not in VISTAS:
+            return self._error(HTTPStatus.NOT_FOUND, f"vista desconocida: {url.path}")
+
+        vista = partes[1]
+        formato = parametros.pop('formato', None)
+        if formato is None:
+            formato = 'arrow' if TIPO_ARROW in self.headers.get('Accept', '') else 'json'
+        if formato not in ('json', 'arrow'):
+            return self._error(HTTPStatus.BAD_REQUEST, f"formato desconocido: {formato}")
+
+        etiqueta = etag(data['HUELLA'], vista, parametros, formato)
+        coincidencias = [e.strip() for e in self.headers.get('If-None-Match', '').split(',')]
+        if etiqueta in coincidencias or '*' in coincidencias:
+            return self._enviar(HTTPStatus.NOT_MODIFIED, b'', None, etiqueta)
+        try:
+            cuerpo, tipo = responder(data, vista, parametros, formato)
+        except ParametroInvalido as e:
+            return self._error(HTTPStatus.BAD_REQUEST, str(e))
+        self._enviar(HTTPStatus.OK, cuerpo, tipo, etiqueta)
+
+    def _enviar(self, estado, cuerpo, tipo, etiqueta=None):
+        self.send_response(estado)
+        if tipo is not None:
+            self.send_header('Content-Type', tipo)
+        if etiqueta is not None:
+            self.send_header('ETag', etiqueta)
+            self.send_header('Cache-Control', 'max-age=60')
+        self.send_header('Content-Length', str(len(cuerpo)))
+        self.end_headers()
+        if cuerpo:
+            self.wfile.write(cuerpo)
+
+    def _error(self, estado, mensaje):
+        self._enviar(estado, _json({'error': mensaje}), 'application/json; charset=utf-8')
+
+    def log_message(self, formato, *args):
+        pass
+
+
+# Publica `data` y levanta el servidor en un hilo de fondo si aún no corre en este proceso.
+# El dashboard la llama al cargar cada libro: la API sirve siempre el dataset vigente.
+def iniciar(data, puerto=PUERTO, host='127.0.0.1'):
+    with _LOCK:
+        _ESTADO['data'] = data
+        if _ESTADO['servidor'] is None:
+            servidor = ThreadingHTTPServer((host, puerto), _Manejador)
+            servidor.daemon_threads = True
+            threading.Thread(target=servidor.serve_forever, name='icatex-api', daemon=True).start()
+            _ESTADO['servidor'] = servidor
+        return _ESTADO['servidor']
+
+
+def detener():
+    with _LOCK:
+        if _ESTADO['servidor'] is not None:
+            _ESTADO['servidor'].shutdown()
+            _ESTADO['servidor'].server_close()
+            _ESTADO['servidor'] = None
+
+
+def main(argumentos=None):
+    parser = argparse.ArgumentParser(description="API HTTP de solo lectura con los indicadores de ICATEX")
+    parser.add_argument('--libro', default=RUTA_LIBRO, help="Libro de Excel de LINGO o base de icatex.almacen")
+    parser.add_argument('--planta', default=None, help="Planta a cargar de la base")
+    parser.add_argument('--puerto', type=int, default=PUERTO)
+    parser.add_argument('--host', default='127.0.0.1')
+    opciones = parser.parse_args(argumentos)
+    data, avisos = cargar_datos(opciones.libro, opciones.planta)
+    for aviso in avisos:
+        print(f"Aviso: {aviso}")
+    with _LOCK:
+        _ESTADO['data'] = data
+    servidor = ThreadingHTTPServer((opciones.host, opciones.puerto), _Manejador)
+    print(f"API de ICATEX en http://{opciones.host}:{opciones.puerto}/api (dataset {data['HUELLA']})")
+    try:
+        servidor.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        servidor.server_close()
+
+
+if __name__ == '__main__':
+    main()
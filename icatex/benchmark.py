@@ -0,0 +1,272 @@
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+import tracemalloc
+from datetime import datetime
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import plotly
+import plotly.io as pio
+import pyarrow as pa
+
+from icatex import (almacen, comparacion, cubo, esquema, filtros, motores, politicas_inventario, precios, reporte,
+                    sintetico)
+from icatex.caches import CACHES
+from icatex.datos import completar_datos, completar_pm_matrix, cargar_datos, leer_columnar, leer_libro
+from icatex.tensores import construir_tensores, huella_dataset
+
+# Benchmark reproducible del dashboard sin navegador ni red: carga (libro en frío, directorio
+# columnar y base embebida), columnas derivadas, tensores y cubo, preparación de datos,
+# figuras y serialización de cada sección, y los motores de optimización, sobre datasets
+# sintéticos de varias escalas (icatex.sintetico, con semilla fija).
+#
+#   python -m icatex.benchmark ejecutar --escalas pequeña mediana --salida .benchmark/base.json
+#   python -m icatex.benchmark comparar .benchmark/base.json .benchmark/nuevo.json --umbral 10
+#
+# Cada etapa se repite y se guarda el mínimo y la mediana de los segundos; el pico de
+# memoria (tracemalloc) se mide en una ejecución aparte para no distorsionar los tiempos.
+
+DIRECTORIO_DATOS = '.benchmark'
+
+# Resultados por defecto, junto a los datasets (fuera del control de versiones)
+SALIDA = os.path.join(DIRECTORIO_DATOS, 'benchmark.json')
+
+
+# Segundos de cada repetición y pico de memoria de `ejecutar`. `preparar` corre antes de
+# cada repetición, fuera del tiempo medido (p. ej. para vaciar cachés).
+def medir(ejecutar, preparar=None, repeticiones=3, memoria=True):
+    segundos = []
+    for _ in range(repeticiones):
+        if preparar:
+            preparar()
+        inicio = time.perf_counter()
+        ejecutar()
+        segundos.append(time.perf_counter() - inicio)
+    pico = None
+    if memoria:
+        if preparar:
+            preparar()
+        tracemalloc.start()
+        try:
+            ejecutar()
+            pico = tracemalloc.get_traced_memory()[1]
+        finally:
+            tracemalloc.stop()
+    return {
+        'segundos_min': min(segundos),
+        'segundos_mediana': statistics.median(segundos),
+        'repeticiones': repeticiones,
+        'pico_bytes': pico,
+    }
+
+
+# Libro, directorio columnar y base embebida de una escala, generados una vez y reutilizados
+# (con la misma semilla el contenido es el mismo)
+def preparar_datos(escala, directorio=DIRECTORIO_DATOS, semilla=0, con_libro=True):
+    directorio = Path(directorio)
+    directorio.mkdir(parents=True, exist_ok=True)
+    dimensiones = sintetico.ESCALAS[escala]
+    base = f"{escala}-{semilla}"
+    rutas = {'columnar': directorio / base, 'almacen': directorio / f"{base}.db"}
+    if not rutas['columnar'].exists():
+        sintetico.generar(rutas['columnar'], semilla=semilla, formato='parquet', **dimensiones)
+    if con_libro:
+        rutas['libro'] = directorio / f"{base}.xlsx"
+        if not rutas['libro'].exists():
+            sintetico.generar(rutas['libro'], semilla=semilla, **dimensiones)
+    if not rutas['almacen'].exists():
+        data, _ = cargar_datos(rutas['columnar'])
+        almacen.guardar_datos(rutas['almacen'], data, almacen.PLANTA_DEFECTO, rutas['columnar'])
+    return rutas
+
+
+def _vaciar_caches():
+    for cache in CACHES.values():
+        cache.limpiar()
+
+
+# Lo que envía Streamlit al navegador: el JSON de cada figura y cada tabla en Arrow
+def serializar(figuras, tablas):
+    total = 0
+    for figura in figuras:
+        total += len(pio.to_json(figura, validate=False))
+    for tabla in tablas.values():
+        total += pa.Table.from_pandas(tabla, preserve_index=False).nbytes
+    return total
+
+
+# Etapas de una escala: (nombre, ejecutar, preparar)
+def etapas(rutas):
+    data, _ = cargar_datos(rutas['columnar'])
+    crudo = {hoja: df.drop(columns=['Año', 'Mes'], errors='ignore') if hoja == 'DAT_PM_MATRIX' else df
+             for hoja, df in data.items() if hoja != 'HUELLA'}
+    sin_tipos, _ = leer_columnar(rutas['columnar'])
+    tensores = construir_tensores(data)
+    cubo_agregados = cubo.construir_cubo(data['DAT_PM_MATRIX'], data['DAT_PRODUCTOS_FIJOS'])
+    indice = filtros.construir_indice(data, tensores)
+    filtro = {'categoria': filtros.valores(indice, 'categoria')[:1], 'año': filtros.valores(indice, 'año')[-1:]}
+
+    def filtrar():
+        mascaras = filtros.resolver(indice, filtro)
+        filtros.filtrar_datos(data, indice, mascaras, 'filtro')
+        filtros.filtrar_tensores(tensores, mascaras)
+        filtros.cortar_cubo(cubo_agregados, tensores, mascaras)
+
+    almacen_productos = comparacion.construir_almacen(tensores)
+    comparados = tensores['productos'][:comparacion.MAXIMO_PRODUCTOS]
+
+    def contexto():
+        _vaciar_caches()
+        reporte._iniciar_trabajador(data, tensores, cubo_agregados)
+
+    lista = []
+    if 'libro' in rutas:
+        lista.append(('carga.libro', lambda: leer_libro(rutas['libro']), None))
+    lista += [
+        ('carga.columnar', lambda: cargar_datos(rutas['columnar']), None),
+        ('carga.almacen', lambda: cargar_datos(rutas['almacen']), None),
+        ('carga.cache', lambda: motores.tensores(data['HUELLA'], data), contexto),
+        ('derivadas.calendario', lambda: completar_pm_matrix(crudo['DAT_PM_MATRIX'].copy()), None),
+        ('derivadas.esquema', lambda: esquema.aplicar(dict(sin_tipos)), None),
+        ('derivadas.huella', lambda: huella_dataset(data), None),
+        ('derivadas.completar', lambda: completar_datos(dict(crudo)), None),
+        ('motores.tensores', lambda: construir_tensores(data), None),
+        ('motores.cubo', lambda: cubo.construir_cubo(data['DAT_PM_MATRIX'], data['DAT_PRODUCTOS_FIJOS']), None),
+        ('motores.indice_filtros', lambda: filtros.construir_indice(data, tensores), None),
+        ('busqueda.filtros', filtrar, None),
+        ('motores.almacen_productos', lambda: comparacion.construir_almacen(tensores), None),
+        ('busqueda.comparacion', lambda: comparacion.comparar(tensores, almacen_productos, comparados), None),
+        ('resolucion.precios', lambda: precios.optimizar_precios(tensores), None),
+        ('resolucion.precios_acoplados', lambda: precios.optimizar_precios(tensores, acoplar_capacidad=True), None),
+        ('resolucion.politicas', lambda: politicas_inventario.simular_politicas(
+            politicas_inventario.rejilla_politicas(), politicas_inventario.demanda_politicas(tensores),
+            tensores['costo_almacen'], tensores['stock_inicial']), None),
+    ]
+
+    # Por sección, con la primera selección del reporte: la página con las cachés de los
+    # motores vacías (datos + figuras), con las cachés llenas (solo figuras) y la serialización
+    primeras = {}
+    for seccion, seleccion in reporte.tareas(data, tensores, cubo_agregados):
+        primeras.setdefault(seccion, seleccion)
+    for seccion, seleccion in primeras.items():
+        pagina = reporte.PAGINAS[seccion]
+        resultado = {}
+
+        def calentar(pagina=pagina, seleccion=seleccion, resultado=resultado):
+            contexto()
+            resultado['pagina'] = pagina(seleccion)
+
+        lista += [
+            (f'seccion.{seccion}.fria', lambda p=pagina, s=seleccion: p(s), contexto),
+            (f'seccion.{seccion}.figuras', lambda p=pagina, s=seleccion: p(s), calentar),
+            (f'seccion.{seccion}.serializacion',
+             lambda r=resultado: serializar(r['pagina'][2], r['pagina'][3]), calentar),
+        ]
+    return lista
+
+
+def ejecutar_escala(escala, directorio=DIRECTORIO_DATOS, semilla=0, repeticiones=3, memoria=True,
+                    con_libro=True, filtro=None):
+    rutas = preparar_datos(escala, directorio, semilla, con_libro)
+    resultados = []
+    for nombre, ejecutar, preparar in etapas(rutas):
+        if filtro and not any(nombre.startswith(f) for f in filtro):
+            continue
+        medicion = medir(ejecutar, preparar, repeticiones, memoria)
+        resultados.append(dict(escala=escala, etapa=nombre, **medicion))
+        print(f"{escala:>8} {nombre:<40} {medicion['segundos_min'] * 1000:10.1f} ms"
+              + (f" {medicion['pico_bytes'] / 2**20:8.1f} MB" if medicion['pico_bytes'] is not None else ""),
+              flush=True)
+    _vaciar_caches()
+    return resultados
+
+
+def _commit():
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True,
+                              cwd=Path(__file__).parent, timeout=10).stdout.strip() or None
+    except (OSError, subprocess.SubprocessError):
+        return None
+
+
+def entorno():
+    return {
+        'fecha': datetime.now().isoformat(timespec='seconds'),
+        'commit': _commit(),
+        'python': platform.python_version(),
+        'plataforma': platform.platform(),
+        'cpus': os.cpu_count(),
+        'numpy': np.__version__,
+        'pandas': pd.__version__,
+        'plotly': plotly.__version__,
+        'pyarrow': pa.__version__,
+    }
+
+
+# Etapas cuyo mínimo empeoró más de `umbral` % (y al menos `minimo` segundos) entre dos corridas
+def comparar(base, nuevo, umbral=10.0, minimo=0.001):
+    anteriores = {(r['escala'], r['etapa']): r for r in base['resultados']}
+    filas = []
+    for r in nuevo['resultados']:
+        a = anteriores.get((r['escala'], r['etapa']))
+        if a is None:
+            continue
+        cambio = (r['segundos_min'] / a['segundos_min'] - 1) * 100 if a['segundos_min'] > 0 else 0.0
+        filas.append({
+            'escala': r['escala'], 'etapa': r['etapa'],
+            'base_ms': a['segundos_min'] * 1000, 'nuevo_ms': r['segundos_min'] * 1000, 'cambio_%': cambio,
+            'regresion': cambio > umbral and r['segundos_min'] - a['segundos_min'] > minimo,
+        })
+    return pd.DataFrame(filas)
+
+
+def main(argumentos=None):
+    parser = argparse.ArgumentParser(description="Benchmark de ICATEX")
+    subcomandos = parser.add_subparsers(dest='comando', required=True)
+    correr = subcomandos.add_parser('ejecutar', help="Mide todas las etapas en las escalas elegidas")
+    correr.add_argument('--escalas', nargs='*', default=['pequeña', 'mediana'], choices=list(sintetico.ESCALAS))
+    correr.add_argument('--repeticiones', type=int, default=3)
+    correr.add_argument('--semilla', type=int, default=0)
+    correr.add_argument('--datos', default=DIRECTORIO_DATOS, help="Directorio de los datasets generados")
+    correr.add_argument('--salida', default=SALIDA)
+    correr.add_argument('--sin-memoria', action='store_true', help="No medir el pico de memoria")
+    correr.add_argument('--sin-libro', action='store_true', help="No generar ni leer libros de Excel")
+    correr.add_argument('--etapas', nargs='*', default=None, help="Prefijos de las etapas a medir")
+    diferencia = subcomandos.add_parser('comparar', help="Compara dos corridas y marca regresiones")
+    diferencia.add_argument('base')
+    diferencia.add_argument('nuevo')
+    diferencia.add_argument('--umbral', type=float, default=10.0, help="Porcentaje de empeoramiento tolerado")
+    opciones = parser.parse_args(argumentos)
+
+    if opciones.comando == 'comparar':
+        with open(opciones.base, encoding='utf-8') as f:
+            base = json.load(f)
+        with open(opciones.nuevo, encoding='utf-8') as f:
+            nuevo = json.load(f)
+        tabla = comparar(base, nuevo, opciones.umbral)
+        print(tabla.to_string(index=False, float_format=lambda v: f"{v:,.1f}"))
+        regresiones = int(tabla['regresion'].sum()) if not tabla.empty else 0
+        print(f"{regresiones} regresiones por encima de {opciones.umbral:.0f} %")
+        sys.exit(1 if regresiones else 0)
+
+    resultados = []
+    for escala in opciones.escalas:
+        resultados += ejecutar_escala(escala, opciones.datos, opciones.semilla, opciones.repeticiones,
+                                      not opciones.sin_memoria, not opciones.sin_libro, opciones.etapas)
+    salida = {'entorno': entorno(), 'semilla': opciones.semilla,
+              'escalas': {e: sintetico.ESCALAS[e] for e in opciones.escalas}, 'resultados': resultados}
+    os.makedirs(os.path.dirname(opciones.salida) or '.', exist_ok=True)
+    with open(opciones.salida, 'w', encoding='utf-8') as f:
+        json.dump(salida, f, ensure_ascii=False, indent=1)
+    print(f"Resultados en {opciones.salida}")
+
+
+if __name__ == '__main__':
+    main()
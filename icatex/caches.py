@@ -0,0 +1,142 @@
+import os
+import threading
+from collections import OrderedDict
+
+from icatex import memoria, perfil
+
+# Todas las cachés LRU creadas en el proceso, por nombre
+CACHES = {}
+
+# Presupuesto de bytes para la suma de todas las cachés (ICATEX_CACHES_BYTES, p. ej. 1GB)
+# y límites por caché que reemplazan a los del código (ICATEX_CACHES_PRESUPUESTOS, p. ej.
+# "motores=512MB,figuras=32MB")
+PRESUPUESTO_GLOBAL = memoria.leer_bytes(os.environ.get('ICATEX_CACHES_BYTES'))
+PRESUPUESTOS = {nombre.strip(): memoria.leer_bytes(tamano)
+                for nombre, _, tamano in (par.partition('=') for par in
+                                          os.environ.get('ICATEX_CACHES_PRESUPUESTOS', '').split(','))
+                if nombre.strip()}
+
+
+# Caché acotada con desalojo LRU, compartida entre sesiones (protegida con un lock porque
+# Streamlit atiende cada sesión en su propio hilo). Lleva la cuenta de aciertos, fallos,
+# desalojos y bytes aproximados de cada entrada (medidos con icatex.memoria si quien guarda
+# no los da).
+class CacheLRU:
+    def __init__(self, nombre, max_entradas=128, max_bytes=None):
+        self.nombre = nombre
+        self.max_entradas = max_entradas
+        self.max_bytes = PRESUPUESTOS.get(nombre, max_bytes)
+        self.aciertos = 0
+        self.fallos = 0
+        self.desalojos = 0
+        self._datos = OrderedDict()
+        self._tamanos = {}
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self._en_curso = {}
+        CACHES[nombre] = self
+
+    def __len__(self):
+        return len(self._datos)
+
+    def __contains__(self, clave):
+        return clave in self._datos
+
+    def obtener(self, clave, defecto=None):
+        with self._lock:
+            acierto = clave in self._datos
+            if acierto:
+                self._datos.move_to_end(clave)
+                self.aciertos += 1
+                valor = self._datos[clave]
+            else:
+                self.fallos += 1
+                valor = defecto
+        if perfil.ACTIVO:
+            perfil.contar(self.nombre, acierto)
+        return valor
+
+    def guardar(self, clave, valor, tamano=None):
+        if tamano is None:
+            tamano = memoria.bytes_objeto(valor)
+        with self._lock:
+            if clave in self._datos:
+                self._bytes -= self._tamanos.pop(clave)
+                del self._datos[clave]
+            self._datos[clave] = valor
+            self._tamanos[clave] = tamano
+            self._bytes += tamano
+            self._desalojar()
+        _aplicar_presupuesto_global()
+        memoria.vigilar()
+
+    # Una sola ejecución de `calcular` por clave aunque varias sesiones (o el calentamiento
+    # en segundo plano) la pidan a la vez: las demás esperan y reutilizan el resultado
+    def obtener_o_calcular(self, clave, calcular, medir=None):
+        valor = self.obtener(clave, _AUSENTE)
+        if valor is not _AUSENTE:
+            return valor
+        with self._lock:
+            candado = self._en_curso.setdefault(clave, threading.Lock())
+        with candado:
+            with self._lock:
+                valor = self._datos.get(clave, _AUSENTE)
+            if valor is _AUSENTE:
+                valor = calcular()
+                self.guardar(clave, valor, medir(valor) if medir else None)
+        with self._lock:
+            self._en_curso.pop(clave, None)
+        return valor
+
+    def limpiar(self):
+        with self._lock:
+            self._datos.clear()
+            self._tamanos.clear()
+            self._bytes = 0
+
+    # Desaloja las entradas usadas hace más tiempo hasta quedar en `max_bytes`; devuelve
+    # los bytes liberados
+    def reducir(self, max_bytes):
+        with self._lock:
+            antes = self._bytes
+            while self._datos and self._bytes > max_bytes:
+                clave, _ = self._datos.popitem(last=False)
+                self._bytes -= self._tamanos.pop(clave)
+                self.desalojos += 1
+            return antes - self._bytes
+
+    def estadisticas(self):
+        consultas = self.aciertos + self.fallos
+        return {
+            'cache': self.nombre,
+            'entradas': len(self._datos),
+            'bytes': self._bytes,
+            'aciertos': self.aciertos,
+            'fallos': self.fallos,
+            'desalojos': self.desalojos,
+            'tasa_aciertos': self.aciertos / consultas if consultas else 0.0,
+        }
+
+    def _desalojar(self):
+        while self._datos and (len(self._datos) > self.max_entradas
+                               or (self.max_bytes is not None and self._bytes > self.max_bytes)):
+            clave, _ = self._datos.popitem(last=False)
+            self._bytes -= self._tamanos.pop(clave)
+            self.desalojos += 1
+
+
+# Con un presupuesto global, mientras la suma de las cachés lo pase se desaloja de la que
+# más bytes ocupa
+def _aplicar_presupuesto_global():
+    if PRESUPUESTO_GLOBAL is None:
+        return
+    exceso = sum(c._bytes for c in list(CACHES.values())) - PRESUPUESTO_GLOBAL
+    while exceso > 0:
+        mayor = max(list(CACHES.values()), key=lambda c: c._bytes)
+        liberado = mayor.reducir(max(0, mayor._bytes - exceso))
+        if not liberado:
+            break
+        exceso -= liberado
+
+
+_AUSENTE = object()
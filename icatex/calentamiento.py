@@ -0,0 +1,85 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, wait
+
+# Calentamientos lanzados en el proceso, por clave (normalmente la huella del dataset)
+_CALENTAMIENTOS = {}
+_LOCK = threading.Lock()
+
+
+# Ejecuta etapas de tareas (nombre, función) en un pool de hilos, en segundo plano.
+# Las tareas de una etapa corren en paralelo; una etapa empieza cuando termina la anterior.
+# Los errores de una tarea se registran y no detienen el resto.
+class Calentamiento:
+    def __init__(self, clave, etapas, max_hilos=4):
+        self.clave = clave
+        self.etapas = [list(etapa) for etapa in etapas]
+        self.max_hilos = max_hilos
+        self.total = sum(len(etapa) for etapa in self.etapas)
+        self.completadas = []
+        self.errores = {}
+        self.duraciones = {}
+        self.inicio = None
+        self.fin = None
+        self._lock = threading.Lock()
+
+    def iniciar(self):
+        self.inicio = time.perf_counter()
+        hilo = threading.Thread(target=self._ejecutar, name=f"calentamiento-{self.clave}", daemon=True)
+        hilo.start()
+        return self
+
+    def _tarea(self, nombre, funcion):
+        inicio = time.perf_counter()
+        try:
+            funcion()
+        except Exception as e:
+            with self._lock:
+                self.errores[nombre] = repr(e)
+        with self._lock:
+            self.duraciones[nombre] = time.perf_counter() - inicio
+            self.completadas.append(nombre)
+
+    def _ejecutar(self):
+        with ThreadPoolExecutor(max_workers=self.max_hilos, thread_name_prefix='calentamiento') as pool:
+            for etapa in self.etapas:
+                wait([pool.submit(self._tarea, nombre, funcion) for nombre, funcion in etapa])
+        self.fin = time.perf_counter()
+
+    @property
+    def terminado(self):
+        return self.fin is not None
+
+    def progreso(self):
+        with self._lock:
+            completadas = len(self.completadas)
+            errores = dict(self.errores)
+            duraciones = dict(self.duraciones)
+        fin = self.fin if self.fin is not None else time.perf_counter()
+        return {
+            'total': self.total,
+            'completadas': completadas,
+            'fraccion': completadas / self.total if self.total else 1.0,
+            'terminado': self.terminado,
+            'segundos': fin - self.inicio if self.inicio is not None else 0.0,
+            'errores': errores,
+            'duraciones': duraciones,
+        }
+
+
+# Lanza el calentamiento de `clave` si no se lanzó antes en este proceso y lo devuelve
+def calentar(clave, etapas, max_hilos=4):
+    with _LOCK:
+        if clave not in _CALENTAMIENTOS:
+            _CALENTAMIENTOS[clave] = Calentamiento(clave, etapas, max_hilos).iniciar()
+        return _CALENTAMIENTOS[clave]
+
+
+def estado(clave):
+    return _CALENTAMIENTOS.get(clave)
+
+
+# Último calentamiento lanzado en el proceso (el del libro cargado más recientemente)
+def ultimo():
+    with _LOCK:
+        return next(reversed(_CALENTAMIENTOS.values()), None)
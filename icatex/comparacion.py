@@ -0,0 +1,119 @@
+import math
+
+import numpy as np
+import pandas as pd
+from plotly.colors import qualitative
+from plotly.subplots import make_subplots
+
+from icatex import series
+
+# Comparación de varios productos a la vez. Las series por producto de los tensores se
+# apilan una vez por dataset en un almacén [producto × variable × periodo]; una selección
+# de productos se saca con un único fancy-index sobre su primer eje y los indicadores de
+# toda la selección son reducciones sobre el eje de periodos. El costo de comparar crece
+# con el número de productos elegidos, no con el número de re-ejecuciones.
+
+VARIABLES = ('produccion', 'ventas', 'inventario', 'precio', 'costo', 'demanda_min', 'demanda_max')
+
+TITULOS_VARIABLES = {
+    'produccion': 'Producción', 'ventas': 'Ventas', 'inventario': 'Inventario', 'precio': 'Precio venta',
+    'costo': 'Costo insumo', 'demanda_min': 'Demanda mínima', 'demanda_max': 'Demanda máxima',
+}
+
+# Indicadores de la tabla de ranking, en el orden de sus columnas
+INDICADORES = [
+    'Produccion_Total', 'Produccion_Promedio', 'Produccion_Maxima', 'Produccion_Minima',
+    'Ventas_Total', 'Inventario_Promedio', 'Rotacion', 'Ingresos', 'Margen', 'Margen_%',
+    'Demanda_Min_Promedio', 'Demanda_Max_Promedio', 'Precio_Promedio', 'Costo_Promedio',
+]
+
+# Productos como máximo en una comparación (una celda de los múltiplos pequeños por producto)
+MAXIMO_PRODUCTOS = 24
+
+# Columnas de los múltiplos pequeños
+COLUMNAS_MULTIPLOS = 3
+
+
+# Almacén [producto × variable × periodo] con las series de VARIABLES de los tensores
+def construir_almacen(tensores):
+    return np.ascontiguousarray(np.stack([np.asarray(tensores[v], dtype=float) for v in VARIABLES], axis=1))
+
+
+# Posiciones de `ids` en el eje de productos de los tensores (sin los que no están)
+def posiciones(tensores, ids):
+    encontradas = pd.Index(np.asarray(tensores['productos']).astype(str)).get_indexer(
+        pd.Index(list(ids)).astype(str))
+    return encontradas[encontradas >= 0]
+
+
+# Indicadores de cada producto de un bloque [selección × variable × periodo]: un arreglo por
+# indicador, calculado para toda la selección con reducciones sobre el eje de periodos
+def indicadores(bloque, costo_almacen):
+    v = {variable: bloque[:, i] for i, variable in enumerate(VARIABLES)}
+    inventario_promedio = v['inventario'].mean(axis=1)
+    ventas_total = v['ventas'].sum(axis=1)
+    ingresos = (v['precio'] * v['ventas']).sum(axis=1)
+    margen = (ingresos - (v['costo'] * v['produccion']).sum(axis=1)
+              - costo_almacen * v['inventario'].sum(axis=1))
+    return {
+        'Produccion_Total': v['produccion'].sum(axis=1),
+        'Produccion_Promedio': v['produccion'].mean(axis=1),
+        'Produccion_Maxima': v['produccion'].max(axis=1),
+        'Produccion_Minima': v['produccion'].min(axis=1),
+        'Ventas_Total': ventas_total,
+        'Inventario_Promedio': inventario_promedio,
+        'Rotacion': np.divide(ventas_total, inventario_promedio, out=np.zeros_like(ventas_total),
+                              where=inventario_promedio > 0),
+        'Ingresos': ingresos,
+        'Margen': margen,
+        'Margen_%': np.divide(margen * 100, ingresos, out=np.zeros_like(margen), where=ingresos > 0),
+        'Demanda_Min_Promedio': v['demanda_min'].mean(axis=1),
+        'Demanda_Max_Promedio': v['demanda_max'].mean(axis=1),
+        'Precio_Promedio': v['precio'].mean(axis=1),
+        'Costo_Promedio': v['costo'].mean(axis=1),
+    }
+
+
+# Comparación de los productos `ids`: un gather del almacén y los indicadores de la selección
+def comparar(tensores, almacen, ids):
+    p = posiciones(tensores, ids)
+    bloque = almacen[p]
+    return {
+        'productos': np.asarray(tensores['productos'])[p].astype(str),
+        'periodos': tensores['periodos'],
+        'bloque': bloque,
+        'indicadores': indicadores(bloque, np.asarray(tensores['costo_almacen'], dtype=float)[p]),
+    }
+
+
+# Tabla de ranking de la comparación ordenada por `orden` (de mayor a menor), con el
+# puesto de cada producto y solo las columnas de `columnas`
+def ranking(comparacion, orden, columnas=INDICADORES, nombres=None):
+    valores = comparacion['indicadores']
+    puestos = np.argsort(-valores[orden], kind='stable')
+    productos = comparacion['productos'][puestos]
+    tabla = pd.DataFrame({c: valores[c][puestos] for c in dict.fromkeys([orden, *columnas])})
+    tabla.insert(0, 'Producto', [nombres.get(p, p) for p in productos] if nombres else productos)
+    tabla.insert(0, 'Puesto', np.arange(1, len(puestos) + 1))
+    return tabla
+
+
+# Múltiplos pequeños: una celda por producto con las series de `variables`, los mismos ejes
+# y la misma leyenda en todas
+def figura_multiplos(comparacion, variables, nombres=None, rango=None, titulo=None):
+    productos = comparacion['productos']
+    columnas = min(COLUMNAS_MULTIPLOS, max(len(productos), 1))
+    filas = max(math.ceil(len(productos) / columnas), 1)
+    titulos = [nombres.get(p, p) for p in productos] if nombres else list(productos)
+    figura = make_subplots(rows=filas, cols=columnas, subplot_titles=titulos, shared_xaxes=True,
+                           shared_yaxes=True, vertical_spacing=min(0.12, 0.3 / filas))
+    colores = qualitative.Plotly
+    for k in range(len(productos)):
+        for j, variable in enumerate(variables):
+            traza = series.traza_serie(comparacion['periodos'], comparacion['bloque'][k, VARIABLES.index(variable)],
+                                       rango=rango, name=TITULOS_VARIABLES[variable], legendgroup=variable,
+                                       showlegend=k == 0, line=dict(color=colores[j % len(colores)]))
+            figura.add_trace(traza, row=k // columnas + 1, col=k % columnas + 1)
+    figura.update_layout(title=titulo, height=220 * filas + 120, margin=dict(t=100))
+    return figura
+
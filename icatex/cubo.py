@@ -0,0 +1,215 @@
+import numpy as np
+import pandas as pd
+
+from icatex.datos import AÑO_INICIAL
+from icatex.tensores import posiciones_ids
+
+# Medidas del cubo: columna de DAT_PM_MATRIX (el margen se deriva de precio - costo)
+MEDIDAS = ['PrecioVenta', 'CostoInsumo', 'Margen', 'DemandaMinima', 'DemandaMaxima']
+
+# Atributos de producto por los que se materializan los acumulados
+DIMENSIONES = {'categoria': 'Categoria', 'linea': 'Linea'}
+
+
+def _margen_porcentaje(precio, margen):
+    return np.divide(margen * 100, precio, out=np.full_like(margen, np.nan, dtype=float),
+                     where=precio != 0)
+
+
+def _valores(pm_matrix):
+    valores = {
+        'PrecioVenta': pm_matrix['PrecioVenta'].to_numpy(dtype=float),
+        'CostoInsumo': pm_matrix['CostoInsumo'].to_numpy(dtype=float),
+        'DemandaMinima': pm_matrix['DemandaMinima'].to_numpy(dtype=float),
+        'DemandaMaxima': pm_matrix['DemandaMaxima'].to_numpy(dtype=float),
+    }
+    valores['Margen'] = valores['PrecioVenta'] - valores['CostoInsumo']
+    return valores
+
+
+# Suma de cada medida y número de observaciones por celda [producto × año × mes], más los
+# acumulados por categoría, línea y total. Se construye una vez por dataset con bincount;
+# cada vista del dashboard es después un corte de estos arreglos.
+def construir_cubo(pm_matrix, productos_fijos):
+    if not productos_fijos.empty:
+        productos = productos_fijos['ID_Producto'].to_numpy()
+    else:
+        productos = pm_matrix['ID_Producto'].unique()
+    periodo = pm_matrix['Periodo_Index'].to_numpy(dtype=int)
+    año = AÑO_INICIAL + (periodo - 1) // 12
+    años = np.unique(año)
+    P, A = len(productos), len(años)
+
+    p = posiciones_ids(pm_matrix['ID_Producto'], productos)
+    validos = p >= 0
+    a = np.searchsorted(años, año)
+    celda = ((p * A + a) * 12 + (periodo - 1) % 12)[validos]
+
+    valores = _valores(pm_matrix)
+    suma = {medida: np.bincount(celda, valores[medida][validos], minlength=P * A * 12).reshape(P, A, 12)
+            for medida in MEDIDAS}
+    conteo = np.bincount(celda, minlength=P * A * 12).reshape(P, A, 12)
+
+    # Periodo_Index de cada (año, mes); 0 donde no hay datos
+    periodos = np.zeros(A * 12, dtype=int)
+    periodos[(a * 12 + (periodo - 1) % 12)[validos]] = periodo[validos]
+
+    fijos = productos_fijos.set_index('ID_Producto').reindex(productos) if not productos_fijos.empty else None
+    atributos = {
+        'Nombre_Producto': fijos['Nombre_Producto'].to_numpy() if fijos is not None else productos,
+        **{columna: (fijos[columna].fillna('Sin asignar').to_numpy()
+                     if fijos is not None and columna in fijos else np.full(P, 'Sin asignar'))
+           for columna in DIMENSIONES.values()},
+    }
+
+    return {
+        'productos': productos,
+        'años': años,
+        'periodos': periodos.reshape(A, 12),
+        'atributos': atributos,
+        'suma': suma,
+        'conteo': conteo,
+        'acumulados': _acumulados(suma, conteo, atributos),
+    }
+
+
+# Acumulados por categoría, línea y total de las celdas [producto × año × mes]
+def _acumulados(suma, conteo, atributos):
+    acumulados = {'total': {'grupos': np.array(['Total']),
+                            'suma': {m: s.sum(axis=0, keepdims=True) for m, s in suma.items()},
+                            'conteo': conteo.sum(axis=0, keepdims=True)}}
+    for dimension, columna in DIMENSIONES.items():
+        grupos, codigo = np.unique(atributos[columna], return_inverse=True)
+        indicadora = np.eye(len(grupos))[codigo].T
+        acumulados[dimension] = {
+            'grupos': grupos,
+            'codigo': codigo,
+            'suma': {m: np.tensordot(indicadora, s, axes=1) for m, s in suma.items()},
+            'conteo': np.tensordot(indicadora, conteo, axes=1),
+        }
+    return acumulados
+
+
+# Corte del cubo a las posiciones de `productos` y a los Periodo_Index de `periodos`: las
+# celdas [año × mes] fuera del corte quedan vacías y los acumulados se rehacen sobre el
+# corte, sin volver a recorrer las filas de DAT_PM_MATRIX
+def filtrar_cubo(cubo, productos, periodos):
+    celdas = np.isin(cubo['periodos'], periodos) & (cubo['periodos'] > 0)
+    suma = {m: s[productos] * celdas for m, s in cubo['suma'].items()}
+    conteo = cubo['conteo'][productos] * celdas
+    atributos = {columna: valores[productos] for columna, valores in cubo['atributos'].items()}
+    return dict(cubo, productos=cubo['productos'][productos], periodos=np.where(celdas, cubo['periodos'], 0),
+                atributos=atributos, suma=suma, conteo=conteo, acumulados=_acumulados(suma, conteo, atributos))
+
+
+# Cubo con las filas nuevas de `pm_delta` sumadas a sus celdas y a las de los acumulados,
+# sin volver a recorrer la historia. Los arreglos del cubo (compactos: producto × año × mes)
+# se copian porque el cubo anterior sigue en uso; un año nuevo agrega su corte.
+def agregar_filas(cubo, pm_delta):
+    productos = cubo['productos']
+    periodo = pm_delta['Periodo_Index'].to_numpy(dtype=int)
+    año = AÑO_INICIAL + (periodo - 1) // 12
+    años = np.union1d(cubo['años'], año)
+    A = len(años)
+    anteriores = np.searchsorted(años, cubo['años'])
+
+    def ampliar(arreglo):
+        nuevo = np.zeros(arreglo.shape[:1] + (A, 12), dtype=arreglo.dtype)
+        nuevo[:, anteriores] = arreglo
+        return nuevo
+
+    p = posiciones_ids(pm_delta['ID_Producto'], productos)
+    validos = p >= 0
+    a = np.searchsorted(años, año)[validos]
+    mes = ((periodo - 1) % 12)[validos]
+    valores = {m: v[validos] for m, v in _valores(pm_delta).items()}
+
+    def sumar(suma, conteo, fila):
+        suma = {m: ampliar(s) for m, s in suma.items()}
+        conteo = ampliar(conteo)
+        celda = (fila * A + a) * 12 + mes
+        for m in MEDIDAS:
+            np.add.at(suma[m].reshape(-1), celda, valores[m])
+        np.add.at(conteo.reshape(-1), celda, 1)
+        return suma, conteo
+
+    suma, conteo = sumar(cubo['suma'], cubo['conteo'], p[validos])
+    periodos = ampliar(cubo['periodos'][None])[0]
+    periodos[a, mes] = periodo[validos]
+
+    acumulados = {}
+    for dimension, acumulado in cubo['acumulados'].items():
+        fila = acumulado['codigo'][p[validos]] if 'codigo' in acumulado else np.zeros(len(a), dtype=int)
+        suma_grupo, conteo_grupo = sumar(acumulado['suma'], acumulado['conteo'], fila)
+        acumulados[dimension] = dict(acumulado, suma=suma_grupo, conteo=conteo_grupo)
+
+    return dict(cubo, años=años, periodos=periodos, suma=suma, conteo=conteo, acumulados=acumulados)
+
+
+def _medias(suma, conteo, eje):
+    total = conteo.sum(axis=eje)
+    return {m: np.divide(s.sum(axis=eje), total, out=np.full(total.shape, np.nan), where=total > 0)
+            for m, s in suma.items()}, total
+
+
+# Años con datos, para todo el catálogo o para un producto
+def años_disponibles(cubo, id_producto=None):
+    conteo = cubo['conteo'] if id_producto is None else cubo['conteo'][_posicion(cubo, id_producto)][None]
+    return cubo['años'][conteo.sum(axis=(0, 2)) > 0].tolist()
+
+
+def _posicion(cubo, id_producto):
+    return pd.Index(cubo['productos']).get_loc(id_producto)
+
+
+# Serie mensual de un año: medias por periodo sobre todos los productos ('total') o sobre
+# un grupo de un acumulado ('categoria', 'linea')
+def serie_mensual(cubo, año, nivel='total', grupo='Total'):
+    acumulado = cubo['acumulados'][nivel]
+    g = int(np.flatnonzero(acumulado['grupos'] == grupo)[0])
+    a = int(np.searchsorted(cubo['años'], año))
+    medias, conteo = _medias({m: s[g, a][None] for m, s in acumulado['suma'].items()},
+                             acumulado['conteo'][g, a][None], eje=0)
+    serie = pd.DataFrame({'Periodo_Index': cubo['periodos'][a], 'Mes': np.arange(1, 13), **medias})
+    serie['Margen_Porcentaje'] = _margen_porcentaje(serie['PrecioVenta'].to_numpy(), serie['Margen'].to_numpy())
+    return serie[conteo > 0].reset_index(drop=True)
+
+
+# Detalle mensual de un producto en un año
+def detalle_producto(cubo, id_producto, año):
+    p = _posicion(cubo, id_producto)
+    a = int(np.searchsorted(cubo['años'], año))
+    medias, conteo = _medias({m: s[p, a][None] for m, s in cubo['suma'].items()},
+                             cubo['conteo'][p, a][None], eje=0)
+    detalle = pd.DataFrame({'Periodo_Index': cubo['periodos'][a], 'Mes': np.arange(1, 13), **medias})
+    detalle['Margen_Porcentaje'] = _margen_porcentaje(detalle['PrecioVenta'].to_numpy(), detalle['Margen'].to_numpy())
+    return detalle[conteo > 0].reset_index(drop=True)
+
+
+# Medias por producto en un año (o en toda la historia si año es None)
+def resumen_productos(cubo, año=None):
+    if año is None:
+        suma, conteo = cubo['suma'], cubo['conteo']
+        medias, total = _medias({m: s.reshape(len(s), -1) for m, s in suma.items()},
+                                conteo.reshape(len(conteo), -1), eje=1)
+    else:
+        a = int(np.searchsorted(cubo['años'], año))
+        medias, total = _medias({m: s[:, a] for m, s in cubo['suma'].items()}, cubo['conteo'][:, a], eje=1)
+    resumen = pd.DataFrame({'ID_Producto': cubo['productos'], **cubo['atributos'], **medias})
+    resumen['Margen_Porcentaje'] = _margen_porcentaje(resumen['PrecioVenta'].to_numpy(), resumen['Margen'].to_numpy())
+    return resumen[total > 0].reset_index(drop=True)
+
+
+# Promedio de los indicadores por producto dentro de cada grupo ('categoria', 'linea'):
+# cada producto pesa lo mismo, como en la tabla de rentabilidad por producto
+def resumen_grupos(cubo, dimension, año=None):
+    acumulado = cubo['acumulados'][dimension]
+    productos = resumen_productos(cubo, año)
+    codigo = acumulado['codigo'][pd.Index(cubo['productos']).get_indexer(productos['ID_Producto'])]
+    n = np.bincount(codigo, minlength=len(acumulado['grupos']))
+    columnas = MEDIDAS + ['Margen_Porcentaje']
+    resumen = pd.DataFrame({DIMENSIONES[dimension]: acumulado['grupos']})
+    for columna in columnas:
+        resumen[columna] = np.bincount(codigo, productos[columna].to_numpy(dtype=float),
+                                       minlength=len(n)) / np.maximum(n, 1)
+    return resumen[n > 0].reset_index(drop=True)
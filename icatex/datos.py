@@ -0,0 +1,190 @@
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from icatex import esquema
+from icatex.tensores import huella_dataset
+
+# Libro de Excel que LINGO lee y escribe
+RUTA_LIBRO = "ICATEX_Lingo_4Anios.xlsx"
+
+# Extensiones de las bases embebidas (icatex.almacen) aceptadas en lugar del libro
+EXTENSIONES_ALMACEN = ('.db', '.sqlite', '.sqlite3')
+
+# Año del Periodo_Index 1
+AÑO_INICIAL = 2021
+
+HOJAS = [
+    'SET_PRODUCTOS', 'SET_MESES', 'SET_INSUMOS', 'SET_PROCESOS',
+    'DAT_PI_MATRIX', 'DAT_PP_MATRIX', 'DAT_PM_MATRIX', 'DAT_PJM_MATRIX',
+    'DAT_KM_MATRIX', 'DAT_PRODUCTOS_FIJOS'
+]
+
+# Resultados de LINGO en formato largo (una fila por entidad y periodo)
+HOJAS_RESULTADOS = ['RES_PRODUCCION', 'RES_VENTAS', 'RES_INVENTARIO', 'RES_H_EXTRAS']
+
+# Hoja opcional con las desviaciones del modelo de programación por metas (columnas
+# Desviacion y Valor). Solo entra al dataset si el origen la trae; si no, la huella no cambia.
+HOJA_METAS = 'RES_METAS'
+
+# Dimensiones de las hojas de resultados de LINGO (sin encabezado utilizable) cuando el
+# libro no trae los conjuntos SET_* de los que deducirlas
+PRODUCTOS_RESULTADOS = 20
+PROCESOS_RESULTADOS = 5
+PERIODOS_RESULTADOS = 48
+
+# Nombres de insumos y procesos por código (el libro solo trae los códigos)
+nombres_insumos = {
+    'I001': 'Algodón Premium', 'I002': 'Poliester', 'I003': 'Elastano',
+    'I004': 'Hilo Costura', 'I005': 'Colorante Rojo', 'I006': 'Colorante Azul',
+    'I007': 'Botones Madera', 'I008': 'Cremalleras', 'I009': 'Etiquetas',
+    'I010': 'Bolsas Empaque', 'I011': 'Tinta Estampado', 'I012': 'Hilo Bordar',
+    'I013': 'Lentejuelas', 'I014': 'Mostacillas', 'I015': 'Material Básico'
+}
+
+nombres_procesos = {
+    'PR001': 'Corte Tela', 'PR002': 'Costura Básica', 'PR003': 'Bordado',
+    'PR004': 'Planchado', 'PR005': 'Empaquetado'
+}
+
+
+# Identificadores (entidad, periodo) en el orden en que LINGO escribe los resultados
+def _indices_resultados(ids, periodos):
+    return np.repeat(ids, periodos), np.tile(np.arange(1, periodos + 1), len(ids))
+
+
+# Entidades de un conjunto SET_* (o los códigos por defecto si falta la hoja)
+def _ids_conjunto(data, hoja, columna, prefijo, entidades):
+    if data[hoja].empty:
+        return np.array([f"{prefijo}{e:03d}" for e in range(1, entidades + 1)])
+    return data[hoja][columna].to_numpy()
+
+
+# Lee las hojas SET_*/DAT_* y los resultados de LINGO tal como están en el libro. No depende
+# de Streamlit: los problemas de lectura se devuelven como avisos en lugar de mostrarse.
+def leer_libro(ruta=RUTA_LIBRO):
+    data = {}
+    avisos = []
+
+    try:
+        libro = pd.ExcelFile(ruta)
+    except Exception as e:
+        avisos.append(f"No se pudo abrir el libro {ruta}: {e}")
+        libro = None
+
+    def leer(hoja, **opciones):
+        if libro is None:
+            raise FileNotFoundError(ruta)
+        return libro.parse(hoja, **opciones)
+
+    for hoja in HOJAS:
+        try:
+            data[hoja] = leer(hoja)
+        except Exception as e:
+            avisos.append(f"No se pudo cargar la hoja {hoja}: {e}")
+            data[hoja] = pd.DataFrame()
+
+    productos = _ids_conjunto(data, 'SET_PRODUCTOS', 'ID_Producto', 'P', PRODUCTOS_RESULTADOS)
+    procesos = _ids_conjunto(data, 'SET_PROCESOS', 'ID_Proceso', 'PR', PROCESOS_RESULTADOS)
+    periodos = len(data['SET_MESES']) if not data['SET_MESES'].empty else PERIODOS_RESULTADOS
+
+    # Resultados de producción, ventas e inventario (una fila por producto y periodo)
+    filas = len(productos) * periodos
+    try:
+        resultados = leer('RESULTADOS', header=None, skiprows=1)
+        if len(resultados) >= filas:
+            id_productos, periodo_indices = _indices_resultados(productos, periodos)
+            for hoja, columna, k in [('RES_PRODUCCION', 'Produccion', 0),
+                                     ('RES_VENTAS', 'Ventas', 1),
+                                     ('RES_INVENTARIO', 'Inventario', 2)]:
+                data[hoja] = pd.DataFrame({
+                    'ID_Producto': id_productos,
+                    'Periodo_Index': periodo_indices,
+                    columna: resultados.iloc[:filas, k].astype(float).values
+                })
+        else:
+            avisos.append(f"Resultados insuficientes: {len(resultados)} filas, se esperaban {filas}")
+            for hoja in ['RES_PRODUCCION', 'RES_VENTAS', 'RES_INVENTARIO']:
+                data[hoja] = pd.DataFrame()
+    except Exception as e:
+        avisos.append(f"No se pudieron cargar los resultados de LINGO: {e}")
+        for hoja in ['RES_PRODUCCION', 'RES_VENTAS', 'RES_INVENTARIO']:
+            data[hoja] = pd.DataFrame()
+
+    # Horas extra por proceso y periodo
+    filas = len(procesos) * periodos
+    try:
+        horas_extra = leer('RES_HORAS_EXTRA', header=None, skiprows=1)
+        if len(horas_extra) >= filas:
+            id_procesos, periodo_indices = _indices_resultados(procesos, periodos)
+            data['RES_H_EXTRAS'] = pd.DataFrame({
+                'ID_Proceso': id_procesos,
+                'Periodo_Index': periodo_indices,
+                'HorasExtrasMinutos': horas_extra.iloc[:filas, 0].astype(float).values
+            })
+        else:
+            avisos.append(f"Horas extra insuficientes: {len(horas_extra)} filas, se esperaban {filas}")
+            data['RES_H_EXTRAS'] = pd.DataFrame()
+    except Exception as e:
+        avisos.append(f"No se pudieron cargar las horas extra de LINGO: {e}")
+        data['RES_H_EXTRAS'] = pd.DataFrame()
+
+    if libro is not None and HOJA_METAS in libro.sheet_names:
+        try:
+            data[HOJA_METAS] = leer(HOJA_METAS)
+        except Exception as e:
+            avisos.append(f"No se pudo cargar la hoja {HOJA_METAS}: {e}")
+
+    return data, avisos
+
+
+# Lee un directorio columnar: un <HOJA>.parquet por hoja, con los resultados ya en formato
+# largo (lo escribe icatex.sintetico con --formato parquet)
+def leer_columnar(ruta):
+    data = {}
+    avisos = []
+    for hoja in HOJAS + HOJAS_RESULTADOS:
+        archivo = Path(ruta) / f"{hoja}.parquet"
+        if archivo.exists():
+            data[hoja] = pd.read_parquet(archivo)
+        else:
+            avisos.append(f"No se encontró la hoja {hoja} en {ruta}")
+            data[hoja] = pd.DataFrame()
+    if (Path(ruta) / f"{HOJA_METAS}.parquet").exists():
+        data[HOJA_METAS] = pd.read_parquet(Path(ruta) / f"{HOJA_METAS}.parquet")
+    return data, avisos
+
+
+# Año y mes de cada fila de PM_MATRIX (Periodo 1 = Enero del año inicial)
+def completar_pm_matrix(pm_matrix):
+    if not pm_matrix.empty:
+        periodo = pm_matrix['Periodo_Index']
+        pm_matrix['Año'] = AÑO_INICIAL + (periodo - 1) // 12
+        pm_matrix['Mes'] = (periodo - 1) % 12 + 1
+    return pm_matrix
+
+
+# Columnas derivadas y huella del dataset, comunes a todos los orígenes
+def completar_datos(data):
+    completar_pm_matrix(data['DAT_PM_MATRIX'])
+
+    # Huella del dataset para las cachés de los motores de cálculo
+    data['HUELLA'] = huella_dataset(data)
+    return data
+
+
+# Carga el dataset desde un libro de Excel, un directorio columnar o una base embebida. En la base se elige
+# la planta y se pueden pasar filtros (productos, insumos, procesos, años) que se resuelven
+# en la consulta, de modo que solo se materializa ese corte. Todas las hojas salen con el
+# esquema tipado de icatex.esquema.
+def cargar_datos(ruta=RUTA_LIBRO, planta=None, **filtros):
+    if str(ruta).lower().endswith(EXTENSIONES_ALMACEN):
+        from icatex import almacen
+        data, avisos = almacen.leer_datos(ruta, planta, **filtros)
+    elif Path(ruta).is_dir():
+        data, avisos = leer_columnar(ruta)
+    else:
+        data, avisos = leer_libro(ruta)
+    avisos += esquema.aplicar(data)
+    return completar_datos(data), avisos
@@ -0,0 +1,386 @@
+import argparse
+import hashlib
+import io
+import json
+import os
+import re
+import threading
+import time
+from datetime import datetime
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from icatex.caches import CacheLRU
+from icatex.datos import HOJA_METAS, RUTA_LIBRO
+from icatex.objetivo import META_HORAS_EXTRA, META_UTILIDAD, cumplimiento_metas, evaluar_objetivo
+
+# Almacén de escenarios con nombre: ajustes de parámetros, plan [producto × periodo] (y
+# horas extra [proceso × periodo]), indicadores y datos del motor que lo generó. Cada
+# escenario es un .npz comprimido en un directorio junto al origen que guarda solo la
+# diferencia con el plan base de LINGO, dispersa cuando cambia menos de la mitad de las
+# celdas; así cientos de planes completos ocupan poco. La comparación apila los planes de
+# N escenarios en arreglos [escenario × fila × periodo] y resta el de referencia de una vez.
+#
+#   ICATEX_ESCENARIOS=ruta          directorio del almacén (por defecto <origen>.escenarios)
+#   python -m icatex.escenarios listar --ruta ICATEX_Lingo_4Anios.xlsx.escenarios
+#   python -m icatex.escenarios comparar "Precios +10%" "Precios óptimos"
+
+# Arreglos del plan que guarda un escenario (diferencia con los tensores base)
+PLAN = ('precio', 'costo', 'produccion', 'ventas', 'inventario', 'horas_extra')
+
+# Indicadores por celda de la comparación y el arreglo de entidades de sus filas
+INDICADORES = {'utilidad': 'productos', 'inventario': 'productos', 'horas_extra': 'procesos'}
+
+# Desviaciones del modelo de programación por metas resuelto en LINGO (MIN = 1 × D_UTIL_NEG
+# + 5 × D_HE_POS). Salen de la hoja RES_METAS del dataset; DESVIACIONES_LINGO son las de la
+# corrida del libro incluido, que no trae esa hoja. No tienen plan: la página de metas las
+# muestra como escenario de referencia solo de indicadores, armado en memoria.
+METAS_LINGO = 'Programación por metas (LINGO)'
+DESVIACIONES_LINGO = {'D_UTIL_NEG': 3422729.51, 'D_HE_POS': 25712344}
+SOLUCIONADOR_METAS = {'motor': 'LINGO', 'modelo': 'programación por metas', 'pesos': {'D_UTIL_NEG': 1, 'D_HE_POS': 5}}
+
+# Escenarios leídos por (archivo, fecha de modificación, tamaño)
+CACHE_ESCENARIOS = CacheLRU('escenarios', max_entradas=512)
+
+
+def ruta_escenarios(origen=RUTA_LIBRO):
+    return os.environ.get('ICATEX_ESCENARIOS', f"{origen}.escenarios")
+
+
+def _archivo(ruta, nombre):
+    legible = re.sub(r'[^\w-]+', '_', nombre).strip('_')[:40] or 'escenario'
+    return Path(ruta) / f"{legible}-{hashlib.sha1(nombre.encode()).hexdigest()[:8]}.npz"
+
+
+def _forma(tensores):
+    return {'productos': len(tensores['productos']), 'procesos': len(tensores['procesos']),
+            'periodos': len(tensores['periodos'])}
+
+
+# Diferencia de un arreglo con el base: None si no cambia; índices planos y valores si
+# cambia menos de la mitad de las celdas; si no, la diferencia densa. Los valores se
+# guardan en float32 cuando todos son exactos.
+def _comprimir(diferencia):
+    cambios = np.flatnonzero(diferencia)
+    if cambios.size == 0:
+        return None
+    dispersa = cambios.size < diferencia.size // 2
+    valores = diferencia.ravel()[cambios] if dispersa else diferencia
+    reducidos = valores.astype(np.float32)
+    if np.array_equal(reducidos, valores):
+        valores = reducidos
+    if dispersa:
+        return {'indices': cambios.astype(np.int32), 'valores': valores}
+    return {'denso': valores}
+
+
+def _descomprimir(partes, forma):
+    if 'denso' in partes:
+        return partes['denso'].astype(np.float64)
+    diferencia = np.zeros(int(np.prod(forma)))
+    diferencia[partes['indices']] = partes['valores']
+    return diferencia.reshape(forma)
+
+
+# Escalares de numpy en los parámetros y los indicadores
+def _json(valor):
+    return valor.item() if isinstance(valor, np.generic) else str(valor)
+
+
+# Indicadores de un plan: función objetivo, totales y cumplimiento de las metas
+def indicadores(tensores, plan):
+    tensores = dict(tensores, precio=plan['precio'], costo=plan['costo'])
+    resultado = evaluar_objetivo(tensores, plan['produccion'], plan['ventas'], plan['inventario'],
+                                 plan['horas_extra'])
+    resultado.update({
+        'Produccion': float(plan['produccion'].sum()),
+        'Ventas': float(plan['ventas'].sum()),
+        'Inventario': float(plan['inventario'].sum()),
+        'Horas_Extra': float(plan['horas_extra'].sum()),
+    })
+    metas = cumplimiento_metas(resultado['Z'], resultado['Horas_Extra'])
+    resultado.update({clave: metas[clave] for clave in ('Falta_Utilidad', 'Exceso_Horas_Extra',
+                                                        'Puntuacion_Ponderada_%')})
+    return resultado
+
+
+def plan_base(tensores):
+    return {arreglo: tensores[arreglo] for arreglo in PLAN}
+
+
+# Horas extra [proceso × periodo] de un plan de producción: las del plan base más el cambio
+# en los minutos que exceden la capacidad de cada proceso. `PP` permite tiempos ajustados.
+def reprogramar_horas_extra(tensores, produccion, PP=None):
+    PP = tensores['PP'] if PP is None else PP
+    capacidad = tensores['capacidad']
+    exceso = np.maximum(np.asarray(PP.T @ produccion) - capacidad, 0)
+    exceso_base = np.maximum(np.asarray(tensores['PP'].T @ tensores['produccion']) - capacidad, 0)
+    return np.maximum(tensores['horas_extra'] + exceso - exceso_base, 0)
+
+
+# Plan con los precios del catálogo optimizados (icatex.precios.optimizar_precios): las
+# ventas cambian lo que cambia la demanda estimada al nuevo precio, la producción las sigue
+# con el mismo inventario y las horas extra absorben los minutos por encima de la capacidad
+def plan_precios(tensores, optimo):
+    cambio = optimo['demanda'] - optimo['respuesta']['demanda_referencia']
+    ventas = np.maximum(tensores['ventas'] + cambio, 0)
+    produccion = np.maximum(tensores['produccion'] + ventas - tensores['ventas'], 0)
+    return dict(plan_base(tensores), precio=optimo['precio'], ventas=ventas, produccion=produccion,
+                horas_extra=reprogramar_horas_extra(tensores, produccion))
+
+
+# Plan con los ajustes del simulador para un producto: factores de precio, costo de insumos,
+# tiempo de proceso y volumen (producción, ventas e inventario se escalan juntos, así el
+# balance de inventario se mantiene)
+def plan_ajustes(tensores, producto, precio=1.0, costo=1.0, tiempo=1.0, volumen=1.0):
+    i = list(tensores['productos']).index(producto)
+    plan = {arreglo: valor.copy() for arreglo, valor in plan_base(tensores).items()}
+    plan['precio'][i] *= precio
+    plan['costo'][i] *= costo
+    for arreglo in ('produccion', 'ventas', 'inventario'):
+        plan[arreglo][i] *= volumen
+    PP = tensores['PP'].tolil(copy=True)
+    PP[i] = PP[i] * tiempo
+    plan['horas_extra'] = reprogramar_horas_extra(tensores, plan['produccion'], PP.tocsr())
+    return plan
+
+
+# Guarda (o reemplaza) un escenario. `plan` son los arreglos de PLAN que cambian (el resto
+# se toma del base); sin plan se guardan solo los `kpis` dados. `solucionador` describe el
+# motor que produjo el plan (nombre, parámetros, iteraciones, segundos).
+def guardar_escenario(ruta, nombre, tensores=None, plan=None, parametros=None, solucionador=None,
+                      kpis=None, huella=None):
+    ruta = Path(ruta)
+    ruta.mkdir(parents=True, exist_ok=True)
+    arreglos = {}
+    if plan is not None:
+        completo = dict(plan_base(tensores), **plan)
+        for arreglo in PLAN:
+            partes = _comprimir(np.asarray(completo[arreglo], dtype=np.float64) - tensores[arreglo])
+            for parte, valor in (partes or {}).items():
+                arreglos[f"{arreglo}.{parte}"] = valor
+        kpis = dict(indicadores(tensores, completo), **(kpis or {}))
+    meta = {
+        'nombre': nombre,
+        'fecha': datetime.now().isoformat(timespec='seconds'),
+        'huella': huella,
+        'forma': _forma(tensores) if tensores is not None else None,
+        'con_plan': plan is not None,
+        'parametros': parametros or {},
+        'solucionador': solucionador or {},
+        'kpis': kpis or {},
+    }
+    arreglos['meta'] = np.frombuffer(json.dumps(meta, ensure_ascii=False, default=_json).encode(), dtype=np.uint8)
+
+    # Se escribe completo en memoria y se publica con un rename: un lector nunca ve un
+    # escenario a medias
+    contenido = io.BytesIO()
+    np.savez_compressed(contenido, **arreglos)
+    destino = _archivo(ruta, nombre)
+    temporal = ruta / f".{os.getpid()}-{threading.get_ident()}.tmp"
+    temporal.write_bytes(contenido.getvalue())
+    os.replace(temporal, destino)
+    return destino
+
+
+# Metadatos y diferencias de un archivo de escenario
+def leer_escenario(archivo):
+    archivo = Path(archivo)
+    estado = archivo.stat()
+
+    def leer():
+        with np.load(archivo) as npz:
+            meta = json.loads(npz['meta'].tobytes().decode())
+            diferencias = {}
+            for clave in npz.files:
+                if clave != 'meta':
+                    arreglo, _, parte = clave.partition('.')
+                    diferencias.setdefault(arreglo, {})[parte] = npz[clave]
+        return dict(meta, archivo=str(archivo), bytes=estado.st_size), diferencias
+    return CACHE_ESCENARIOS.obtener_o_calcular((str(archivo), estado.st_mtime_ns, estado.st_size), leer)
+
+
+def archivos(ruta):
+    ruta = Path(ruta)
+    return sorted(ruta.glob('*.npz')) if ruta.is_dir() else []
+
+
+# Una fila por escenario del almacén con sus metadatos e indicadores
+def listar(ruta):
+    filas = []
+    for archivo in archivos(ruta):
+        meta, _ = leer_escenario(archivo)
+        filas.append({'Escenario': meta['nombre'], 'Fecha': meta['fecha'], 'Plan': meta['con_plan'],
+                      'Motor': meta['solucionador'].get('motor', ''), 'Huella': meta['huella'],
+                      **meta['kpis'], 'Bytes': meta['bytes']})
+    return pd.DataFrame(filas).sort_values('Fecha', ascending=False, ignore_index=True) if filas else pd.DataFrame()
+
+
+def buscar(ruta, nombre):
+    archivo = _archivo(ruta, nombre)
+    if not archivo.exists():
+        raise KeyError(f"No hay un escenario llamado {nombre!r} en {ruta}")
+    return archivo
+
+
+def eliminar(ruta, nombre):
+    buscar(ruta, nombre).unlink()
+
+
+# Un plan se guarda como diferencia contra el dataset de `huella`: aplicado sobre otro
+# (otra planta, otro libro o un corte filtrado con la misma forma) daría un plan equivocado
+def _comprobar_plan(meta, nombre, tensores, huella):
+    if not meta['con_plan']:
+        raise ValueError(f"El escenario {nombre!r} solo tiene indicadores")
+    if meta['huella'] != huella:
+        raise ValueError(f"El escenario {nombre!r} es de otro dataset (huella {meta['huella']}, "
+                         f"la actual es {huella})")
+    if meta['forma'] != _forma(tensores):
+        raise ValueError(f"El escenario {nombre!r} es de un dataset con otra forma ({meta['forma']})")
+
+
+# Metadatos y plan completo (base + diferencia) de un escenario sobre los tensores dados,
+# que deben ser los del dataset de `huella` con el que se guardó
+def cargar_escenario(ruta, nombre, tensores, huella):
+    meta, diferencias = leer_escenario(buscar(ruta, nombre))
+    _comprobar_plan(meta, nombre, tensores, huella)
+    plan = {arreglo: tensores[arreglo] + _descomprimir(diferencias[arreglo], tensores[arreglo].shape)
+            if arreglo in diferencias else tensores[arreglo] for arreglo in PLAN}
+    return meta, plan
+
+
+# Desviaciones D_UTIL_NEG y D_HE_POS de la hoja RES_METAS del dataset (una desviación que
+# la hoja no trae vale 0); sin la hoja, las de la corrida de LINGO del libro incluido
+def desviaciones_metas(data=None):
+    hoja = (data or {}).get(HOJA_METAS)
+    if hoja is None or hoja.empty or not {'Desviacion', 'Valor'} <= set(hoja.columns):
+        return dict(DESVIACIONES_LINGO)
+    valores = pd.Series(hoja['Valor'].to_numpy(dtype=float), index=hoja['Desviacion'].astype(str))
+    return {clave: float(valores.get(clave, 0.0)) for clave in DESVIACIONES_LINGO}
+
+
+# Cumplimiento de metas del modelo de programación por metas de LINGO (sus desviaciones
+# D_UTIL_NEG y D_HE_POS). Es lo que muestran la página de metas, la API y el reporte.
+def kpis_metas_lingo(data=None):
+    desviaciones = desviaciones_metas(data)
+    kpis = cumplimiento_metas(META_UTILIDAD - desviaciones['D_UTIL_NEG'],
+                              META_HORAS_EXTRA + desviaciones['D_HE_POS'])
+    kpis.update({'Z': kpis['Utilidad'], **desviaciones})
+    return kpis
+
+
+# Escenario de referencia de las metas de LINGO con los metadatos de un escenario guardado,
+# armado en memoria: no toca el almacén
+def referencia_metas_lingo(data=None):
+    return {'nombre': METAS_LINGO, 'huella': (data or {}).get('HUELLA'), 'con_plan': False,
+            'parametros': {}, 'solucionador': SOLUCIONADOR_METAS, 'kpis': kpis_metas_lingo(data)}
+
+
+# Comparación de N escenarios (con plan) contra el de índice `referencia`. Las diferencias
+# guardadas se apilan en arreglos [escenario × fila × periodo]; la utilidad, el inventario y
+# las horas extra de cada celda y su cambio contra la referencia salen de una operación
+# sobre la pila completa. Todos deben ser planes sobre el dataset de `huella`.
+def comparar(ruta, nombres, tensores, huella, referencia=0):
+    pilas = {arreglo: np.broadcast_to(tensores[arreglo], (len(nombres),) + tensores[arreglo].shape).copy()
+             for arreglo in PLAN}
+    metas = []
+    for k, nombre in enumerate(nombres):
+        meta, diferencias = leer_escenario(buscar(ruta, nombre))
+        _comprobar_plan(meta, nombre, tensores, huella)
+        metas.append(meta)
+        for arreglo, partes in diferencias.items():
+            if 'denso' in partes:
+                pilas[arreglo][k] += partes['denso']
+            else:
+                pilas[arreglo][k].ravel()[partes['indices']] += partes['valores']
+
+    valores = {
+        'utilidad': pilas['precio'] * pilas['ventas'] - pilas['costo'] * pilas['produccion']
+                    - tensores['costo_almacen'][None, :, None] * pilas['inventario'],
+        'inventario': pilas['inventario'],
+        'horas_extra': pilas['horas_extra'],
+    }
+    kpis = pd.DataFrame([m['kpis'] for m in metas], index=pd.Index(nombres, name='Escenario'))
+    return {
+        'escenarios': list(nombres),
+        'referencia': referencia,
+        'valores': valores,
+        'cambios': {clave: v - v[referencia] for clave, v in valores.items()},
+        'kpis': kpis,
+        'cambios_kpis': kpis - kpis.iloc[referencia],
+        'productos': tensores['productos'],
+        'procesos': tensores['procesos'],
+        'periodos': tensores['periodos'],
+    }
+
+
+# Las `n` celdas (escenario, entidad, periodo) con el mayor cambio absoluto de cada
+# indicador contra la referencia, elegidas con argpartition sobre la pila aplanada
+def mayores_cambios(comparacion, n=10):
+    filas = []
+    for indicador, entidades in INDICADORES.items():
+        cambios = comparacion['cambios'][indicador]
+        plano = np.abs(cambios).ravel()
+        k = min(n, int(np.count_nonzero(plano)))
+        if k == 0:
+            continue
+        mayores = np.argpartition(plano, plano.size - k)[plano.size - k:]
+        escenario, fila, periodo = np.unravel_index(mayores, cambios.shape)
+        filas.append(pd.DataFrame({
+            'Indicador': indicador,
+            'Escenario': np.asarray(comparacion['escenarios'], dtype=object)[escenario],
+            'Entidad': comparacion[entidades][fila],
+            'Periodo': comparacion['periodos'][periodo],
+            'Referencia': comparacion['valores'][indicador][comparacion['referencia'], fila, periodo],
+            'Valor': comparacion['valores'][indicador][escenario, fila, periodo],
+            'Cambio': cambios[escenario, fila, periodo],
+        }))
+    if not filas:
+        return pd.DataFrame(columns=['Indicador', 'Escenario', 'Entidad', 'Periodo', 'Referencia', 'Valor', 'Cambio'])
+    tabla = pd.concat(filas, ignore_index=True)
+    return tabla.iloc[np.argsort(-np.abs(tabla['Cambio'].to_numpy()), kind='stable')].reset_index(drop=True)
+
+
+# Cambio total de cada indicador por entidad (suma sobre periodos) de un escenario
+def cambios_por_entidad(comparacion, escenario):
+    k = comparacion['escenarios'].index(escenario)
+    return {indicador: pd.Series(comparacion['cambios'][indicador][k].sum(axis=1),
+                                 index=comparacion[entidades], name=indicador)
+            for indicador, entidades in INDICADORES.items()}
+
+
+def main(argumentos=None):
+    parser = argparse.ArgumentParser(description="Almacén de escenarios de ICATEX")
+    parser.add_argument('--ruta', default=ruta_escenarios(), help="Directorio del almacén de escenarios")
+    subcomandos = parser.add_subparsers(dest='comando', required=True)
+    subcomandos.add_parser('listar', help="Lista los escenarios guardados")
+    diferencia = subcomandos.add_parser('comparar', help="Compara escenarios contra el primero")
+    diferencia.add_argument('nombres', nargs='+')
+    diferencia.add_argument('--libro', default=RUTA_LIBRO)
+    diferencia.add_argument('--planta', default=None)
+    diferencia.add_argument('--mayores', type=int, default=15, help="Celdas con mayor cambio a listar")
+    opciones = parser.parse_args(argumentos)
+
+    if opciones.comando == 'listar':
+        tabla = listar(opciones.ruta)
+        columnas = [c for c in ('Escenario', 'Fecha', 'Motor', 'Z', 'Horas_Extra', 'Inventario', 'Bytes')
+                    if c in tabla.columns]
+        print(tabla[columnas].to_string(index=False, float_format=lambda v: f"{v:,.0f}"))
+        return
+
+    from icatex.datos import cargar_datos
+    from icatex.tensores import construir_tensores
+    data, _ = cargar_datos(opciones.libro, opciones.planta)
+    inicio = time.perf_counter()
+    comparacion = comparar(opciones.ruta, opciones.nombres, construir_tensores(data), data['HUELLA'])
+    print(f"{len(opciones.nombres)} escenarios comparados en {(time.perf_counter() - inicio) * 1000:.1f} ms")
+    columnas = [c for c in ('Z', 'Ingresos', 'Horas_Extra', 'Inventario') if c in comparacion['cambios_kpis']]
+    print(comparacion['cambios_kpis'][columnas].to_string(float_format=lambda v: f"{v:,.0f}"))
+    print()
+    print(mayores_cambios(comparacion, opciones.mayores).to_string(index=False, float_format=lambda v: f"{v:,.1f}"))
+
+
+if __name__ == '__main__':
+    main()
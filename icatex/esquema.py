@@ -0,0 +1,144 @@
+import os
+
+import numpy as np
+import pandas as pd
+
+# Esquema tipado del dataset, aplicado al cargar (icatex.datos.cargar_datos) sobre cualquier
+# origen. Los identificadores pasan a categóricos con las categorías del catálogo SET_*
+# (cada fila guarda un código entero en lugar de un texto), las claves de periodo a int32 y
+# las medidas a float32 cuando se puede. La validación de tipos y rangos de cada hoja se
+# hace en una sola pasada vectorizada sobre todas sus medidas y vuelve como avisos.
+#
+#   ICATEX_IDS=categoria|texto                identificadores categóricos o texto
+#   ICATEX_MEDIDAS=sin_perdida|float32|float64
+#       sin_perdida: float32 solo si todos los valores de la columna son exactos en float32
+#       float32: todas las medidas en float32 (error relativo ≤ 6e-8 por valor)
+#       float64: sin reducir
+
+IDS = os.environ.get('ICATEX_IDS', 'categoria')
+MEDIDAS = os.environ.get('ICATEX_MEDIDAS', 'sin_perdida')
+
+# Catálogo de cada columna de identificador: hoja y columna del conjunto
+CATALOGOS = {
+    'ID_Producto': ('SET_PRODUCTOS', 'ID_Producto'),
+    'ID_Insumo': ('SET_INSUMOS', 'ID_Insumo'),
+    'ID_Proceso': ('SET_PROCESOS', 'ID_Proceso'),
+}
+
+# Atributos de texto con pocos valores distintos (categóricos con sus propias categorías)
+ETIQUETAS = ['Nombre_Producto', 'Categoria', 'Linea']
+
+# Claves enteras y su rango válido
+CLAVES = {'Periodo_Index': (1, np.inf), 'Año': (1900, 2200), 'Mes': (1, 12)}
+
+# Rango válido de las medidas: todas son cantidades, precios, costos o tiempos
+RANGO_MEDIDAS = (0, np.inf)
+
+# Los conjuntos SET_* son los catálogos y quedan como están
+HOJAS_CATALOGO = ('SET_PRODUCTOS', 'SET_MESES', 'SET_INSUMOS', 'SET_PROCESOS')
+
+
+# Identificadores de cada catálogo en el orden del conjunto (los productos, de
+# DAT_PRODUCTOS_FIJOS si el conjunto falta)
+def catalogos(data):
+    resultado = {}
+    for columna, (hoja, origen) in CATALOGOS.items():
+        df = data.get(hoja)
+        if (df is None or df.empty) and columna == 'ID_Producto':
+            df, origen = data.get('DAT_PRODUCTOS_FIJOS'), 'ID_Producto'
+        if df is not None and not df.empty and origen in df.columns:
+            resultado[columna] = pd.Index(pd.unique(df[origen].astype(str)))
+    return resultado
+
+
+# Valores distintos de una columna como texto, en orden de aparición (de un categórico,
+# solo las categorías usadas)
+def _distintos(serie):
+    if isinstance(serie.dtype, pd.CategoricalDtype):
+        codigos = serie.cat.codes.to_numpy()
+        return pd.Index(serie.cat.categories[pd.unique(codigos[codigos >= 0])].astype(str))
+    return pd.Index(pd.unique(serie.astype(str)))
+
+
+def _categorica(serie, categorias):
+    if isinstance(serie.dtype, pd.CategoricalDtype) and serie.cat.categories.equals(categorias):
+        return serie
+    return pd.Series(pd.Categorical(serie.astype(str), categories=categorias), index=serie.index, name=serie.name)
+
+
+def _medida(valores, medidas):
+    if medidas == 'float64' or valores.dtype == np.float32:
+        return valores
+    if valores.dtype.kind in 'iu':
+        # Enteros: int32 salvo que el rango no entre
+        if valores.size and np.abs(valores).max() >= 2**31:
+            return valores
+        return valores.astype(np.int32)
+    reducidos = valores.astype(np.float32)
+    if medidas == 'float32':
+        return reducidos
+    exactos = (reducidos.astype(np.float64) == valores) | np.isnan(valores)
+    return reducidos if exactos.all() else valores
+
+
+# Tipa una hoja: identificadores contra el catálogo, etiquetas categóricas, claves int32 y
+# medidas reducidas; valida en una pasada que las medidas sean numéricas, finitas y estén
+# en rango, y que los identificadores existan en el catálogo. Devuelve (hoja tipada, avisos).
+def tipar(hoja, df, catalogos, ids=IDS, medidas=MEDIDAS):
+    avisos = []
+    if df is None or df.empty or hoja in HOJAS_CATALOGO:
+        return df, avisos
+    columnas = {}
+    medidas_hoja = []
+    for c in df.columns:
+        serie = df[c]
+        if c in CATALOGOS or c in ETIQUETAS:
+            valores = _distintos(serie)
+            if c in catalogos:
+                categorias = catalogos[c]
+                desconocidos = valores[~valores.isin(categorias)]
+                if len(desconocidos):
+                    avisos.append(f"{hoja}: {len(desconocidos)} {c} fuera del catálogo "
+                                  f"({', '.join(map(str, desconocidos[:5]))})")
+                    categorias = categorias.append(desconocidos)
+            else:
+                categorias = valores
+            columnas[c] = _categorica(serie, categorias) if ids == 'categoria' else serie
+        elif c in CLAVES:
+            columnas[c] = serie
+        elif pd.api.types.is_numeric_dtype(serie) and not pd.api.types.is_bool_dtype(serie):
+            medidas_hoja.append(c)
+            columnas[c] = serie
+        else:
+            avisos.append(f"{hoja}: la columna {c} no es numérica ({serie.dtype})")
+            columnas[c] = serie
+
+    # Validación de todas las claves y medidas de la hoja en una sola matriz
+    numericas = [c for c in df.columns if c in CLAVES and pd.api.types.is_numeric_dtype(df[c])] + medidas_hoja
+    if numericas:
+        matriz = df[numericas].to_numpy(dtype=np.float64)
+        minimos = np.array([CLAVES[c][0] if c in CLAVES else RANGO_MEDIDAS[0] for c in numericas])
+        maximos = np.array([CLAVES[c][1] if c in CLAVES else RANGO_MEDIDAS[1] for c in numericas])
+        with np.errstate(invalid='ignore'):
+            invalidos = (~np.isfinite(matriz) | (matriz < minimos) | (matriz > maximos)).sum(axis=0)
+        for c, n in zip(numericas, invalidos):
+            if n:
+                avisos.append(f"{hoja}: {n} valores de {c} vacíos o fuera de rango")
+
+    for c in columnas:
+        if c in CLAVES and pd.api.types.is_integer_dtype(columnas[c]):
+            columnas[c] = columnas[c].astype(np.int32)
+        elif c in medidas_hoja:
+            columnas[c] = pd.Series(_medida(columnas[c].to_numpy(), medidas), index=df.index, name=c)
+    return pd.DataFrame(columnas, index=df.index), avisos
+
+
+# Aplica el esquema a todas las hojas del dataset (en su lugar) y devuelve los avisos
+def aplicar(data, ids=IDS, medidas=MEDIDAS):
+    cats = catalogos(data)
+    avisos = []
+    for hoja, df in list(data.items()):
+        if isinstance(df, pd.DataFrame):
+            data[hoja], avisos_hoja = tipar(hoja, df, cats, ids, medidas)
+            avisos += avisos_hoja
+    return avisos
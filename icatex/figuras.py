@@ -0,0 +1,20 @@
+from icatex import perfil
+from icatex.caches import CacheLRU
+
+# Figuras ya construidas por (huella del dataset, sección, selección de widgets)
+CACHE_FIGURAS = CacheLRU('figuras', max_entradas=256, max_bytes=64 * 1024 * 1024)
+
+
+def _tamano_spec(figura):
+    return len(figura.to_json())
+
+
+# Devuelve la figura de la caché o la construye con `constructor` y la guarda.
+# Se guarda la figura ya validada: Streamlit la serializa directamente, mientras que un
+# spec en dict volvería a pasar por la validación completa de plotly en cada emisión.
+# Las figuras cacheadas son compartidas y no deben modificarse después de obtenerlas.
+def figura_cacheada(huella, seccion, seleccion, constructor):
+    def construir():
+        with perfil.etapa('figura', f"{seccion}:{seleccion}"):
+            return constructor()
+    return CACHE_FIGURAS.obtener_o_calcular((huella, seccion, seleccion), construir, _tamano_spec)
@@ -0,0 +1,135 @@
+import hashlib
+
+import numpy as np
+import pandas as pd
+
+from icatex.cubo import filtrar_cubo
+from icatex.datos import AÑO_INICIAL
+from icatex.tensores import SERIES, posiciones_ids
+
+# Filtros globales del dashboard (categoría, línea, producto, año y mes) resueltos con
+# mapas de bits precalculados. Por dataset se construye una vez un índice con, para cada
+# valor de cada dimensión, el mapa de bits (np.packbits) de los productos o periodos que
+# lo tienen, y la posición en los ejes de producto y periodo de cada fila de cada hoja.
+# Una selección se resuelve con OR de los mapas de sus valores dentro de cada dimensión y
+# AND entre dimensiones; el corte del dataset, de los tensores y del cubo es después un
+# gather por posiciones, sin volver a recorrer las columnas con pandas.
+
+# Dimensiones del filtro: eje que filtran y columna de DAT_PRODUCTOS_FIJOS (productos)
+DIMENSIONES = {
+    'categoria': ('productos', 'Categoria'),
+    'linea': ('productos', 'Linea'),
+    'producto': ('productos', 'ID_Producto'),
+    'año': ('periodos', None),
+    'mes': ('periodos', None),
+}
+
+
+def _mapas(etiquetas):
+    valores, codigo = np.unique(np.asarray(etiquetas), return_inverse=True)
+    indicadora = codigo[None, :] == np.arange(len(valores))[:, None]
+    return pd.Index(valores), np.packbits(indicadora, axis=1)
+
+
+# Índice de filtros de un dataset sobre los ejes de sus tensores
+def construir_indice(data, tensores):
+    productos = tensores['productos']
+    periodos = tensores['periodos']
+    fijos = data['DAT_PRODUCTOS_FIJOS']
+    fijos = fijos.set_index('ID_Producto').reindex(productos) if not fijos.empty else pd.DataFrame(index=productos)
+    etiquetas = {
+        'categoria': fijos['Categoria'].astype(object).fillna('Sin asignar').to_numpy()
+        if 'Categoria' in fijos else np.full(len(productos), 'Sin asignar'),
+        'linea': fijos['Linea'].astype(object).fillna('Sin asignar').to_numpy()
+        if 'Linea' in fijos else np.full(len(productos), 'Sin asignar'),
+        'producto': productos.astype(str),
+        'año': AÑO_INICIAL + (periodos - 1) // 12,
+        'mes': (periodos - 1) % 12 + 1,
+    }
+
+    # Posición de cada fila en los ejes (-1 si la hoja no tiene la columna o el id no está)
+    posiciones = {}
+    for hoja, df in data.items():
+        if not isinstance(df, pd.DataFrame) or df.empty:
+            continue
+        if hoja == 'SET_MESES' and len(df) == len(periodos):
+            posiciones[hoja] = (None, np.arange(len(df)))
+        elif 'ID_Producto' in df.columns or 'Periodo_Index' in df.columns:
+            posiciones[hoja] = (
+                posiciones_ids(df['ID_Producto'], productos) if 'ID_Producto' in df.columns else None,
+                pd.Index(periodos).get_indexer(df['Periodo_Index']) if 'Periodo_Index' in df.columns else None,
+            )
+    return {
+        'ejes': {'productos': len(productos), 'periodos': len(periodos)},
+        'mapas': {dimension: _mapas(etiquetas[dimension]) for dimension in DIMENSIONES},
+        'posiciones': posiciones,
+    }
+
+
+# Valores de cada dimensión (para las opciones de la barra de filtros)
+def valores(indice, dimension):
+    return indice['mapas'][dimension][0].tolist()
+
+
+# Máscara booleana de cada eje para una selección {dimensión: valores}; una dimensión sin
+# valores no filtra. Dentro de una dimensión se combinan con OR y entre dimensiones con AND,
+# todo sobre los mapas de bits.
+def resolver(indice, seleccion):
+    bits = {eje: np.full((n + 7) // 8, 0xFF, dtype=np.uint8) for eje, n in indice['ejes'].items()}
+    for dimension, elegidos in seleccion.items():
+        if not elegidos:
+            continue
+        eje = DIMENSIONES[dimension][0]
+        etiquetas, mapas = indice['mapas'][dimension]
+        filas = etiquetas.get_indexer(pd.Index(list(elegidos)).astype(etiquetas.dtype))
+        filas = filas[filas >= 0]
+        unidos = (np.bitwise_or.reduce(mapas[filas], axis=0) if len(filas)
+                  else np.zeros_like(bits[eje]))
+        bits[eje] &= unidos
+    return {eje: np.unpackbits(b, count=indice['ejes'][eje]).astype(bool) for eje, b in bits.items()}
+
+
+# Huella del dataset filtrado (clave de las cachés de los motores)
+def huella_filtrada(huella, seleccion):
+    texto = repr(sorted((d, sorted(map(str, v))) for d, v in seleccion.items() if v))
+    return hashlib.sha1(f"{huella}|{texto}".encode()).hexdigest()[:16]
+
+
+# Dataset con solo las filas de los productos y periodos de las máscaras. Un eje sin
+# filtrar no descarta filas (tampoco las de ids fuera del catálogo).
+def filtrar_datos(data, indice, mascaras, huella):
+    activos = {eje: None if m.all() else np.append(m, False) for eje, m in mascaras.items()}
+    filtrado = dict(data)
+    for hoja, (pos_producto, pos_periodo) in indice['posiciones'].items():
+        df = data[hoja]
+        fila = np.ones(len(df), dtype=bool)
+        if pos_producto is not None and activos['productos'] is not None:
+            fila &= activos['productos'][pos_producto]
+        if pos_periodo is not None and activos['periodos'] is not None:
+            fila &= activos['periodos'][pos_periodo]
+        if not fila.all():
+            filtrado[hoja] = df.take(np.flatnonzero(fila)).reset_index(drop=True)
+    filtrado['HUELLA'] = huella
+    return filtrado
+
+
+# Tensores cortados a las posiciones de productos y periodos: fancy-index de filas y columnas
+def filtrar_tensores(tensores, mascaras):
+    p = np.flatnonzero(mascaras['productos'])
+    t = np.flatnonzero(mascaras['periodos'])
+    cortados = {clave: valor for clave, valor in tensores.items() if clave != 'reserva'}
+    cortados.update({'productos': tensores['productos'][p], 'periodos': tensores['periodos'][t],
+                     'PI': tensores['PI'][p], 'PP': tensores['PP'][p],
+                     'costo_almacen': tensores['costo_almacen'][p], 'stock_inicial': tensores['stock_inicial'][p]})
+    for clave, (_, _, _, eje) in SERIES.items():
+        serie = tensores[clave][:, t]
+        cortados[clave] = serie[p] if eje == 'productos' else serie
+    return cortados
+
+
+# Cubo cortado a la selección; None si el dataset no tiene cubo
+def cortar_cubo(cubo_agregados, tensores, mascaras):
+    if cubo_agregados is None:
+        return None
+    productos = pd.Index(cubo_agregados['productos']).get_indexer(tensores['productos'][mascaras['productos']])
+    return filtrar_cubo(cubo_agregados, productos[productos >= 0], tensores['periodos'][mascaras['periodos']])
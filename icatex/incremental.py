@@ -0,0 +1,239 @@
+import argparse
+import hashlib
+import os
+import shutil
+import threading
+from pathlib import Path
+
+import pandas as pd
+
+from icatex import cubo, esquema, motores, pronostico_demanda
+from icatex.datos import AÑO_INICIAL, RUTA_LIBRO, cargar_datos, completar_pm_matrix
+from icatex.pronostico_demanda import MESES
+from icatex.tensores import SERIES, extender_tensores
+
+# Ingesta incremental de los reales de cada mes. Los periodos nuevos se registran en un log
+# de solo agregado (un segmento por entrega, con una hoja Parquet por tabla) y se aplican
+# sobre el dataset base sin volver a leer el libro: los tensores, el cubo y el estado de
+# Holt-Winters se extienden con el periodo nuevo y se publican en icatex.motores.
+#
+#   python -m icatex.incremental agregar reales_2025_01.xlsx --log ICATEX_Lingo_4Anios.xlsx.incrementos
+#   python -m icatex.incremental listar --log ICATEX_Lingo_4Anios.xlsx.incrementos
+
+# Hojas con una fila por entidad y periodo que un mes nuevo puede traer
+HOJAS_PERIODO = [
+    'DAT_PM_MATRIX', 'DAT_KM_MATRIX', 'DAT_PJM_MATRIX',
+    'RES_PRODUCCION', 'RES_VENTAS', 'RES_INVENTARIO', 'RES_H_EXTRAS'
+]
+
+# Columnas mínimas de cada hoja (si el dataset base no la trae) y columnas que se derivan
+# al aplicar el delta y no hace falta que traiga
+COLUMNAS_MINIMAS = {hoja: [col_id, 'Periodo_Index'] + [valor for h, _, valor, _ in SERIES.values() if h == hoja]
+                    for hoja, col_id, _, _ in SERIES.values()}
+COLUMNAS_DERIVADAS = {'DAT_PM_MATRIX': ['Año', 'Mes']}
+
+# Último dataset al día por huella base: (segmentos aplicados, dataset)
+_AL_DIA = {}
+_LOCK = threading.Lock()
+
+
+def ruta_log(origen=RUTA_LIBRO):
+    return os.environ.get('ICATEX_INCREMENTOS', f"{origen}.incrementos")
+
+
+# Hojas de un mes nuevo desde un libro de Excel (hojas con los nombres de HOJAS_PERIODO),
+# un CSV llamado como la hoja o un directorio de esos CSV
+def leer_delta(ruta):
+    ruta = Path(ruta)
+    if ruta.is_dir():
+        archivos = [ruta / f"{hoja}.csv" for hoja in HOJAS_PERIODO]
+        return {a.stem: pd.read_csv(a) for a in archivos if a.exists()}
+    if ruta.suffix.lower() == '.csv':
+        if ruta.stem not in HOJAS_PERIODO:
+            raise ValueError(f"{ruta.name}: el CSV debe llamarse como una de {HOJAS_PERIODO}")
+        return {ruta.stem: pd.read_csv(ruta)}
+    libro = pd.ExcelFile(ruta)
+    return {hoja: libro.parse(hoja) for hoja in HOJAS_PERIODO if hoja in libro.sheet_names}
+
+
+# Segmentos del log en orden de secuencia
+def segmentos(ruta):
+    ruta = Path(ruta)
+    if not ruta.is_dir():
+        return []
+    return sorted(d for d in ruta.iterdir() if d.is_dir() and d.name.isdigit())
+
+
+# Último periodo del dataset base con los segmentos del log ya registrados
+def ultimo_periodo(data, ruta):
+    periodos = motores.tensores(data['HUELLA'], data)['periodos']
+    ultimo = int(periodos[-1]) if len(periodos) else 0
+    for segmento in segmentos(ruta):
+        for archivo in Path(segmento).glob('*.parquet'):
+            columna = pd.read_parquet(archivo, columns=['Periodo_Index'])['Periodo_Index']
+            if len(columna):
+                ultimo = max(ultimo, int(columna.max()))
+    return ultimo
+
+
+# Comprueba un delta antes de publicarlo: cada hoja trae las columnas de la hoja del dataset
+# base y sus periodos son enteros que continúan, sin huecos, el último periodo de la base y
+# del log. Un delta inválido en el log haría fallar cada carga del dashboard.
+def validar_delta(data, hojas, ruta):
+    nuevos = set()
+    for hoja, df in hojas.items():
+        esperadas = list(data[hoja].columns) if not data[hoja].empty else COLUMNAS_MINIMAS[hoja]
+        faltan = [c for c in esperadas if c not in df.columns and c not in COLUMNAS_DERIVADAS.get(hoja, [])]
+        if faltan:
+            raise ValueError(f"{hoja}: faltan las columnas {faltan}")
+        periodo = pd.to_numeric(df['Periodo_Index'], errors='coerce')
+        if periodo.isna().any() or (periodo % 1 != 0).any():
+            raise ValueError(f"{hoja}: Periodo_Index vacío o no entero")
+        nuevos.update(periodo.astype(int).unique().tolist())
+    ultimo = ultimo_periodo(data, ruta)
+    esperados = list(range(ultimo + 1, ultimo + len(nuevos) + 1))
+    if sorted(nuevos) != esperados:
+        raise ValueError(f"Los periodos {sorted(nuevos)} no continúan el periodo {ultimo} "
+                         f"(base y log); se esperaba {esperados}")
+
+
+# Agrega un segmento al log tras validarlo contra el dataset base `data` y los segmentos ya
+# registrados. Se escribe en un directorio temporal y se publica con un rename, así un
+# lector nunca ve un segmento a medias y dos escritores no se pisan.
+def registrar_periodo(ruta, delta, data):
+    ruta = Path(ruta)
+    hojas = {hoja: df for hoja, df in delta.items() if hoja in HOJAS_PERIODO and not df.empty}
+    if not hojas:
+        raise ValueError("El delta no trae filas de ninguna hoja por periodo")
+    validar_delta(data, hojas, ruta)
+    ruta.mkdir(parents=True, exist_ok=True)
+    temporal = ruta / f".{os.getpid()}-{threading.get_ident()}.tmp"
+    temporal.mkdir()
+    try:
+        for hoja, df in hojas.items():
+            df.to_parquet(temporal / f"{hoja}.parquet", index=False)
+        secuencia = len(segmentos(ruta)) + 1
+        while True:
+            destino = ruta / f"{secuencia:06d}"
+            try:
+                temporal.rename(destino)
+                return destino
+            except OSError:
+                if not destino.exists():
+                    raise
+                secuencia += 1
+    except BaseException:
+        shutil.rmtree(temporal, ignore_errors=True)
+        raise
+
+
+def leer_segmento(segmento):
+    return {archivo.stem: pd.read_parquet(archivo) for archivo in sorted(Path(segmento).glob('*.parquet'))}
+
+
+# Deltas del log a partir del segmento `desde` (0 = todos)
+def leer_log(ruta, desde=0):
+    return [leer_segmento(s) for s in segmentos(ruta)[desde:]]
+
+
+# Categóricos del delta con las categorías de la hoja base (más las que solo trae el delta,
+# agregadas al final de las de la base sin tocar sus códigos)
+def _alinear_categorias(base, delta):
+    categoricas = [c for c in delta.columns if c in base.columns
+                   and isinstance(base[c].dtype, pd.CategoricalDtype)
+                   and isinstance(delta[c].dtype, pd.CategoricalDtype)]
+    for c in categoricas:
+        categorias = base[c].cat.categories
+        if delta[c].cat.categories.equals(categorias):
+            continue
+        nuevas = delta[c].cat.categories.difference(categorias, sort=False)
+        if len(nuevas):
+            categorias = categorias.append(nuevas)
+            base = base.assign(**{c: base[c].cat.add_categories(nuevas)})
+        delta = delta.assign(**{c: delta[c].cat.set_categories(categorias)})
+    return base, delta
+
+
+# Dataset con las filas de `delta` agregadas. Los tensores, el cubo y el estado de
+# Holt-Winters del dataset anterior se extienden en O(periodo nuevo) y quedan publicados
+# bajo la huella nueva; el resto de los motores se recalcula al pedirse.
+def aplicar_periodo(data, delta):
+    huella = data['HUELLA']
+    delta = {hoja: df.copy() for hoja, df in delta.items() if hoja in HOJAS_PERIODO and not df.empty}
+    if 'DAT_PM_MATRIX' in delta:
+        completar_pm_matrix(delta['DAT_PM_MATRIX'])
+
+    tensores = motores.tensores(huella, data)
+    extendidos = extender_tensores(tensores, delta)
+    nuevos = extendidos['periodos'][len(tensores['periodos']):]
+
+    nuevo = dict(data)
+    catalogos = esquema.catalogos(data)
+    h = hashlib.sha1(huella.encode())
+    for hoja, df in delta.items():
+        if not data[hoja].empty:
+            df = df.reindex(columns=data[hoja].columns)
+        # Solo el delta pasa por el esquema; con las categorías alineadas a las de la hoja ya
+        # tipada, la concatenación conserva categóricos y tipos reducidos sin re-tipar la historia
+        df, _ = esquema.tipar(hoja, df, catalogos)
+        base, df = _alinear_categorias(data[hoja], df)
+        nuevo[hoja] = pd.concat([base, df], ignore_index=True)
+        h.update(hoja.encode())
+        h.update(pd.util.hash_pandas_object(df, index=False).values.tobytes())
+    if not data['SET_MESES'].empty:
+        meses = [f"{MESES[(p - 1) % 12]}-{AÑO_INICIAL + (p - 1) // 12}" for p in nuevos]
+        nuevo['SET_MESES'] = pd.concat([data['SET_MESES'], pd.DataFrame({'Mes': meses})], ignore_index=True)
+    nuevo['HUELLA'] = h.hexdigest()[:16]
+
+    motores.publicar(nuevo['HUELLA'], 'tensores', extendidos)
+    if 'DAT_PM_MATRIX' in delta and not data['DAT_PM_MATRIX'].empty:
+        anterior = motores.cubo_agregados(huella, data)
+        motores.publicar(nuevo['HUELLA'], 'cubo', cubo.agregar_filas(anterior, delta['DAT_PM_MATRIX']))
+    estado = motores.estado_pronostico(huella, tensores)
+    if estado is not None:
+        Y = pronostico_demanda.series_demanda(extendidos)[:, len(tensores['periodos']):]
+        motores.publicar(nuevo['HUELLA'], 'estado_pronostico',
+                         pronostico_demanda.avanzar_holt_winters(estado, Y, nuevos))
+    return nuevo
+
+
+# Dataset base con todos los segmentos del log aplicados. Se recuerda el último resultado
+# por huella base, así cada segmento nuevo se aplica una sola vez por proceso.
+def al_dia(data, ruta):
+    with _LOCK:
+        aplicados, actual = _AL_DIA.get(data['HUELLA'], (0, data))
+        for delta in leer_log(ruta, aplicados):
+            actual = aplicar_periodo(actual, delta)
+            aplicados += 1
+        _AL_DIA[data['HUELLA']] = (aplicados, actual)
+        return actual
+
+
+def main(argumentos=None):
+    parser = argparse.ArgumentParser(description="Log de reales mensuales de ICATEX")
+    parser.add_argument('--libro', default=RUTA_LIBRO, help="Origen del dataset base (libro o base embebida)")
+    parser.add_argument('--planta', default=None)
+    parser.add_argument('--log', default=None, help="Directorio del log de incrementos (por defecto junto al libro)")
+    subcomandos = parser.add_subparsers(dest='comando', required=True)
+    agregar = subcomandos.add_parser('agregar', help="Registra las hojas de un mes nuevo")
+    agregar.add_argument('delta', help="Libro de Excel, CSV o directorio de CSV con las hojas del mes")
+    subcomandos.add_parser('listar', help="Lista los segmentos registrados")
+    opciones = parser.parse_args(argumentos)
+    opciones.log = opciones.log or ruta_log(opciones.libro)
+
+    if opciones.comando == 'agregar':
+        data, _ = cargar_datos(opciones.libro, opciones.planta)
+        try:
+            destino = registrar_periodo(opciones.log, leer_delta(opciones.delta), data)
+        except ValueError as error:
+            parser.exit(1, f"No se registró el delta: {error}\n")
+        print(f"Segmento {destino.name} registrado en {opciones.log}")
+    else:
+        for segmento in segmentos(opciones.log):
+            delta = leer_segmento(segmento)
+            periodos = sorted({int(p) for df in delta.values() for p in df['Periodo_Index'].unique()})
+            print(f"{segmento.name}: periodos {periodos}, hojas {', '.join(delta)}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,250 @@
+import argparse
+import gc
+import os
+import re
+import sys
+import threading
+import time
+import tracemalloc
+from collections import deque
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+# Contabilidad de memoria: bytes de cada hoja del dataset y de cada arreglo de los tensores,
+# entradas, bytes y desalojos de cada caché, e instantáneas de tracemalloc a pedido. También
+# vigila el RSS del proceso contra el límite del contenedor y, al pasar el umbral, desaloja
+# las cachés antes de que el kernel mate el proceso.
+#
+#   ICATEX_MEMORIA_LIMITE=2GB        límite a vigilar (por defecto el del cgroup)
+#   ICATEX_MEMORIA_UMBRAL=0.8        fracción del límite a partir de la cual se libera
+#   ICATEX_TRACEMALLOC=1             rastrear asignaciones desde el arranque
+#   python -m icatex.memoria ICATEX_Lingo_4Anios.xlsx
+
+_UNIDADES = {'': 1, 'B': 1, 'K': 2**10, 'KB': 2**10, 'M': 2**20, 'MB': 2**20, 'G': 2**30, 'GB': 2**30}
+
+# Rutas del límite de memoria del contenedor (cgroup v2 y v1)
+_LIMITES_CGROUP = ('/sys/fs/cgroup/memory.max', '/sys/fs/cgroup/memory/memory.limit_in_bytes')
+
+# Intervalo mínimo entre dos lecturas del RSS al vigilar
+INTERVALO_VIGILANCIA = 1.0
+
+# Liberaciones por presión de memoria del proceso
+EVENTOS = deque(maxlen=100)
+
+# Funciones a llamar cuando desalojar las cachés LRU no alcanza (p. ej. st.cache_data.clear)
+_AL_LIBERAR = []
+_LOCK = threading.Lock()
+_ESTADO = {'ultima': 0.0, 'instantanea': None}
+
+
+# '512MB', '2G', '1.5GB' o un número de bytes; None si el texto está vacío
+def leer_bytes(texto):
+    if texto is None or not str(texto).strip():
+        return None
+    coincide = re.fullmatch(r'\s*([\d.]+)\s*([KMG]?B?)\s*', str(texto).upper())
+    if coincide is None:
+        raise ValueError(f"Tamaño no válido: {texto!r} (p. ej. 512MB, 2GB)")
+    return int(float(coincide.group(1)) * _UNIDADES[coincide.group(2)])
+
+
+def formato_bytes(n):
+    for unidad, factor in (('GB', 2**30), ('MB', 2**20), ('KB', 2**10)):
+        if n >= factor:
+            return f"{n / factor:,.1f} {unidad}"
+    return f"{n:,.0f} B"
+
+
+# Límite de memoria del contenedor; None si no hay (o es el valor "sin límite" del kernel)
+def limite_contenedor():
+    for ruta in _LIMITES_CGROUP:
+        try:
+            with open(ruta) as f:
+                valor = f.read().strip()
+        except OSError:
+            continue
+        if valor.isdigit() and int(valor) < 2**60:
+            return int(valor)
+        return None
+    return None
+
+
+LIMITE = leer_bytes(os.environ.get('ICATEX_MEMORIA_LIMITE')) or limite_contenedor()
+UMBRAL = float(os.environ.get('ICATEX_MEMORIA_UMBRAL', 0.8))
+
+
+# Memoria residente del proceso (Linux); None donde /proc no existe
+def rss():
+    try:
+        with open('/proc/self/statm') as f:
+            return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+    except (OSError, ValueError):
+        return None
+
+
+# Bytes aproximados de un objeto y de lo que contiene. Los DataFrame cuentan sus textos
+# (deep=True); las vistas de numpy cuentan una vez el arreglo dueño de la memoria; los
+# objetos ya vistos (compartidos entre contenedores) no se vuelven a sumar.
+def bytes_objeto(objeto, _vistos=None):
+    vistos = set() if _vistos is None else _vistos
+    if id(objeto) in vistos:
+        return 0
+    vistos.add(id(objeto))
+    if isinstance(objeto, pd.DataFrame):
+        return int(objeto.memory_usage(deep=True).sum())
+    if isinstance(objeto, (pd.Series, pd.Index)):
+        return int(objeto.memory_usage(deep=True))
+    if isinstance(objeto, np.ndarray):
+        dueño = objeto
+        while isinstance(dueño.base, np.ndarray):
+            dueño = dueño.base
+        if dueño is not objeto:
+            if id(dueño) in vistos:
+                return 0
+            vistos.add(id(dueño))
+        return dueño.nbytes
+    if isinstance(objeto, dict):
+        return sys.getsizeof(objeto) + sum(bytes_objeto(k, vistos) + bytes_objeto(v, vistos)
+                                           for k, v in objeto.items())
+    if isinstance(objeto, (list, tuple, set, frozenset)):
+        return sys.getsizeof(objeto) + sum(bytes_objeto(v, vistos) for v in objeto)
+    # Matrices dispersas de scipy
+    if hasattr(objeto, 'indptr'):
+        return sum(getattr(objeto, a).nbytes for a in ('data', 'indices', 'indptr'))
+    if isinstance(getattr(objeto, 'nbytes', None), int):
+        return objeto.nbytes
+    return sys.getsizeof(objeto)
+
+
+# Una fila por hoja del dataset con sus filas, columnas y bytes
+def cuentas_dataset(data):
+    filas = [{'Hoja': hoja, 'Filas': len(df), 'Columnas': df.shape[1], 'Bytes': bytes_objeto(df)}
+             for hoja, df in data.items() if isinstance(df, pd.DataFrame)]
+    return pd.DataFrame(filas, columns=['Hoja', 'Filas', 'Columnas', 'Bytes']).sort_values('Bytes', ascending=False)
+
+
+# Una fila por arreglo de los tensores con su forma, tipo y bytes
+def cuentas_tensores(tensores):
+    filas = [{'Arreglo': clave, 'Forma': '×'.join(map(str, getattr(valor, 'shape', ()))),
+              'Tipo': str(getattr(valor, 'dtype', type(valor).__name__)), 'Bytes': bytes_objeto(valor)}
+             for clave, valor in tensores.items()]
+    return pd.DataFrame(filas, columns=['Arreglo', 'Forma', 'Tipo', 'Bytes']).sort_values('Bytes', ascending=False)
+
+
+# Entradas, bytes, desalojos y límites de cada caché LRU del proceso
+def cuentas_caches():
+    from icatex.caches import CACHES, PRESUPUESTO_GLOBAL
+    filas = [dict(c.estadisticas(), max_bytes=c.max_bytes) for c in list(CACHES.values())]
+    tabla = pd.DataFrame(filas)
+    if not tabla.empty:
+        tabla = tabla.sort_values('bytes', ascending=False)
+    tabla.attrs['presupuesto_global'] = PRESUPUESTO_GLOBAL
+    return tabla
+
+
+# Registra una función a llamar como último recurso cuando el proceso pasa el umbral
+def al_liberar(funcion):
+    if funcion not in _AL_LIBERAR:
+        _AL_LIBERAR.append(funcion)
+
+
+# Desaloja la mitad de los bytes de cada caché LRU (las entradas usadas hace más tiempo)
+# y, si el RSS sigue por encima del umbral, llama a las funciones registradas
+def liberar(motivo='manual'):
+    from icatex.caches import CACHES
+    antes = rss()
+    liberado = 0
+    for cache in list(CACHES.values()):
+        liberado += cache.reducir(cache._bytes // 2)
+    gc.collect()
+    llamadas = []
+    if LIMITE and (rss() or 0) > UMBRAL * LIMITE:
+        for funcion in _AL_LIBERAR:
+            funcion()
+            llamadas.append(getattr(funcion, '__qualname__', repr(funcion)))
+        gc.collect()
+    EVENTOS.append({'fecha': datetime.now().isoformat(timespec='seconds'), 'motivo': motivo,
+                    'rss_antes': antes, 'rss_despues': rss(), 'bytes_caches': liberado, 'llamadas': llamadas})
+    return liberado
+
+
+# Compara el RSS con el umbral del límite y libera si lo pasa. Se llama en cada guardado
+# de las cachés y en cada ejecución del script; lee /proc como mucho una vez por intervalo.
+def vigilar():
+    if not LIMITE:
+        return False
+    ahora = time.monotonic()
+    if ahora - _ESTADO['ultima'] < INTERVALO_VIGILANCIA:
+        return False
+    with _LOCK:
+        if ahora - _ESTADO['ultima'] < INTERVALO_VIGILANCIA:
+            return False
+        _ESTADO['ultima'] = ahora
+        actual = rss()
+        if actual is None or actual <= UMBRAL * LIMITE:
+            return False
+        liberar(f"RSS {formato_bytes(actual)} sobre {UMBRAL:.0%} de {formato_bytes(LIMITE)}")
+        return True
+
+
+# RSS, límite, umbral y fracción usada del límite
+def estado():
+    actual = rss()
+    return {'rss': actual, 'limite': LIMITE, 'umbral': UMBRAL,
+            'uso': actual / LIMITE if actual is not None and LIMITE else None,
+            'rastreando': tracemalloc.is_tracing()}
+
+
+# Instantánea de tracemalloc a pedido: las `limite` líneas que más memoria retienen y la
+# diferencia con la instantánea anterior. La primera llamada sin rastreo activo lo inicia
+# (solo se ven asignaciones posteriores) y devuelve tablas vacías.
+def instantanea(limite=15):
+    columnas = ['Lugar', 'Bytes', 'Bloques']
+    if not tracemalloc.is_tracing():
+        tracemalloc.start()
+        _ESTADO['instantanea'] = None
+        return pd.DataFrame(columns=columnas), pd.DataFrame(columns=columnas + ['Cambio'])
+    actual = tracemalloc.take_snapshot().filter_traces([
+        tracemalloc.Filter(False, tracemalloc.__file__), tracemalloc.Filter(False, '<frozen importlib._bootstrap*>')])
+    top = pd.DataFrame([{'Lugar': str(s.traceback), 'Bytes': s.size, 'Bloques': s.count}
+                        for s in actual.statistics('lineno')[:limite]], columns=columnas)
+    anterior = _ESTADO['instantanea']
+    cambios = pd.DataFrame(columns=columnas + ['Cambio'])
+    if anterior is not None:
+        cambios = pd.DataFrame([{'Lugar': str(s.traceback), 'Bytes': s.size, 'Bloques': s.count, 'Cambio': s.size_diff}
+                                for s in actual.compare_to(anterior, 'lineno')[:limite]],
+                               columns=columnas + ['Cambio'])
+    _ESTADO['instantanea'] = actual
+    return top, cambios
+
+
+def detener_rastreo():
+    _ESTADO['instantanea'] = None
+    tracemalloc.stop()
+
+
+if os.environ.get('ICATEX_TRACEMALLOC', '') not in ('', '0'):
+    tracemalloc.start()
+
+
+def main(argumentos=None):
+    from icatex import motores
+    from icatex.datos import RUTA_LIBRO, cargar_datos
+
+    parser = argparse.ArgumentParser(description="Memoria del dataset y los tensores de ICATEX")
+    parser.add_argument('origen', nargs='?', default=RUTA_LIBRO)
+    parser.add_argument('--planta', default=None)
+    opciones = parser.parse_args(argumentos)
+
+    data, _ = cargar_datos(opciones.origen, opciones.planta)
+    tensores = motores.tensores(data['HUELLA'], data)
+    for titulo, tabla in (('Dataset', cuentas_dataset(data)), ('Tensores', cuentas_tensores(tensores))):
+        print(f"{titulo}: {formato_bytes(tabla['Bytes'].sum())}")
+        print(tabla.assign(Bytes=tabla['Bytes'].map(formato_bytes)).to_string(index=False))
+        print()
+    print(f"RSS {formato_bytes(rss() or 0)}; límite {formato_bytes(LIMITE) if LIMITE else 'sin límite'}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,142 @@
+import numpy as np
+
+from icatex import (comparacion, cubo, filtros, mrp, objetivo, politicas_inventario, precios, pronostico_demanda,
+                    pronostico_stock)
+from icatex.caches import CacheLRU
+from icatex.tensores import construir_tensores
+
+# Resultados de los motores por (huella del dataset, motor, parámetros). Es la caché que
+# publica el calentamiento en segundo plano y que consultan las envolturas de la interfaz.
+CACHE_MOTORES = CacheLRU('motores', max_entradas=256)
+
+
+def _memo(huella, motor, parametros, calcular):
+    return CACHE_MOTORES.obtener_o_calcular((huella, motor) + tuple(parametros), calcular)
+
+
+# Publica un resultado ya calculado en otro proceso (p. ej. los tensores que el reporte
+# por lotes construye una vez y reparte a sus trabajadores)
+def publicar(huella, motor, valor, parametros=()):
+    CACHE_MOTORES.guardar((huella, motor) + tuple(parametros), valor)
+
+
+def tensores(huella, data):
+    return _memo(huella, 'tensores', (), lambda: construir_tensores(data))
+
+
+def cubo_agregados(huella, data):
+    return _memo(huella, 'cubo', (),
+                 lambda: cubo.construir_cubo(data['DAT_PM_MATRIX'], data['DAT_PRODUCTOS_FIJOS']))
+
+
+# Explosión de materiales del plan óptimo para todos los insumos
+def requerimientos(huella, tensores, lead_time=1):
+    return _memo(huella, 'mrp', (lead_time,),
+                 lambda: mrp.calcular_requerimientos(tensores, lead_time=lead_time))
+
+
+# Tendencias y quiebres de stock frente al consumo del plan con lead time 1
+def quiebres_stock(huella, tensores, horizonte=12, estacional=True):
+    def calcular():
+        requerido = requerimientos(huella, tensores, 1)['requerido']
+        return pronostico_stock.predecir_quiebres(tensores, requerido, horizonte, estacional)
+    return _memo(huella, 'quiebres_stock', (horizonte, estacional), calcular)
+
+
+# Perfiles estacionales [producto × mes] de demanda y margen para todo el catálogo
+def perfiles_estacionales(huella, tensores):
+    def calcular():
+        periodos = tensores['periodos']
+        with np.errstate(divide='ignore', invalid='ignore'):
+            margen_porcentaje = np.where(tensores['precio'] > 0,
+                                         (tensores['precio'] - tensores['costo']) / tensores['precio'] * 100, 0)
+        return {
+            'DemandaMinima': pronostico_demanda.perfil_estacional(tensores['demanda_min'], periodos),
+            'DemandaMaxima': pronostico_demanda.perfil_estacional(tensores['demanda_max'], periodos),
+            'Margen_Porcentaje': pronostico_demanda.perfil_estacional(margen_porcentaje, periodos),
+        }
+    return _memo(huella, 'perfiles', (), calcular)
+
+
+# Estado de Holt-Winters de las series de demanda y precios (None con menos de dos años,
+# donde solo el modelo ingenuo es estimable). La ingesta incremental publica el siguiente.
+def estado_pronostico(huella, tensores):
+    def calcular():
+        if len(tensores['periodos']) < 24:
+            return None
+        return pronostico_demanda.estado_holt_winters(pronostico_demanda.series_demanda(tensores),
+                                                      tensores['periodos'])
+    return _memo(huella, 'estado_pronostico', (), calcular)
+
+
+def pronostico(huella, tensores, horizonte=12, modelo='holt_winters', nivel=0.9):
+    def calcular():
+        estado = estado_pronostico(huella, tensores) if modelo == 'holt_winters' else None
+        return pronostico_demanda.pronosticar_demanda(tensores, horizonte, modelo, nivel, estado)
+    return _memo(huella, 'pronostico_demanda', (horizonte, modelo, nivel), calcular)
+
+
+# Benchmark de políticas de inventario simples y los indicadores del plan de LINGO
+def politicas(huella, tensores, origen='media', replicas=20, lead_time=1):
+    def calcular():
+        rejilla = politicas_inventario.rejilla_politicas()
+        demanda = politicas_inventario.demanda_politicas(tensores, origen, replicas)
+        resultado = politicas_inventario.simular_politicas(rejilla, demanda, tensores['costo_almacen'],
+                                                           tensores['stock_inicial'], lead_time)
+        return resultado, politicas_inventario.indicadores_plan(tensores, demanda)
+    return _memo(huella, 'politicas', (origen, replicas, lead_time), calcular)
+
+
+# Respuesta precio-demanda (elasticidades) de todo el catálogo, ajustada una vez por dataset
+def respuesta_precios(huella, tensores, elasticidad_defecto=-1.5):
+    return _memo(huella, 'respuesta_precios', (elasticidad_defecto,),
+                 lambda: precios.estimar_respuesta(tensores, elasticidad_defecto))
+
+
+def precios_optimos(huella, tensores, elasticidad_defecto=-1.5, limite_inferior=0.5, limite_superior=1.5,
+                    acoplar_capacidad=False, permitir_horas_extra=True):
+    def calcular():
+        respuesta = respuesta_precios(huella, tensores, elasticidad_defecto)
+        return precios.optimizar_precios(tensores, respuesta, limite_inferior, limite_superior,
+                                         acoplar_capacidad, permitir_horas_extra)
+    return _memo(huella, 'precios', (elasticidad_defecto, limite_inferior, limite_superior,
+                                     acoplar_capacidad, permitir_horas_extra), calcular)
+
+
+def valor_objetivo(huella, tensores):
+    return _memo(huella, 'objetivo', (), lambda: objetivo.evaluar_objetivo(tensores))
+
+
+# Índice de mapas de bits de los filtros globales (categoría, línea, producto, año, mes)
+def indice_filtros(huella, data):
+    return _memo(huella, 'indice_filtros', (), lambda: filtros.construir_indice(data, tensores(huella, data)))
+
+
+# Dataset filtrado por una selección ((dimensión, valores), ...) bajo su propia huella, con
+# sus tensores y su cubo ya cortados y publicados; None si la selección no deja productos
+# o periodos
+def datos_filtrados(huella, data, seleccion):
+    def calcular():
+        indice = indice_filtros(huella, data)
+        mascaras = filtros.resolver(indice, dict(seleccion))
+        if not all(m.any() for m in mascaras.values()):
+            return None
+        nueva = filtros.huella_filtrada(huella, dict(seleccion))
+        base = tensores(huella, data)
+        cortados = filtros.filtrar_tensores(base, mascaras)
+        publicar(nueva, 'tensores', cortados)
+        if not data['DAT_PM_MATRIX'].empty:
+            publicar(nueva, 'cubo', filtros.cortar_cubo(cubo_agregados(huella, data), base, mascaras))
+        return filtros.filtrar_datos(data, indice, mascaras, nueva)
+    return _memo(huella, 'filtrado', (seleccion,), calcular)
+
+
+# Almacén [producto × variable × periodo] de las series por producto (icatex.comparacion)
+def almacen_productos(huella, tensores):
+    return _memo(huella, 'almacen_productos', (), lambda: comparacion.construir_almacen(tensores))
+
+
+# Series e indicadores de una selección de productos: un gather del almacén del dataset
+def comparacion_productos(huella, tensores, ids):
+    return _memo(huella, 'comparacion', (tuple(ids),),
+                 lambda: comparacion.comparar(tensores, almacen_productos(huella, tensores), ids))
@@ -0,0 +1,117 @@
+import numpy as np
+import pandas as pd
+from scipy import sparse
+
+
+# Multiplica la matriz PI (producto × insumo) por uno o varios planes de producción.
+# produccion puede ser [producto × periodo] o [escenario × producto × periodo]
+def _explosion(PI, produccion):
+    if produccion.ndim == 2:
+        return np.asarray(PI.T @ produccion)
+    escenarios, productos, periodos = produccion.shape
+    plano = produccion.transpose(1, 0, 2).reshape(productos, escenarios * periodos)
+    requerido = np.asarray(PI.T @ plano)
+    return requerido.reshape(-1, escenarios, periodos).transpose(1, 0, 2)
+
+
+# Explosión de materiales para todos los insumos y periodos en una sola llamada:
+# requerimientos[insumo, periodo] = PI_MATRIX.T @ produccion, neteado contra el stock
+# disponible, con faltantes, periodo límite de pedido y exposición económica.
+def calcular_requerimientos(tensores, produccion=None, lead_time=1):
+    PI = tensores['PI']
+    periodos = tensores['periodos']
+    if produccion is None:
+        produccion = tensores['produccion']
+    produccion = np.asarray(produccion, dtype=float)
+
+    requerido = _explosion(PI, produccion)
+    stock = tensores['stock']
+    neto = stock - requerido
+    faltante = np.clip(-neto, 0, None)
+    bajo_uso = np.clip(tensores['uso_minimo'] - requerido, 0, None)
+
+    # Periodo en el que debe lanzarse el pedido para cubrir cada faltante
+    lead = np.broadcast_to(np.asarray(lead_time, dtype=int), (len(tensores['insumos']),))
+    periodo_pedido = periodos[None, :] - lead[:, None]
+
+    # Margen de los productos que dependen de cada insumo; la fracción no cubierta
+    # del requerimiento se traduce en margen en riesgo
+    usa = (PI > 0).astype(float)
+    margen = produccion * (tensores['precio'] - tensores['costo'])
+    margen_dependiente = _explosion(usa, margen)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        fraccion = np.where(requerido > 0, faltante / requerido, 0.0)
+    exposicion = fraccion * margen_dependiente
+
+    # CostoInsumo por unidad de producto repartido entre sus insumos según cantidad
+    totales = np.asarray(PI.sum(axis=1)).ravel()
+    reparto = sparse.diags(np.divide(1.0, totales, out=np.zeros_like(totales), where=totales > 0)) @ PI
+    costo_asignado = _explosion(reparto, produccion * tensores['costo'])
+
+    return {
+        'requerido': requerido,
+        'neto': neto,
+        'faltante': faltante,
+        'bajo_uso': bajo_uso,
+        'periodo_pedido': periodo_pedido,
+        'exposicion': exposicion,
+        'costo_asignado': costo_asignado,
+    }
+
+
+# Resumen por insumo (un solo plan) ordenado por exposición
+def resumen_requerimientos(resultado, tensores, nombres_insumos=None):
+    nombres_insumos = nombres_insumos or {}
+    periodos = tensores['periodos']
+    faltante = resultado['faltante']
+    con_faltante = faltante > 0
+    primer = np.where(con_faltante.any(axis=1), periodos[con_faltante.argmax(axis=1)], 0)
+    pedido = np.where(con_faltante.any(axis=1),
+                      resultado['periodo_pedido'][np.arange(len(primer)), con_faltante.argmax(axis=1)], 0)
+
+    requerido = resultado['requerido']
+    with np.errstate(divide='ignore', invalid='ignore'):
+        cobertura = np.where(requerido > 0, tensores['stock'] / requerido, np.inf).min(axis=1) * 100
+
+    resumen = pd.DataFrame({
+        'ID_Insumo': tensores['insumos'],
+        'Insumo': [nombres_insumos.get(i, i) for i in tensores['insumos']],
+        'Requerido_Total': requerido.sum(axis=1),
+        'Requerido_Max': requerido.max(axis=1),
+        'Cobertura_Min_%': cobertura,
+        'Periodos_Faltante': con_faltante.sum(axis=1),
+        'Faltante_Total': faltante.sum(axis=1),
+        'Primer_Faltante': primer,
+        'Pedir_Antes_De': pedido,
+        'Periodos_Bajo_Uso': (resultado['bajo_uso'] > 0).sum(axis=1),
+        'Costo_Asignado': resultado['costo_asignado'].sum(axis=1),
+        'Exposicion': resultado['exposicion'].sum(axis=1),
+    })
+    return resumen.sort_values(['Exposicion', 'Faltante_Total'], ascending=False).reset_index(drop=True)
+
+
+# Lista en formato largo de todos los faltantes (insumo, periodo) con su periodo de pedido
+def faltantes_requerimientos(resultado, tensores):
+    filas, cols = np.nonzero(resultado['faltante'])
+    return pd.DataFrame({
+        'ID_Insumo': tensores['insumos'][filas],
+        'Periodo_Index': tensores['periodos'][cols],
+        'Requerido': resultado['requerido'][filas, cols],
+        'StockDisponible': tensores['stock'][filas, cols],
+        'Faltante': resultado['faltante'][filas, cols],
+        'Pedir_En_Periodo': resultado['periodo_pedido'][filas, cols],
+        'Exposicion': resultado['exposicion'][filas, cols],
+    })
+
+
+# Contribución de cada producto al requerimiento de un insumo, por periodo
+def contribucion_productos(tensores, id_insumo, produccion=None):
+    if produccion is None:
+        produccion = tensores['produccion']
+    i = pd.Index(tensores['insumos']).get_loc(id_insumo)
+    consumo = tensores['PI'][:, i].toarray().ravel()
+    contribucion = consumo[:, None] * produccion
+    usados = consumo > 0
+    return pd.DataFrame(contribucion[usados],
+                        index=tensores['productos'][usados],
+                        columns=tensores['periodos'])
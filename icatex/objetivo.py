@@ -0,0 +1,52 @@
+import numpy as np
+
+
+# Función objetivo del modelo de LINGO evaluada sobre un plan [producto × periodo]:
+# ingresos por ventas menos costos de insumos, almacenamiento y horas extra.
+# Sin argumentos evalúa el plan óptimo cargado desde las hojas de resultados.
+def evaluar_objetivo(tensores, produccion=None, ventas=None, inventario=None, horas_extra=None):
+    produccion = tensores['produccion'] if produccion is None else np.asarray(produccion, dtype=float)
+    ventas = tensores['ventas'] if ventas is None else np.asarray(ventas, dtype=float)
+    inventario = tensores['inventario'] if inventario is None else np.asarray(inventario, dtype=float)
+    horas_extra = tensores['horas_extra'] if horas_extra is None else np.asarray(horas_extra, dtype=float)
+
+    ingresos = float((tensores['precio'] * ventas).sum())
+    costo_insumos = float((tensores['costo'] * produccion).sum())
+    costo_almacen = float((tensores['costo_almacen'][:, None] * inventario).sum())
+    costo_horas_extra = float((tensores['costo_he'] * horas_extra).sum())
+    return {
+        'Ingresos': ingresos,
+        'Costo_Insumos': costo_insumos,
+        'Costo_Almacenamiento': costo_almacen,
+        'Costo_Horas_Extra': costo_horas_extra,
+        'Z': ingresos - costo_insumos - costo_almacen - costo_horas_extra,
+    }
+
+
+# Metas del modelo de programación por metas de LINGO y sus pesos en la función objetivo
+# MIN = 1 × D_UTIL_NEG + 5 × D_HE_POS
+META_UTILIDAD = 12000000
+META_HORAS_EXTRA = 50000
+PESOS_METAS = {'utilidad': 1, 'horas_extra': 5}
+
+
+# Desviaciones y cumplimiento de las metas para una utilidad y minutos de horas extra dados
+def cumplimiento_metas(utilidad, horas_extra, meta_utilidad=META_UTILIDAD, meta_horas_extra=META_HORAS_EXTRA,
+                       pesos=PESOS_METAS):
+    falta_utilidad = max(meta_utilidad - utilidad, 0.0)
+    exceso_horas_extra = max(horas_extra - meta_horas_extra, 0.0)
+    cumplimiento_utilidad = utilidad / meta_utilidad * 100 if meta_utilidad > 0 else 0.0
+    cumplimiento_horas_extra = (1 - min(exceso_horas_extra / meta_horas_extra, 1)) * 100 if meta_horas_extra > 0 else 100.0
+    return {
+        'Meta_Utilidad': meta_utilidad,
+        'Utilidad': utilidad,
+        'Falta_Utilidad': falta_utilidad,
+        'Meta_Horas_Extra': meta_horas_extra,
+        'Horas_Extra': horas_extra,
+        'Exceso_Horas_Extra': exceso_horas_extra,
+        'Cumplimiento_Utilidad_%': cumplimiento_utilidad,
+        'Cumplimiento_Horas_Extra_%': cumplimiento_horas_extra,
+        'Puntuacion_Ponderada_%': (cumplimiento_utilidad * pesos['utilidad']
+                                   + cumplimiento_horas_extra * pesos['horas_extra'])
+                                  / (pesos['utilidad'] + pesos['horas_extra']),
+    }
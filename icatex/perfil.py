@@ -0,0 +1,201 @@
+import argparse
+import json
+import os
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager, nullcontext
+from datetime import datetime
+
+import pandas as pd
+
+# Perfil de cada ejecución de una sección: segundos por etapa (datos, búsquedas, agregación,
+# construcción de figuras y serialización), por widget y aciertos/fallos de cada capa de
+# caché. Se activa con ICATEX_PERFIL=1; cada ejecución terminada se agrega como una línea
+# JSON a ICATEX_PERFIL_LOG, que se puede resumir entre sesiones y procesos:
+#
+#   ICATEX_PERFIL=1 streamlit run prueba_final.py
+#   python -m icatex.perfil perfil.jsonl
+#
+# Desactivado, `etapa` devuelve siempre el mismo contexto vacío y las envolturas de las
+# secciones y cachés no se instalan, así el costo es una comprobación por llamada.
+
+ETAPAS = ('datos', 'busqueda', 'agregacion', 'figura', 'serializacion')
+
+ACTIVO = os.environ.get('ICATEX_PERFIL', '') not in ('', '0')
+RUTA_LOG = os.environ.get('ICATEX_PERFIL_LOG', 'perfil.jsonl')
+
+# Últimas ejecuciones del proceso (para el panel de depuración)
+RECIENTES = deque(maxlen=500)
+
+# Aciertos y fallos acumulados en el proceso por capa de caché
+_CAPAS = {}
+_LOCK = threading.Lock()
+# Ejecución en curso del hilo (Streamlit corre cada ejecución de script en su hilo)
+_LOCAL = threading.local()
+_NULO = nullcontext()
+
+
+class _Ejecucion:
+    def __init__(self, sesion, seccion):
+        self.sesion = sesion
+        self.seccion = seccion
+        self.etapas = dict.fromkeys(ETAPAS, 0.0)
+        self.widgets = []
+        self.caches = {}
+        self.pila = []
+        self.inicio = time.perf_counter()
+
+
+# Tramo de una etapa. Los tiempos son exclusivos: lo que mide una etapa anidada (una
+# búsqueda dentro de la construcción de una figura) se descuenta de la que la contiene.
+class _Etapa:
+    def __init__(self, ejecucion, nombre, widget):
+        self.ejecucion = ejecucion
+        self.nombre = nombre
+        self.widget = widget
+        self.hijos = 0.0
+
+    def __enter__(self):
+        self.ejecucion.pila.append(self)
+        self.inicio = time.perf_counter()
+        return self
+
+    def __exit__(self, *error):
+        segundos = time.perf_counter() - self.inicio
+        pila = self.ejecucion.pila
+        pila.pop()
+        if pila:
+            pila[-1].hijos += segundos
+        self.ejecucion.etapas[self.nombre] = self.ejecucion.etapas.get(self.nombre, 0.0) + segundos - self.hijos
+        if self.widget is not None:
+            self.ejecucion.widgets.append({'widget': self.widget, 'etapa': self.nombre, 'segundos': segundos})
+        return False
+
+
+def etapa(nombre, widget=None):
+    if not ACTIVO:
+        return _NULO
+    ejecucion = getattr(_LOCAL, 'ejecucion', None)
+    if ejecucion is None:
+        return _NULO
+    return _Etapa(ejecucion, nombre, widget)
+
+
+# Cuenta una consulta a la capa de caché `capa` en el proceso y en la ejecución en curso
+def contar(capa, acierto):
+    with _LOCK:
+        totales = _CAPAS.setdefault(capa, [0, 0])
+        totales[0 if acierto else 1] += 1
+    ejecucion = getattr(_LOCAL, 'ejecucion', None)
+    if ejecucion is not None:
+        ejecucion.caches.setdefault(capa, [0, 0])[0 if acierto else 1] += 1
+
+
+def _registro(ejecucion):
+    total = time.perf_counter() - ejecucion.inicio
+    return {
+        'fecha': datetime.now().isoformat(timespec='milliseconds'),
+        'pid': os.getpid(),
+        'sesion': ejecucion.sesion,
+        'seccion': ejecucion.seccion,
+        'segundos': total,
+        'etapas': dict(ejecucion.etapas, resto=max(0.0, total - sum(ejecucion.etapas.values()))),
+        'widgets': ejecucion.widgets,
+        'caches': {capa: {'aciertos': a, 'fallos': f} for capa, (a, f) in ejecucion.caches.items()},
+    }
+
+
+# Ejecución de una sección (o de un fragmento que se re-ejecuta solo). Dentro de otra
+# ejecución del mismo hilo no abre una nueva: su tiempo queda en la que la contiene.
+@contextmanager
+def ejecucion(sesion, seccion):
+    if getattr(_LOCAL, 'ejecucion', None) is not None:
+        yield
+        return
+    propia = _LOCAL.ejecucion = _Ejecucion(sesion, seccion)
+    try:
+        yield
+    finally:
+        _LOCAL.ejecucion = None
+        registro = _registro(propia)
+        RECIENTES.append(registro)
+        linea = json.dumps(registro, ensure_ascii=False) + '\n'
+        with _LOCK:
+            try:
+                with open(RUTA_LOG, 'a', encoding='utf-8') as f:
+                    f.write(linea)
+            except OSError:
+                pass
+
+
+def recientes(sesion=None):
+    return [r for r in list(RECIENTES) if sesion is None or r['sesion'] == sesion]
+
+
+# Aciertos, fallos y tasa de aciertos de cada capa de caché en el proceso
+def capas():
+    with _LOCK:
+        filas = [{'capa': capa, 'aciertos': a, 'fallos': f, 'tasa_aciertos': a / (a + f) if a + f else 0.0}
+                 for capa, (a, f) in _CAPAS.items()]
+    return pd.DataFrame(filas, columns=['capa', 'aciertos', 'fallos', 'tasa_aciertos'])
+
+
+# Una fila por ejecución con los milisegundos de cada etapa
+def tabla_ejecuciones(registros):
+    filas = [{'fecha': r['fecha'], 'sesion': r['sesion'], 'seccion': r['seccion'], 'total_ms': r['segundos'] * 1000,
+              **{f'{e}_ms': s * 1000 for e, s in r['etapas'].items()}} for r in registros]
+    return pd.DataFrame(filas)
+
+
+def leer_log(ruta=RUTA_LOG):
+    with open(ruta, encoding='utf-8') as f:
+        return [json.loads(linea) for linea in f if linea.strip()]
+
+
+# Resumen de un log (de una o varias sesiones y procesos): por sección, ejecuciones,
+# sesiones, percentiles del total y media de cada etapa; por capa, tasa de aciertos; y
+# los widgets que más tardan en serializarse
+def resumir(registros):
+    ejecuciones = tabla_ejecuciones(registros)
+    if ejecuciones.empty:
+        return ejecuciones, pd.DataFrame(), pd.DataFrame()
+    medias = [c for c in ejecuciones.columns if c.endswith('_ms') and c != 'total_ms']
+    secciones = ejecuciones.groupby('seccion').agg(
+        ejecuciones=('total_ms', 'size'), sesiones=('sesion', 'nunique'),
+        p50_ms=('total_ms', 'median'), p95_ms=('total_ms', lambda s: s.quantile(0.95)),
+        **{c: (c, 'mean') for c in medias}).sort_values('p95_ms', ascending=False)
+
+    caches = pd.DataFrame([{'capa': capa, **c} for r in registros for capa, c in r['caches'].items()],
+                          columns=['capa', 'aciertos', 'fallos'])
+    caches = caches.groupby('capa').sum()
+    consultas = caches['aciertos'] + caches['fallos']
+    caches['tasa_aciertos'] = (caches['aciertos'] / consultas.where(consultas > 0)).fillna(0.0)
+
+    widgets = pd.DataFrame([dict(w, seccion=r['seccion']) for r in registros for w in r['widgets']],
+                           columns=['seccion', 'widget', 'etapa', 'segundos'])
+    widgets = (widgets.groupby(['seccion', 'widget', 'etapa'])['segundos'].agg(['size', 'mean', 'max'])
+               .mul([1, 1000, 1000]).rename(columns={'size': 'veces', 'mean': 'media_ms', 'max': 'max_ms'})
+               .sort_values('media_ms', ascending=False))
+    return secciones, caches, widgets
+
+
+def main(argumentos=None):
+    parser = argparse.ArgumentParser(description="Resume el log de perfil de ICATEX")
+    parser.add_argument('logs', nargs='*', default=[RUTA_LOG], help="Logs JSON lines (ICATEX_PERFIL_LOG)")
+    parser.add_argument('--widgets', type=int, default=15, help="Widgets más lentos a listar")
+    opciones = parser.parse_args(argumentos)
+
+    registros = [r for ruta in opciones.logs for r in leer_log(ruta)]
+    secciones, caches, widgets = resumir(registros)
+    formato = lambda v: f"{v:,.1f}"
+    print(f"{len(registros)} ejecuciones")
+    print(secciones.to_string(float_format=formato))
+    print()
+    print(caches.to_string(float_format=lambda v: f"{v:.2f}"))
+    print()
+    print(widgets.head(opciones.widgets).to_string(float_format=formato))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,201 @@
+import argparse
+import glob
+import multiprocessing
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from icatex import almacen, motores
+from icatex.datos import AÑO_INICIAL, EXTENSIONES_ALMACEN, cargar_datos
+from icatex.tensores import SERIES
+
+# Modo multiplanta: cada planta tiene su propio libro de Excel (o su planta en una base de
+# icatex.almacen) con el mismo esquema. Las plantas se cargan en paralelo y sus tensores
+# se apilan sobre un eje de plantas para compararlas con operaciones vectorizadas.
+#
+#   python -m icatex.plantas plantas/            (un libro por planta)
+#   python -m icatex.plantas icatex.db           (todas las plantas de la base)
+
+EXTENSIONES_LIBRO = ('.xlsx', '.xlsm')
+
+
+# Fuentes de cada planta: nombre -> (origen, planta dentro de la base o None para un libro).
+# `rutas` es un directorio, un patrón glob o varios de ellos separados por os.pathsep; el
+# nombre de un libro es su nombre de archivo y las bases aportan todas sus plantas.
+def descubrir(rutas):
+    archivos = []
+    for parte in str(rutas).split(os.pathsep):
+        ruta = Path(parte)
+        if ruta.is_dir():
+            archivos += sorted(a for a in ruta.iterdir() if a.suffix.lower() in EXTENSIONES_LIBRO + EXTENSIONES_ALMACEN)
+        else:
+            archivos += sorted(Path(a) for a in glob.glob(parte))
+
+    fuentes = {}
+    for archivo in archivos:
+        if archivo.name.startswith('~$'):
+            continue
+        if archivo.suffix.lower() in EXTENSIONES_ALMACEN:
+            for planta in almacen.plantas(archivo)['Planta']:
+                fuentes[planta] = (str(archivo), planta)
+        elif archivo.suffix.lower() in EXTENSIONES_LIBRO:
+            fuentes[archivo.stem] = (str(archivo), None)
+    return fuentes
+
+
+def _cargar(origen, planta):
+    inicio = time.perf_counter()
+    data, avisos = cargar_datos(origen, planta)
+    return data, avisos, time.perf_counter() - inicio
+
+
+# Carga todas las fuentes a la vez. Leer un libro es CPU en Python (openpyxl), por eso el
+# pool es de procesos por defecto: el total tarda como la planta más lenta y no la suma.
+# Los procesos se arrancan con spawn: un fork dentro del servidor de Streamlit, que tiene
+# hilos, copiaría locks tomados por otros hilos. Devuelve, por planta, el dataset, sus
+# avisos y los segundos de carga.
+def cargar_plantas(fuentes, max_trabajadores=None, procesos=True):
+    if not fuentes:
+        return {}, {}, {}
+    trabajadores = max_trabajadores or min(len(fuentes), os.cpu_count() or 1)
+    if procesos and trabajadores > 1:
+        ejecutor = ProcessPoolExecutor(max_workers=trabajadores, mp_context=multiprocessing.get_context('spawn'))
+    else:
+        ejecutor = ThreadPoolExecutor(max_workers=trabajadores)
+    with ejecutor as pool:
+        futuros = {planta: pool.submit(_cargar, origen, en_base) for planta, (origen, en_base) in fuentes.items()}
+        resultados = {planta: futuro.result() for planta, futuro in futuros.items()}
+    return ({planta: r[0] for planta, r in resultados.items()},
+            {planta: r[1] for planta, r in resultados.items()},
+            {planta: r[2] for planta, r in resultados.items()})
+
+
+# Unión de los identificadores de todas las plantas en orden de primera aparición
+def _union(listas):
+    return pd.Index(np.concatenate([np.asarray(l, dtype=object) for l in listas])).unique()
+
+
+# Tensores de todas las plantas alineados sobre la unión de productos, insumos, procesos y
+# periodos y apilados en arreglos [planta × entidad × periodo]. Lo que una planta no tiene
+# queda en cero y se marca en las máscaras `presente_<eje>` [planta × entidad].
+def apilar(tensores_por_planta):
+    plantas = list(tensores_por_planta)
+    lista = list(tensores_por_planta.values())
+    ejes = {eje: _union([t[eje] for t in lista]) for eje in ('productos', 'insumos', 'procesos')}
+    periodos = np.unique(np.concatenate([t['periodos'] for t in lista]))
+    N, T = len(plantas), len(periodos)
+
+    apilado = {'plantas': np.array(plantas, dtype=object), 'periodos': periodos}
+    apilado.update({eje: ids.to_numpy() for eje, ids in ejes.items()})
+    filas = [{eje: ids.get_indexer(t[eje]) for eje, ids in ejes.items()} for t in lista]
+    columnas = [np.searchsorted(periodos, t['periodos']) for t in lista]
+
+    for eje, ids in ejes.items():
+        apilado[f'presente_{eje}'] = np.zeros((N, len(ids)), dtype=bool)
+        for n, f in enumerate(filas):
+            apilado[f'presente_{eje}'][n, f[eje]] = True
+
+    series = {clave: ([t[clave] for t in lista], eje) for clave, (*_, eje) in SERIES.items()}
+    # Minutos de cada proceso que consume el plan de producción [proceso × periodo]
+    series['uso'] = ([np.asarray(t['PP'].T @ t['produccion']) for t in lista], 'procesos')
+    for clave, (valores, eje) in series.items():
+        apilado[clave] = np.zeros((N, len(ejes[eje]), T))
+        for n, (f, c, v) in enumerate(zip(filas, columnas, valores)):
+            apilado[clave][n][np.ix_(f[eje], c)] = v
+
+    apilado['costo_almacen'] = np.zeros((N, len(ejes['productos'])))
+    for n, (f, t) in enumerate(zip(filas, lista)):
+        apilado['costo_almacen'][n, f['productos']] = t['costo_almacen']
+    return apilado
+
+
+# Utilidad, margen, utilización y horas extra de todas las plantas a la vez, como en
+# icatex.objetivo pero sobre el eje de plantas: [planta × periodo] y [planta × proceso × periodo]
+def comparar(apilado):
+    ingresos = (apilado['precio'] * apilado['ventas']).sum(axis=1)
+    costo_insumos = (apilado['costo'] * apilado['produccion']).sum(axis=1)
+    costo_almacen = (apilado['costo_almacen'][:, :, None] * apilado['inventario']).sum(axis=1)
+    costo_horas_extra = apilado['costo_he'] * apilado['horas_extra']
+    utilidad = ingresos - costo_insumos - costo_almacen - costo_horas_extra.sum(axis=1)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        margen_porcentaje = np.where(ingresos > 0, utilidad / ingresos * 100, 0.0)
+        utilizacion = np.where(apilado['capacidad'] > 0, apilado['uso'] / apilado['capacidad'] * 100, np.nan)
+    return {
+        'plantas': apilado['plantas'],
+        'procesos': apilado['procesos'],
+        'periodos': apilado['periodos'],
+        'ingresos': ingresos,
+        'costo_insumos': costo_insumos,
+        'costo_almacen': costo_almacen,
+        'utilidad': utilidad,
+        'margen_porcentaje': margen_porcentaje,
+        'utilizacion': utilizacion,
+        'horas_extra': apilado['horas_extra'],
+        'costo_horas_extra': costo_horas_extra,
+    }
+
+
+def años(comparacion):
+    return np.unique(AÑO_INICIAL + (comparacion['periodos'] - 1) // 12)
+
+
+# Máscara de los periodos de `año` (todos con None)
+def periodos_año(comparacion, año=None):
+    if año is None:
+        return np.ones(len(comparacion['periodos']), dtype=bool)
+    return AÑO_INICIAL + (comparacion['periodos'] - 1) // 12 == año
+
+
+# Una fila por planta con los totales del tramo elegido
+def resumen_plantas(comparacion, año=None):
+    m = periodos_año(comparacion, año)
+    ingresos = comparacion['ingresos'][:, m].sum(axis=1)
+    utilidad = comparacion['utilidad'][:, m].sum(axis=1)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        margen = np.where(ingresos > 0, utilidad / ingresos * 100, 0.0)
+    return pd.DataFrame({
+        'Planta': comparacion['plantas'],
+        'Ingresos': ingresos,
+        'Costo_Insumos': comparacion['costo_insumos'][:, m].sum(axis=1),
+        'Costo_Almacenamiento': comparacion['costo_almacen'][:, m].sum(axis=1),
+        'Costo_Horas_Extra': comparacion['costo_horas_extra'][:, :, m].sum(axis=(1, 2)),
+        'Utilidad': utilidad,
+        'Margen_%': margen,
+        'Utilizacion_Media_%': np.nanmean(comparacion['utilizacion'][:, :, m], axis=(1, 2)),
+        'HorasExtrasMinutos': comparacion['horas_extra'][:, :, m].sum(axis=(1, 2)),
+    })
+
+
+# Plantas cargadas y sus tensores apilados, con los tensores de cada planta publicados en
+# la caché de los motores (los comparte con el resto de las vistas de esa planta)
+def comparar_plantas(datos):
+    tensores = {planta: motores.tensores(data['HUELLA'], data) for planta, data in datos.items()}
+    return comparar(apilar(tensores))
+
+
+def main(argumentos=None):
+    parser = argparse.ArgumentParser(description="Carga y compara varias plantas de ICATEX")
+    parser.add_argument('rutas', help="Directorio, patrón o bases separados por os.pathsep")
+    parser.add_argument('--trabajadores', type=int, default=None)
+    parser.add_argument('--hilos', action='store_true', help="Cargar con hilos en lugar de procesos")
+    parser.add_argument('--año', type=int, default=None)
+    opciones = parser.parse_args(argumentos)
+
+    fuentes = descubrir(opciones.rutas)
+    inicio = time.perf_counter()
+    datos, avisos, segundos = cargar_plantas(fuentes, opciones.trabajadores, not opciones.hilos)
+    total = time.perf_counter() - inicio
+    for planta in datos:
+        for aviso in avisos[planta]:
+            print(f"Aviso ({planta}): {aviso}")
+        print(f"{planta}: {segundos[planta]:.2f} s")
+    print(f"{len(datos)} plantas en {total:.2f} s (suma de cargas {sum(segundos.values()):.2f} s)")
+    print(resumen_plantas(comparar_plantas(datos), opciones.año).to_string(index=False))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,114 @@
+import numpy as np
+import pandas as pd
+
+POLITICAS = {
+    'sS': '(s, S) Revisión Continua',
+    'base_stock': 'Stock Base',
+    'revision_periodica': 'Revisión Periódica (R, S)',
+}
+
+
+# Rejilla de combinaciones de parámetros. s y S se expresan como múltiplos de la demanda
+# media de cada producto, de modo que una misma fila sirve para todo el catálogo.
+def rejilla_politicas(multiplos_s=None, multiplos_S=None, revisiones=(2, 3, 4, 6)):
+    multiplos_s = np.linspace(0.0, 2.0, 41) if multiplos_s is None else np.asarray(multiplos_s)
+    multiplos_S = np.linspace(0.5, 4.0, 71) if multiplos_S is None else np.asarray(multiplos_S)
+
+    s, S = np.meshgrid(multiplos_s, multiplos_S, indexing='ij')
+    validos = S.ravel() > s.ravel()
+    bloques = [
+        pd.DataFrame({'Politica': 'sS', 's': s.ravel()[validos], 'S': S.ravel()[validos], 'R': 1}),
+        pd.DataFrame({'Politica': 'base_stock', 's': multiplos_S, 'S': multiplos_S, 'R': 1}),
+    ]
+    R, S_r = np.meshgrid(np.asarray(revisiones), multiplos_S, indexing='ij')
+    bloques.append(pd.DataFrame({'Politica': 'revision_periodica', 's': S_r.ravel(),
+                                 'S': S_r.ravel(), 'R': R.ravel()}))
+    return pd.concat(bloques, ignore_index=True)
+
+
+# Demanda [réplica × producto × periodo]: la media de la banda mínima-máxima o
+# escenarios uniformes dentro de la banda generados con semilla fija
+def demanda_politicas(tensores, origen='media', replicas=20, semilla=0):
+    d_min = tensores['demanda_min']
+    d_max = tensores['demanda_max']
+    if origen == 'minima':
+        return d_min[None, :, :]
+    if origen == 'maxima':
+        return d_max[None, :, :]
+    if origen == 'simulada':
+        rng = np.random.default_rng(semilla)
+        return d_min[None] + rng.random((replicas,) + d_min.shape) * (d_max - d_min)[None]
+    return ((d_min + d_max) / 2)[None, :, :]
+
+
+# Simula todas las combinaciones de la rejilla, para todos los productos y réplicas a la vez.
+# El estado tiene forma [combinación × réplica × producto]; solo se itera sobre los periodos.
+# Las ventas no atendidas se pierden.
+def simular_politicas(rejilla, demanda, costo_almacen, stock_inicial, lead_time=1):
+    C = len(rejilla)
+    replicas, P, T = demanda.shape
+    media = demanda.mean(axis=(0, 2))
+
+    s = rejilla['s'].to_numpy(dtype=float)[:, None, None] * media[None, None, :]
+    S = rejilla['S'].to_numpy(dtype=float)[:, None, None] * media[None, None, :]
+    R = rejilla['R'].to_numpy(dtype=int)[:, None, None]
+
+    disponible = np.broadcast_to(np.asarray(stock_inicial, dtype=float), (C, replicas, P)).copy()
+    transito = np.zeros((lead_time + 1, C, replicas, P))
+    ventas = np.zeros((C, replicas, P))
+    inventario = np.zeros((C, replicas, P))
+    pedidos = np.zeros((C, replicas, P))
+
+    for t in range(T):
+        posicion = disponible + transito.sum(axis=0)
+        revisa = (t % R) == 0
+        pedido = np.where(revisa & (posicion <= s), np.maximum(S - posicion, 0), 0.0)
+        pedidos += pedido > 0
+        transito[(t + lead_time) % (lead_time + 1)] += pedido
+        llegada = t % (lead_time + 1)
+        disponible += transito[llegada]
+        transito[llegada] = 0
+
+        vendido = np.minimum(disponible, demanda[:, :, t][None])
+        disponible -= vendido
+        ventas += vendido
+        inventario += disponible
+
+    inventario_medio = inventario / T
+    costo = (inventario * np.asarray(costo_almacen)[None, None, :]).sum(axis=2).mean(axis=1)
+    demanda_total = demanda.sum(axis=(0, 2)) / replicas
+
+    resultado = rejilla.copy()
+    resultado['Costo_Almacenamiento'] = costo
+    resultado['Nivel_Servicio_%'] = ventas.mean(axis=1).sum(axis=1) / demanda_total.sum() * 100
+    vendido_total = ventas.mean(axis=1).sum(axis=1)
+    inventario_total = inventario_medio.mean(axis=1).sum(axis=1)
+    # Sin inventario medio la rotación queda en 0, como en el plan de referencia
+    resultado['Rotacion'] = np.divide(vendido_total, inventario_total, out=np.zeros_like(vendido_total),
+                                      where=inventario_total > 0)
+    resultado['Pedidos'] = pedidos.mean(axis=1).sum(axis=1)
+    resultado['Inventario_Medio'] = inventario_total
+    return resultado
+
+
+# Mismos indicadores para el plan óptimo de LINGO, como referencia del benchmark
+def indicadores_plan(tensores, demanda):
+    ventas = tensores['ventas']
+    inventario = tensores['inventario']
+    demanda_total = demanda.sum() / demanda.shape[0]
+    # El plan puede vender por encima de la demanda de referencia; solo cuenta lo que la cubre
+    atendido = np.minimum(ventas[None], demanda).sum() / demanda.shape[0]
+    inventario_medio = inventario.mean(axis=1).sum()
+    return {
+        'Costo_Almacenamiento': float((inventario * tensores['costo_almacen'][:, None]).sum()),
+        'Nivel_Servicio_%': float(atendido / demanda_total * 100) if demanda_total > 0 else 0.0,
+        'Rotacion': float(ventas.sum() / inventario_medio) if inventario_medio > 0 else 0.0,
+        'Inventario_Medio': float(inventario_medio),
+    }
+
+
+# Combinaciones no dominadas en (costo de almacenamiento, nivel de servicio)
+def frontera_eficiente(resultado):
+    ordenado = resultado.sort_values(['Costo_Almacenamiento', 'Nivel_Servicio_%'], ascending=[True, False])
+    mejor_previo = ordenado['Nivel_Servicio_%'].cummax().shift(fill_value=-np.inf)
+    return ordenado[ordenado['Nivel_Servicio_%'] > mejor_previo]
@@ -0,0 +1,120 @@
+import numpy as np
+import pandas as pd
+
+from icatex.pronostico_demanda import perfil_estacional
+
+
+# Estima la elasticidad precio de cada producto con una regresión log-log de la demanda
+# media de la banda contra el precio, después de quitar el efecto del mes (efectos fijos).
+# Todas las pendientes salen de la misma operación sobre la matriz [producto × periodo].
+# Las estimaciones no negativas o con poco ajuste no son utilizables para fijar precios
+# y se reemplazan por `elasticidad_defecto`.
+def estimar_respuesta(tensores, elasticidad_defecto=-1.5, r2_minimo=0.1):
+    periodos = tensores['periodos']
+    precio = tensores['precio']
+    demanda = (tensores['demanda_min'] + tensores['demanda_max']) / 2
+    validos = (precio > 0) & (demanda > 0)
+
+    log_p = np.log(np.where(validos, precio, 1.0))
+    log_q = np.log(np.where(validos, demanda, 1.0))
+    mes = (periodos - 1) % 12
+    x = log_p - perfil_estacional(log_p, periodos)[:, mes]
+    y = log_q - perfil_estacional(log_q, periodos)[:, mes]
+    x = np.where(validos, x, 0.0)
+    y = np.where(validos, y, 0.0)
+
+    sxx = (x * x).sum(axis=1)
+    sxy = (x * y).sum(axis=1)
+    syy = (y * y).sum(axis=1)
+    elasticidad = np.divide(sxy, sxx, out=np.zeros_like(sxy), where=sxx > 0)
+    r2 = np.divide(sxy ** 2, sxx * syy, out=np.zeros_like(sxy), where=(sxx > 0) & (syy > 0))
+    estimada = (elasticidad < 0) & (r2 >= r2_minimo)
+    return {
+        'elasticidad': np.where(estimada, elasticidad, elasticidad_defecto),
+        'elasticidad_estimada': elasticidad,
+        'estimada': estimada,
+        'r2': r2,
+        'demanda_referencia': demanda,
+    }
+
+
+# Demanda esperada a un precio dado según la respuesta de elasticidad constante
+def demanda_a_precio(respuesta, precio_referencia, precio):
+    factor = np.divide(precio, precio_referencia, out=np.ones_like(precio, dtype=float),
+                       where=precio_referencia > 0)
+    return respuesta['demanda_referencia'] * factor ** respuesta['elasticidad'][:, None]
+
+
+# Precio que maximiza (p - c) * q(p) con elasticidad constante, acotado a [inf, sup] × precio actual
+def _precio_optimo(costo, elasticidad, precio_referencia, limite_inferior, limite_superior):
+    e = elasticidad[:, None]
+    inferior = precio_referencia * limite_inferior
+    superior = precio_referencia * limite_superior
+    with np.errstate(divide='ignore', invalid='ignore'):
+        interior = np.where(e < -1, costo * e / (1 + e), superior)
+    return np.clip(interior, inferior, superior)
+
+
+# Precios óptimos para todos los productos y periodos en una pasada. Con acoplamiento de
+# capacidad, un precio sombra por (proceso, periodo) encarece los productos que usan
+# procesos saturados; se ajusta por subgradiente y, si se permiten horas extra, nunca
+# supera el CostoHoraExtra del proceso.
+def optimizar_precios(tensores, respuesta=None, limite_inferior=0.5, limite_superior=1.5,
+                      acoplar_capacidad=False, permitir_horas_extra=True, iteraciones=200):
+    if respuesta is None:
+        respuesta = estimar_respuesta(tensores)
+    precio_ref = tensores['precio']
+    costo = tensores['costo']
+    elasticidad = respuesta['elasticidad']
+
+    costo_efectivo = costo
+    sombra = np.zeros_like(tensores['capacidad'])
+    if acoplar_capacidad and tensores['PP'].shape[1] > 0:
+        PP = tensores['PP']
+        capacidad = np.maximum(tensores['capacidad'], 1.0)
+        margen_minuto = np.median((precio_ref - costo).clip(min=0).mean(axis=1)
+                                  / np.maximum(np.asarray(PP.sum(axis=1)).ravel(), 1.0))
+        techo = tensores['costo_he'] if permitir_horas_extra else np.inf
+        for k in range(iteraciones):
+            costo_efectivo = costo + np.asarray(PP @ sombra)
+            precio = _precio_optimo(costo_efectivo, elasticidad, precio_ref, limite_inferior, limite_superior)
+            uso = np.asarray(PP.T @ demanda_a_precio(respuesta, precio_ref, precio))
+            paso = margen_minuto / np.sqrt(k + 1)
+            sombra = np.clip(sombra + paso * (uso / capacidad - 1), 0, techo)
+        costo_efectivo = costo + np.asarray(PP @ sombra)
+
+    precio = _precio_optimo(costo_efectivo, elasticidad, precio_ref, limite_inferior, limite_superior)
+    demanda = demanda_a_precio(respuesta, precio_ref, precio)
+    # Con acoplamiento, ambas utilidades descuentan el costo de capacidad (precio sombra)
+    return {
+        'precio': precio,
+        'demanda': demanda,
+        'utilidad': (precio - costo_efectivo) * demanda,
+        'utilidad_actual': (precio_ref - costo_efectivo) * respuesta['demanda_referencia'],
+        'precio_sombra': sombra,
+        'respuesta': respuesta,
+    }
+
+
+# Tabla de oportunidades por producto ordenada por ganancia de utilidad
+def ranking_oportunidades(optimo, tensores, nombres_productos=None):
+    nombres_productos = nombres_productos or {}
+    respuesta = optimo['respuesta']
+    precio_ref = tensores['precio']
+    ranking = pd.DataFrame({
+        'ID_Producto': tensores['productos'],
+        'Producto': [nombres_productos.get(p, p) for p in tensores['productos']],
+        'Elasticidad_Estimada': respuesta['elasticidad_estimada'],
+        'R2': respuesta['r2'],
+        'Elasticidad_Usada': respuesta['elasticidad'],
+        'Fuente': np.where(respuesta['estimada'], 'Histórico', 'Por defecto'),
+        'Precio_Actual_Medio': precio_ref.mean(axis=1),
+        'Precio_Optimo_Medio': optimo['precio'].mean(axis=1),
+        'Cambio_Precio_%': (optimo['precio'].sum(axis=1) / np.maximum(precio_ref.sum(axis=1), 1e-9) - 1) * 100,
+        'Demanda_Actual': respuesta['demanda_referencia'].sum(axis=1),
+        'Demanda_Optima': optimo['demanda'].sum(axis=1),
+        'Utilidad_Actual': optimo['utilidad_actual'].sum(axis=1),
+        'Utilidad_Optima': optimo['utilidad'].sum(axis=1),
+    })
+    ranking['Ganancia'] = ranking['Utilidad_Optima'] - ranking['Utilidad_Actual']
+    return ranking.sort_values('Ganancia', ascending=False).reset_index(drop=True)
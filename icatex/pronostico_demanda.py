@@ -0,0 +1,228 @@
+import hashlib
+import itertools
+from statistics import NormalDist
+
+import numpy as np
+import pandas as pd
+
+from icatex.caches import CacheLRU
+from icatex.pronostico_stock import matriz_diseno
+
+MESES = ['Enero', 'Febrero', 'Marzo', 'Abril', 'Mayo', 'Junio', 'Julio',
+         'Agosto', 'Septiembre', 'Octubre', 'Noviembre', 'Diciembre']
+
+# Series pronosticadas por producto: clave del tensor -> columna de DAT_PM_MATRIX
+VARIABLES = {
+    'demanda_min': 'DemandaMinima',
+    'demanda_max': 'DemandaMaxima',
+    'precio': 'PrecioVenta',
+    'costo': 'CostoInsumo',
+}
+
+MODELOS = {
+    'naive_estacional': 'Ingenuo Estacional',
+    'holt_winters': 'Holt-Winters Aditivo',
+    'regresion_estacional': 'Regresión con Índice Estacional',
+}
+
+# Rejilla de parámetros de Holt-Winters evaluada para todas las series a la vez
+_REJILLA_HW = np.array(list(itertools.product([0.1, 0.3, 0.5], [0.01, 0.1], [0.1, 0.3])))
+
+# Ajustes ya calculados por (modelo, horizonte, nivel, huella de la serie)
+_CACHE_AJUSTES = CacheLRU('ajustes_pronostico', max_entradas=100000)
+
+
+def _mes(periodos):
+    return (np.asarray(periodos) - 1) % 12
+
+
+# Perfil mensual promedio [serie × 12] de una matriz [serie × periodo]
+def perfil_estacional(matriz, periodos):
+    indicadora = np.eye(12)[_mes(periodos)]
+    conteo = indicadora.sum(axis=0)
+    return (matriz @ indicadora) / np.where(conteo > 0, conteo, 1)
+
+
+# Repite el último año observado. Devuelve pronóstico [serie × h] y sigma por serie
+def _naive_estacional(Y, periodos, horizonte):
+    T = Y.shape[1]
+    pasos = np.arange(horizonte)
+    pronostico = Y[:, T - 12 + pasos % 12]
+    residuo = Y[:, 12:] - Y[:, :-12]
+    sigma = residuo.std(axis=1, ddof=1) if residuo.shape[1] > 1 else np.zeros(len(Y))
+    escala = np.sqrt(pasos // 12 + 1)
+    return pronostico, sigma[:, None] * escala[None, :]
+
+
+# Tendencia lineal más un índice por mes, resuelto con un único lstsq para todas las series
+def _regresion_estacional(Y, periodos, horizonte):
+    X = matriz_diseno(periodos, estacional=True)
+    beta, *_ = np.linalg.lstsq(X, Y.T, rcond=None)
+    futuros = np.asarray(periodos)[-1] + np.arange(1, horizonte + 1)
+    pronostico = (matriz_diseno(futuros, estacional=True) @ beta).T
+    residuo = Y - (X @ beta).T
+    sigma = np.sqrt((residuo ** 2).sum(axis=1) / max(Y.shape[1] - X.shape[1], 1))
+    return pronostico, sigma[:, None] * np.sqrt(1 + np.arange(horizonte) / 12)[None, :]
+
+
+# Holt-Winters aditivo. La recursión avanza periodo a periodo, pero cada paso opera
+# sobre todas las series y todas las combinaciones de la rejilla [parámetro × serie].
+# El estado (nivel, tendencia, estación y sumas de errores de cada combinación) basta
+# para seguir la recursión: un periodo nuevo se incorpora sin recorrer la historia.
+def estado_holt_winters(Y, periodos):
+    S = Y.shape[0]
+    mes = _mes(periodos)
+    G = len(_REJILLA_HW)
+
+    nivel0 = Y[:, :12].mean(axis=1)
+    estacion = np.zeros((G, S, 12))
+    estacion[:, :, mes[:12]] = (Y[:, :12] - nivel0[:, None])[None, :, :]
+    estado = {
+        'nivel': np.tile(nivel0, (G, 1)),
+        'tendencia': np.tile((Y[:, 12:24].mean(axis=1) - nivel0) / 12, (G, 1)),
+        'estacion': estacion,
+        # Suma, suma de cuadrados y número de errores desde el periodo 13
+        'sse': np.zeros((G, S)),
+        'suma_errores': np.zeros((G, S)),
+        'observados': 0,
+        'periodos': np.asarray(periodos)[:0],
+    }
+    return avanzar_holt_winters(estado, Y, periodos)
+
+
+# Estado con las columnas de Y [serie × k] de los periodos siguientes incorporadas
+def avanzar_holt_winters(estado, Y, periodos):
+    alfa, beta, gamma = (_REJILLA_HW[:, k][:, None] for k in range(3))
+    nivel, tendencia = estado['nivel'], estado['tendencia']
+    estacion = estado['estacion'].copy()
+    sse, suma_errores = estado['sse'].copy(), estado['suma_errores'].copy()
+    observados = estado['observados']
+    inicio = len(estado['periodos'])
+    for k, m in enumerate(_mes(periodos)):
+        s = estacion[:, :, m]
+        error = Y[:, k] - (nivel + tendencia + s)
+        if inicio + k >= 12:
+            sse += error ** 2
+            suma_errores += error
+            observados += 1
+        nuevo_nivel = alfa * (Y[:, k] - s) + (1 - alfa) * (nivel + tendencia)
+        tendencia = beta * (nuevo_nivel - nivel) + (1 - beta) * tendencia
+        estacion[:, :, m] = gamma * (Y[:, k] - nuevo_nivel) + (1 - gamma) * s
+        nivel = nuevo_nivel
+    return {
+        'nivel': nivel,
+        'tendencia': tendencia,
+        'estacion': estacion,
+        'sse': sse,
+        'suma_errores': suma_errores,
+        'observados': observados,
+        'periodos': np.concatenate([estado['periodos'], periodos]),
+    }
+
+
+# Pronóstico [serie × h] y sigma con la mejor combinación de parámetros de cada serie
+def pronostico_holt_winters(estado, horizonte):
+    mejor = estado['sse'].argmin(axis=0)
+    serie = np.arange(estado['sse'].shape[1])
+    pasos = np.arange(1, horizonte + 1)
+    meses_futuros = _mes(estado['periodos'][-1] + pasos)
+    pronostico = (estado['nivel'][mejor, serie][:, None]
+                  + estado['tendencia'][mejor, serie][:, None] * pasos[None, :]
+                  + estado['estacion'][mejor, serie][:, meses_futuros])
+    n = estado['observados']
+    media = estado['suma_errores'][mejor, serie] / n
+    varianza = (estado['sse'][mejor, serie] - n * media ** 2) / max(n - 1, 1)
+    sigma = np.sqrt(np.clip(varianza, 0, None))
+    return pronostico, sigma[:, None] * np.sqrt(pasos)[None, :]
+
+
+def _holt_winters(Y, periodos, horizonte):
+    return pronostico_holt_winters(estado_holt_winters(Y, periodos), horizonte)
+
+
+_AJUSTADORES = {
+    'naive_estacional': _naive_estacional,
+    'holt_winters': _holt_winters,
+    'regresion_estacional': _regresion_estacional,
+}
+
+
+# Pronostica un lote de series [serie × periodo]. Solo se ajustan las series cuya
+# historia cambió desde la última llamada; el resto sale de la caché de ajustes.
+def pronosticar_series(Y, periodos, horizonte=12, modelo='holt_winters', nivel=0.9):
+    Y = np.asarray(Y, dtype=float)
+    # Con menos de dos años de historia solo el modelo ingenuo es estimable
+    if Y.shape[1] < 24:
+        modelo = 'naive_estacional'
+
+    prefijo = (modelo, horizonte, nivel, np.asarray(periodos).tobytes())
+    claves = [prefijo + (hashlib.blake2b(fila.tobytes(), digest_size=16).digest(),) for fila in Y]
+    ajustes = [_CACHE_AJUSTES.obtener(clave) for clave in claves]
+    pendientes = [k for k, ajuste in enumerate(ajustes) if ajuste is None]
+
+    if pendientes:
+        pronostico, dispersion = _AJUSTADORES[modelo](Y[pendientes], periodos, horizonte)
+        for k, p, d in zip(pendientes, pronostico, dispersion):
+            ajustes[k] = (p, d)
+            _CACHE_AJUSTES.guardar(claves[k], (p, d), p.nbytes + d.nbytes)
+
+    pronostico = np.array([a[0] for a in ajustes]).reshape(len(Y), horizonte)
+    dispersion = np.array([a[1] for a in ajustes]).reshape(len(Y), horizonte)
+    z = NormalDist().inv_cdf(0.5 + nivel / 2)
+    return {
+        'pronostico': pronostico,
+        'inferior': pronostico - z * dispersion,
+        'superior': pronostico + z * dispersion,
+        'reajustadas': len(pendientes),
+    }
+
+
+# Series de pronosticar_demanda apiladas [variable·producto × periodo]
+def series_demanda(tensores):
+    return np.concatenate([tensores[v] for v in VARIABLES])
+
+
+# Pronóstico de demanda mínima/máxima, precio y costo de todos los productos en un solo lote.
+# Con `estado` (de estado_holt_winters sobre series_demanda, mantenido periodo a periodo)
+# Holt-Winters sale del estado sin volver a recorrer la historia.
+def pronosticar_demanda(tensores, horizonte=12, modelo='holt_winters', nivel=0.9, estado=None):
+    periodos = tensores['periodos']
+    P = len(tensores['productos'])
+    if estado is not None and modelo == 'holt_winters':
+        pronostico, dispersion = pronostico_holt_winters(estado, horizonte)
+        z = NormalDist().inv_cdf(0.5 + nivel / 2)
+        resultado = {'pronostico': pronostico, 'inferior': pronostico - z * dispersion,
+                     'superior': pronostico + z * dispersion, 'reajustadas': 0}
+    else:
+        resultado = pronosticar_series(series_demanda(tensores), periodos, horizonte, modelo, nivel)
+
+    pronostico = {'futuros': periodos[-1] + np.arange(1, horizonte + 1),
+                  'modelo': modelo, 'nivel': nivel, 'reajustadas': resultado['reajustadas']}
+    for k, variable in enumerate(VARIABLES):
+        bloque = slice(k * P, (k + 1) * P)
+        pronostico[variable] = {
+            'pronostico': resultado['pronostico'][bloque],
+            'inferior': resultado['inferior'][bloque],
+            'superior': resultado['superior'][bloque],
+        }
+    return pronostico
+
+
+# Filas futuras con el esquema de DAT_PM_MATRIX, listas para alimentar el modelo de planificación
+def filas_pm_matrix(pronostico, tensores):
+    productos = tensores['productos']
+    futuros = pronostico['futuros']
+    H = len(futuros)
+
+    d_min = np.clip(pronostico['demanda_min']['pronostico'], 0, None)
+    d_max = np.clip(pronostico['demanda_max']['pronostico'], 0, None)
+
+    return pd.DataFrame({
+        'ID_Producto': np.repeat(productos, H),
+        'Periodo_Index': np.tile(futuros, len(productos)),
+        'Mes': np.tile(np.array(MESES)[_mes(futuros)], len(productos)),
+        'DemandaMinima': np.rint(np.minimum(d_min, d_max)).astype(int).ravel(),
+        'DemandaMaxima': np.rint(np.maximum(d_min, d_max)).astype(int).ravel(),
+        'PrecioVenta': np.round(np.clip(pronostico['precio']['pronostico'], 0, None), 2).ravel(),
+        'CostoInsumo': np.round(np.clip(pronostico['costo']['pronostico'], 0, None), 2).ravel(),
+    })
@@ -0,0 +1,106 @@
+import numpy as np
+import pandas as pd
+
+
+# Matriz de diseño [periodo × coeficiente]: intercepto, tendencia y, si es estacional,
+# una variable indicadora por mes (enero es la referencia)
+def matriz_diseno(periodos, estacional):
+    t = np.asarray(periodos, dtype=float)
+    columnas = [np.ones_like(t), t]
+    if estacional:
+        mes = (np.asarray(periodos) - 1) % 12
+        columnas += [(mes == m).astype(float) for m in range(1, 12)]
+    return np.column_stack(columnas)
+
+
+# Ajusta la tendencia de stock de todos los insumos con una sola solución de mínimos
+# cuadrados sobre la matriz [insumo × periodo] (una columna de Y por insumo)
+def ajustar_tendencias(stock, periodos, estacional=False):
+    periodos = np.asarray(periodos)
+    X = matriz_diseno(periodos, estacional)
+    # Con menos de dos años de historia el modelo estacional no está identificado
+    if estacional and len(periodos) < X.shape[1] + 12:
+        return ajustar_tendencias(stock, periodos, estacional=False)
+
+    beta, *_ = np.linalg.lstsq(X, np.asarray(stock, dtype=float).T, rcond=None)
+    ajustado = (X @ beta).T
+    residuo = stock - ajustado
+    grados_libertad = max(len(periodos) - X.shape[1], 1)
+    sigma = np.sqrt((residuo ** 2).sum(axis=1) / grados_libertad)
+
+    return {
+        'coeficientes': beta.T,
+        'pendiente': beta[1],
+        'ajustado': ajustado,
+        'sigma': sigma,
+        'estacional': estacional,
+    }
+
+
+# Proyecta el stock de todos los insumos `horizonte` periodos hacia adelante
+def proyectar_stock(ajuste, periodos, horizonte):
+    futuros = np.asarray(periodos)[-1] + np.arange(1, horizonte + 1)
+    X = matriz_diseno(futuros, ajuste['estacional'])
+    return futuros, ajuste['coeficientes'] @ X.T
+
+
+# Consumo futuro esperado: perfil mensual promedio del requerimiento del plan
+def consumo_proyectado(requerido, periodos, futuros):
+    mes = (np.asarray(periodos) - 1) % 12
+    indicadora = np.eye(12)[mes]
+    conteo = indicadora.sum(axis=0)
+    perfil = (requerido @ indicadora) / np.where(conteo > 0, conteo, 1)
+    return perfil[:, (np.asarray(futuros) - 1) % 12]
+
+
+# Predice el primer periodo de quiebre de stock de cada insumo frente al consumo del plan.
+# El escenario pesimista descuenta `z` desviaciones estándar del residuo del ajuste.
+def predecir_quiebres(tensores, requerido, horizonte=12, estacional=True, z=1.0):
+    periodos = tensores['periodos']
+    ajuste = ajustar_tendencias(tensores['stock'], periodos, estacional)
+    futuros, stock_proyectado = proyectar_stock(ajuste, periodos, horizonte)
+    consumo = consumo_proyectado(requerido, periodos, futuros)
+
+    holgura = stock_proyectado - consumo
+    holgura_pesimista = holgura - z * ajuste['sigma'][:, None]
+
+    def _primer_quiebre(h):
+        quiebre = h < 0
+        return np.where(quiebre.any(axis=1), futuros[quiebre.argmax(axis=1)], 0)
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        cobertura = np.where(consumo > 0, stock_proyectado / consumo, np.inf)
+
+    return {
+        'ajuste': ajuste,
+        'futuros': futuros,
+        'stock_proyectado': stock_proyectado,
+        'consumo': consumo,
+        'holgura': holgura,
+        'quiebre': _primer_quiebre(holgura),
+        'quiebre_pesimista': _primer_quiebre(holgura_pesimista),
+        'cobertura_min': cobertura.min(axis=1),
+    }
+
+
+# Tabla de insumos ordenada por riesgo: primero los que quiebran antes, luego por cobertura
+def ranking_riesgo(prediccion, tensores, nombres_insumos=None):
+    nombres_insumos = nombres_insumos or {}
+    ultimo = tensores['periodos'][-1]
+    quiebre = prediccion['quiebre']
+    pesimista = prediccion['quiebre_pesimista']
+
+    ranking = pd.DataFrame({
+        'ID_Insumo': tensores['insumos'],
+        'Insumo': [nombres_insumos.get(i, i) for i in tensores['insumos']],
+        'Stock_Actual': tensores['stock'][:, -1],
+        'Tendencia_por_Periodo': prediccion['ajuste']['pendiente'],
+        'Consumo_Medio_Proyectado': prediccion['consumo'].mean(axis=1),
+        'Cobertura_Min_%': prediccion['cobertura_min'] * 100,
+        'Periodo_Quiebre': np.where(quiebre > 0, quiebre, np.nan),
+        'Periodos_Hasta_Quiebre': np.where(quiebre > 0, quiebre - ultimo, np.nan),
+        'Periodo_Quiebre_Pesimista': np.where(pesimista > 0, pesimista, np.nan),
+    })
+    ranking['En_Riesgo'] = ranking['Periodo_Quiebre_Pesimista'].notna()
+    return ranking.sort_values(['Periodo_Quiebre_Pesimista', 'Cobertura_Min_%'],
+                               na_position='last').reset_index(drop=True)
@@ -0,0 +1,432 @@
+import argparse
+import html
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+import plotly.express as px
+import plotly.graph_objects as go
+from plotly.offline import get_plotlyjs
+
+from icatex import (cubo, escenarios, motores, mrp, politicas_inventario, precios, pronostico_demanda,
+                    pronostico_stock, series)
+from icatex.datos import RUTA_LIBRO, cargar_datos, nombres_insumos, nombres_procesos
+
+# Reporte estático por lotes (sin Streamlit): carga el libro una vez y escribe cada sección
+# para cada selección (producto, insumo, proceso, año) como HTML, con las tablas en CSV y
+# Parquet. Las páginas son independientes y se reparten en un pool de procesos.
+#
+#   python -m icatex.reporte --salida reporte --procesos 4
+
+FORMATOS = ['csv', 'parquet']
+
+# Dataset del proceso trabajador, recibido una vez al crear el pool
+_DATOS = {}
+
+
+def _iniciar_trabajador(data, tensores, cubo_agregados):
+    _DATOS['data'] = data
+    # Tensores y cubo llegan ya construidos: se publican en la caché de motores del
+    # trabajador para que las páginas no los reconstruyan
+    motores.publicar(data['HUELLA'], 'tensores', tensores)
+    if cubo_agregados is not None:
+        motores.publicar(data['HUELLA'], 'cubo', cubo_agregados)
+
+
+def _contexto():
+    data = _DATOS['data']
+    tensores = motores.tensores(data['HUELLA'], data)
+    cubo_agregados = (motores.cubo_agregados(data['HUELLA'], data)
+                      if not data['DAT_PM_MATRIX'].empty else None)
+    return data, tensores, cubo_agregados
+
+
+def _nombres_productos(data):
+    if data['DAT_PRODUCTOS_FIJOS'].empty:
+        return {}
+    return data['DAT_PRODUCTOS_FIJOS'].set_index('ID_Producto')['Nombre_Producto'].to_dict()
+
+
+def _dinero(valor):
+    return f"$ {valor:,.2f}"
+
+
+# ===== PÁGINAS =====
+# Cada página recibe su selección y devuelve (título, indicadores, figuras, tablas)
+
+def pagina_resumen(seleccion):
+    data, tensores, cubo_agregados = _contexto()
+    fijos = data['DAT_PRODUCTOS_FIJOS']
+    indicadores = {
+        'Productos': len(data['SET_PRODUCTOS']),
+        'Insumos': len(data['SET_INSUMOS']),
+        'Procesos': len(data['SET_PROCESOS']),
+        'Meses': len(data['SET_MESES']),
+    }
+    figuras = []
+    tablas = {}
+    if not fijos.empty:
+        cat_dist = fijos['Categoria'].value_counts()
+        figuras.append(px.pie(values=cat_dist.values, names=cat_dist.index,
+                              title="Distribución de Productos por Categoría"))
+        linea_dist = fijos['Linea'].value_counts()
+        figuras.append(px.bar(x=linea_dist.index, y=linea_dist.values, color=linea_dist.index,
+                              title="Productos por Línea de Producción",
+                              labels={'x': 'Línea', 'y': 'Cantidad de Productos'}))
+        tablas['productos'] = fijos
+    if cubo_agregados is not None:
+        tablas['categorias'] = cubo.resumen_grupos(cubo_agregados, 'categoria')
+        tablas['lineas'] = cubo.resumen_grupos(cubo_agregados, 'linea')
+    if not data['RES_PRODUCCION'].empty:
+        objetivo = motores.valor_objetivo(data['HUELLA'], tensores)
+        indicadores.update({'Z': _dinero(objetivo['Z']), 'Ingresos': _dinero(objetivo['Ingresos'])})
+    return "📈 Resumen General", indicadores, figuras, tablas
+
+
+def pagina_producto(seleccion):
+    id_producto, año = seleccion
+    data, tensores, cubo_agregados = _contexto()
+    nombre = _nombres_productos(data).get(id_producto, id_producto)
+    detalle = cubo.detalle_producto(cubo_agregados, id_producto, año)
+
+    fig_precios = go.Figure()
+    for columna, color in [('PrecioVenta', 'green'), ('CostoInsumo', 'red'), ('Margen', 'blue')]:
+        fig_precios.add_trace(go.Scatter(x=detalle['Mes'], y=detalle[columna], name=columna,
+                                         line=dict(color=color)))
+    fig_precios.update_layout(title=f"Precio, Costo y Margen - {nombre} - {año}",
+                              xaxis_title="Mes", yaxis_title="Valor ($)")
+    fig_demanda = go.Figure()
+    fig_demanda.add_trace(go.Bar(x=detalle['Mes'], y=detalle['DemandaMinima'], name='Demanda Mínima'))
+    fig_demanda.add_trace(go.Bar(x=detalle['Mes'], y=detalle['DemandaMaxima'], name='Demanda Máxima'))
+    fig_demanda.update_layout(title=f"Rango de Demanda - {nombre} - {año}", barmode='group')
+
+    indicadores = {
+        'Precio Promedio': _dinero(detalle['PrecioVenta'].mean()),
+        'Costo Promedio': _dinero(detalle['CostoInsumo'].mean()),
+        'Margen Promedio %': f"{detalle['Margen_Porcentaje'].mean():.1f}%",
+    }
+    return f"👕 {nombre} - {año}", indicadores, [fig_precios, fig_demanda], {'detalle': detalle}
+
+
+def pagina_demanda(seleccion):
+    id_producto = seleccion
+    data, tensores, cubo_agregados = _contexto()
+    nombre = _nombres_productos(data).get(id_producto, id_producto)
+    p = tensores['productos'].tolist().index(id_producto)
+    pronostico = motores.pronostico(data['HUELLA'], tensores)
+
+    fig = go.Figure()
+    for variable, etiqueta, color in [('demanda_min', 'Demanda Mínima', 'orange'),
+                                      ('demanda_max', 'Demanda Máxima', 'red')]:
+        fig.add_trace(series.traza_serie(tensores['periodos'], tensores[variable][p],
+                                         name=f"{etiqueta} (Histórica)", line=dict(color=color)))
+        fig.add_trace(go.Scatter(x=pronostico['futuros'], y=pronostico[variable]['superior'][p],
+                                 line=dict(width=0), showlegend=False, hoverinfo='skip'))
+        fig.add_trace(go.Scatter(x=pronostico['futuros'], y=pronostico[variable]['inferior'][p],
+                                 line=dict(width=0), fill='tonexty', fillcolor='rgba(128,128,128,0.2)',
+                                 name=f"Intervalo {etiqueta}"))
+        fig.add_trace(go.Scatter(x=pronostico['futuros'], y=pronostico[variable]['pronostico'][p],
+                                 name=f"{etiqueta} (Pronóstico)", line=dict(color=color, dash='dash')))
+    fig.update_layout(title=f"Pronóstico de Demanda - {nombre} - {pronostico_demanda.MODELOS[pronostico['modelo']]}",
+                      xaxis_title="Período", yaxis_title="Unidades")
+
+    filas = pronostico_demanda.filas_pm_matrix(pronostico, tensores)
+    return f"📊 Demanda - {nombre}", {}, [fig], {'pronostico': filas[filas['ID_Producto'] == id_producto]}
+
+
+def pagina_insumo(seleccion):
+    id_insumo = seleccion
+    data, tensores, cubo_agregados = _contexto()
+    nombre = nombres_insumos.get(id_insumo, id_insumo)
+    i = tensores['insumos'].tolist().index(id_insumo)
+    requerido = motores.requerimientos(data['HUELLA'], tensores, 1)['requerido'][i]
+    quiebres = motores.quiebres_stock(data['HUELLA'], tensores)
+
+    fig = go.Figure()
+    fig.add_trace(go.Bar(x=tensores['periodos'], y=requerido, name='Requerimiento', marker_color='steelblue'))
+    fig.add_trace(series.traza_serie(tensores['periodos'], tensores['stock'][i], name='Stock Disponible',
+                                     line=dict(color='green')))
+    fig.add_trace(go.Scatter(x=quiebres['futuros'], y=quiebres['stock_proyectado'][i],
+                             name='Stock Proyectado', line=dict(color='green', dash='dash')))
+    fig.add_trace(go.Scatter(x=quiebres['futuros'], y=quiebres['consumo'][i],
+                             name='Consumo Proyectado', line=dict(color='steelblue', dash='dash')))
+    fig.update_layout(title=f"Requerimiento y Stock - {nombre}", xaxis_title="Período", yaxis_title="Unidades")
+
+    tablas = {'stock': data['DAT_KM_MATRIX'][data['DAT_KM_MATRIX']['ID_Insumo'] == id_insumo]}
+    contribucion = mrp.contribucion_productos(tensores, id_insumo)
+    if not contribucion.empty:
+        tablas['contribucion'] = contribucion.reset_index()
+    indicadores = {
+        'Stock Promedio': f"{tensores['stock'][i].mean():,.0f}",
+        'Requerimiento Total': f"{requerido.sum():,.0f}",
+        'Cobertura Mínima %': f"{quiebres['cobertura_min'][i]:,.1f}%",
+    }
+    return f"📦 {nombre}", indicadores, [fig], tablas
+
+
+def pagina_proceso(seleccion):
+    id_proceso = seleccion
+    data, tensores, cubo_agregados = _contexto()
+    nombre = nombres_procesos.get(id_proceso, id_proceso)
+    j = tensores['procesos'].tolist().index(id_proceso)
+
+    fig = go.Figure()
+    fig.add_trace(series.traza_serie(tensores['periodos'], tensores['capacidad'][j], name='Capacidad (min)'))
+    fig.add_trace(go.Bar(x=tensores['periodos'], y=tensores['horas_extra'][j], name='Horas Extra (min)'))
+    fig.update_layout(title=f"Capacidad y Horas Extra - {nombre}", xaxis_title="Período", yaxis_title="Minutos")
+
+    tiempos = data['DAT_PP_MATRIX'][['ID_Producto', id_proceso]] if id_proceso in data['DAT_PP_MATRIX'] else pd.DataFrame()
+    indicadores = {
+        'Capacidad Promedio': f"{tensores['capacidad'][j].mean():,.0f} min",
+        'Costo Hora Extra Promedio': _dinero(tensores['costo_he'][j].mean()),
+        'Horas Extra Totales': f"{tensores['horas_extra'][j].sum():,.0f} min",
+    }
+    tablas = {'periodos': data['DAT_PJM_MATRIX'][data['DAT_PJM_MATRIX']['ID_Proceso'] == id_proceso]}
+    if not tiempos.empty:
+        tablas['tiempos_producto'] = tiempos[tiempos[id_proceso] > 0]
+    return f"⚙️ {nombre}", indicadores, [fig], tablas
+
+
+def pagina_requerimientos(seleccion):
+    data, tensores, cubo_agregados = _contexto()
+    resultado = motores.requerimientos(data['HUELLA'], tensores, 1)
+    resumen = mrp.resumen_requerimientos(resultado, tensores, nombres_insumos)
+    fig = px.bar(resumen, x='Insumo', y='Requerido_Total', title="Requerimiento Total por Insumo")
+    indicadores = {'Insumos con Faltante': int((resumen['Periodos_Faltante'] > 0).sum())}
+    return "🧾 Requerimientos (MRP)", indicadores, [fig], {
+        'resumen': resumen, 'faltantes': mrp.faltantes_requerimientos(resultado, tensores),
+        'riesgo_stock': pronostico_stock.ranking_riesgo(motores.quiebres_stock(data['HUELLA'], tensores),
+                                                        tensores, nombres_insumos),
+    }
+
+
+def pagina_costos(seleccion):
+    año = seleccion
+    data, tensores, cubo_agregados = _contexto()
+    serie = cubo.serie_mensual(cubo_agregados, año)
+    rentabilidad = cubo.resumen_productos(cubo_agregados, año)
+
+    fig_tendencias = go.Figure()
+    for columna, color in [('PrecioVenta', 'green'), ('CostoInsumo', 'red'), ('Margen', 'blue')]:
+        fig_tendencias.add_trace(go.Scatter(x=serie['Periodo_Index'], y=serie[columna], name=columna,
+                                            line=dict(color=color)))
+    fig_tendencias.update_layout(title=f"Evolución de Precios, Costos y Margenes - {año}")
+    fig_top = px.bar(rentabilidad.nlargest(10, 'Margen_Porcentaje'), x='Nombre_Producto', y='Margen_Porcentaje',
+                     color='Categoria', title=f"Top 10 Productos por Margen % - {año}")
+    fig_top.update_layout(xaxis_tickangle=-45)
+
+    indicadores = {'Margen Promedio %': f"{rentabilidad['Margen_Porcentaje'].mean():.1f}%"}
+    return f"💰 Costos y Rentabilidad - {año}", indicadores, [fig_tendencias, fig_top], {
+        'productos': rentabilidad, 'categorias': cubo.resumen_grupos(cubo_agregados, 'categoria', año),
+    }
+
+
+def pagina_modelo(seleccion):
+    data, tensores, cubo_agregados = _contexto()
+    objetivo = motores.valor_objetivo(data['HUELLA'], tensores)
+    resultado, plan = motores.politicas(data['HUELLA'], tensores)
+    frontera = politicas_inventario.frontera_eficiente(resultado)
+
+    fig = px.scatter(resultado, x='Costo_Almacenamiento', y='Nivel_Servicio_%', color='Politica',
+                     title="Políticas de Inventario: Costo vs Nivel de Servicio")
+    fig.add_trace(go.Scatter(x=[plan['Costo_Almacenamiento']], y=[plan['Nivel_Servicio_%']], name='Plan LINGO',
+                             mode='markers', marker=dict(symbol='star', size=16, color='black')))
+    plan_optimo = pd.DataFrame({
+        'ID_Producto': np.repeat(tensores['productos'], len(tensores['periodos'])),
+        'Periodo_Index': np.tile(tensores['periodos'], len(tensores['productos'])),
+        'Produccion': tensores['produccion'].ravel(),
+        'Ventas': tensores['ventas'].ravel(),
+        'Inventario': tensores['inventario'].ravel(),
+    })
+    indicadores = {clave: _dinero(valor) for clave, valor in objetivo.items()}
+    return "🔍 Modelo de Optimización", indicadores, [fig], {
+        'plan': plan_optimo, 'horas_extra': data['RES_H_EXTRAS'], 'frontera_politicas': frontera,
+    }
+
+
+def pagina_simulaciones(seleccion):
+    data, tensores, cubo_agregados = _contexto()
+    optimo = motores.precios_optimos(data['HUELLA'], tensores)
+    ranking = precios.ranking_oportunidades(optimo, tensores, _nombres_productos(data))
+    fig = px.bar(ranking, x='Producto', y='Ganancia', title="Ganancia por Ajuste de Precio")
+    fig.update_layout(xaxis_tickangle=-45)
+    indicadores = {'Ganancia Total': _dinero(ranking['Ganancia'].sum())}
+    return "🎯 Simulaciones de Precio", indicadores, [fig], {'precios_optimos': ranking}
+
+
+# Resultados del modelo de programación por metas de LINGO, como en la página de metas
+def pagina_metas(seleccion):
+    metas = escenarios.kpis_metas_lingo(_DATOS['data'])
+
+    fig_utilidad = go.Figure(go.Indicator(
+        mode="number+gauge+delta", value=metas['Utilidad'], title={'text': "Utilidad Alcanzada ($)"},
+        delta={'reference': metas['Meta_Utilidad'], 'relative': False},
+        gauge={'axis': {'range': [None, max(metas['Meta_Utilidad'], metas['Utilidad']) * 1.2]},
+               'threshold': {'line': {'color': "red", 'width': 4}, 'thickness': 0.75,
+                             'value': metas['Meta_Utilidad']}}))
+    fig_horas_extra = go.Figure([
+        go.Bar(name='Meta Máxima', x=['Horas Extras'], y=[metas['Meta_Horas_Extra']], marker_color='green'),
+        go.Bar(name='Real Usado', x=['Horas Extras'], y=[metas['Horas_Extra']], marker_color='red'),
+    ])
+    fig_horas_extra.update_layout(title="Uso de Horas Extras (Minutos)", yaxis_title="Minutos")
+
+    indicadores = {
+        'Cumplimiento Utilidad %': f"{metas['Cumplimiento_Utilidad_%']:.1f}%",
+        'Cumplimiento Horas Extra %': f"{metas['Cumplimiento_Horas_Extra_%']:.1f}%",
+        'Puntuación Ponderada %': f"{metas['Puntuacion_Ponderada_%']:.1f}%",
+    }
+    return "🏁 Programación por Metas", indicadores, [fig_utilidad, fig_horas_extra], {
+        'metas': pd.DataFrame([metas]),
+    }
+
+
+PAGINAS = {
+    'resumen': pagina_resumen,
+    'productos': pagina_producto,
+    'demanda': pagina_demanda,
+    'insumos': pagina_insumo,
+    'procesos': pagina_proceso,
+    'requerimientos': pagina_requerimientos,
+    'costos': pagina_costos,
+    'modelo': pagina_modelo,
+    'simulaciones': pagina_simulaciones,
+    'metas': pagina_metas,
+}
+
+
+# Todas las (sección, selección) del libro; las secciones sin datos no generan páginas
+def tareas(data, tensores, cubo_agregados):
+    lista = [('resumen', None)]
+    if cubo_agregados is not None:
+        lista += [('productos', (id_producto, año)) for id_producto in cubo_agregados['productos']
+                  for año in cubo.años_disponibles(cubo_agregados, id_producto)]
+        lista += [('demanda', id_producto) for id_producto in tensores['productos']]
+        lista += [('costos', año) for año in cubo.años_disponibles(cubo_agregados)]
+    if not data['DAT_KM_MATRIX'].empty:
+        lista += [('insumos', id_insumo) for id_insumo in tensores['insumos']]
+    if not data['DAT_PJM_MATRIX'].empty:
+        lista += [('procesos', id_proceso) for id_proceso in tensores['procesos']]
+    if not data['RES_PRODUCCION'].empty:
+        lista += [('requerimientos', None), ('modelo', None), ('simulaciones', None), ('metas', None)]
+    return lista
+
+
+def ruta_pagina(seccion, seleccion):
+    if seleccion is None:
+        return f"{seccion}.html"
+    partes = seleccion if isinstance(seleccion, tuple) else (seleccion,)
+    return os.path.join(seccion, "_".join(str(p) for p in partes) + ".html")
+
+
+def _html_pagina(titulo, indicadores, figuras, tablas, raiz):
+    bloques = [f"<p><a href='{raiz}index.html'>← Índice</a></p>", f"<h1>{html.escape(titulo)}</h1>"]
+    if indicadores:
+        bloques.append("<ul>" + "".join(f"<li><b>{html.escape(str(k))}:</b> {html.escape(str(v))}</li>"
+                                        for k, v in indicadores.items()) + "</ul>")
+    bloques += [figura.to_html(full_html=False, include_plotlyjs=False) for figura in figuras]
+    for nombre, tabla in tablas.items():
+        bloques.append(f"<h2>{html.escape(nombre)}</h2>")
+        bloques.append(tabla.to_html(index=False, float_format=lambda x: f"{x:,.2f}", border=0))
+    return (f"<!DOCTYPE html><html><head><meta charset='utf-8'><title>{html.escape(titulo)}</title>"
+            f"<script src='{raiz}plotly.min.js'></script></head><body>" + "\n".join(bloques) + "</body></html>")
+
+
+# Genera una página con sus tablas y devuelve (ruta, segundos); corre en los trabajadores
+def renderizar(tarea, salida, formatos=FORMATOS):
+    seccion, seleccion = tarea
+    inicio = time.perf_counter()
+    titulo, indicadores, figuras, tablas = PAGINAS[seccion](seleccion)
+    ruta = ruta_pagina(seccion, seleccion)
+    destino = os.path.join(salida, ruta)
+    os.makedirs(os.path.dirname(destino), exist_ok=True)
+    raiz = "../" * ruta.count(os.sep)
+    with open(destino, 'w', encoding='utf-8') as archivo:
+        archivo.write(_html_pagina(titulo, indicadores, figuras, tablas, raiz))
+    base = os.path.splitext(destino)[0]
+    for nombre, tabla in tablas.items():
+        if 'csv' in formatos:
+            tabla.to_csv(f"{base}__{nombre}.csv", index=False)
+        if 'parquet' in formatos:
+            tabla.to_parquet(f"{base}__{nombre}.parquet", index=False)
+    return ruta, titulo, time.perf_counter() - inicio
+
+
+def _indice(salida, paginas, huella):
+    secciones = {}
+    for ruta, titulo, _ in paginas:
+        secciones.setdefault(ruta.split(os.sep)[0].removesuffix('.html'), []).append((ruta, titulo))
+    bloques = [f"<h1>🏭 ICATEX - Reporte</h1><p>Dataset {huella}</p>"]
+    for seccion, enlaces in secciones.items():
+        bloques.append(f"<h2>{html.escape(seccion)}</h2><ul>" +
+                       "".join(f"<li><a href='{ruta.replace(os.sep, '/')}'>{html.escape(titulo)}</a></li>"
+                               for ruta, titulo in enlaces) + "</ul>")
+    with open(os.path.join(salida, 'index.html'), 'w', encoding='utf-8') as archivo:
+        archivo.write("<!DOCTYPE html><html><head><meta charset='utf-8'><title>ICATEX - Reporte</title>"
+                      "</head><body>" + "\n".join(bloques) + "</body></html>")
+
+
+# Carga el libro una vez, construye tensores y cubo, y reparte las páginas entre `procesos`
+# trabajadores (con procesos=1 todo corre en este proceso). Devuelve el manifiesto escrito.
+def generar_reporte(ruta_libro=RUTA_LIBRO, salida='reporte', procesos=None, formatos=FORMATOS, secciones=None,
+                    planta=None):
+    inicio = time.perf_counter()
+    data, avisos = cargar_datos(ruta_libro, planta)
+    tensores = motores.tensores(data['HUELLA'], data)
+    cubo_agregados = motores.cubo_agregados(data['HUELLA'], data) if not data['DAT_PM_MATRIX'].empty else None
+    lista = [t for t in tareas(data, tensores, cubo_agregados) if secciones is None or t[0] in secciones]
+
+    os.makedirs(salida, exist_ok=True)
+    # plotly.js se escribe una vez junto al reporte: las páginas funcionan sin conexión
+    with open(os.path.join(salida, 'plotly.min.js'), 'w', encoding='utf-8') as archivo:
+        archivo.write(get_plotlyjs())
+
+    procesos = procesos or os.cpu_count() or 1
+    if procesos == 1:
+        _iniciar_trabajador(data, tensores, cubo_agregados)
+        paginas = [renderizar(t, salida, formatos) for t in lista]
+    else:
+        with ProcessPoolExecutor(max_workers=procesos, initializer=_iniciar_trabajador,
+                                 initargs=(data, tensores, cubo_agregados)) as pool:
+            paginas = list(pool.map(renderizar, lista, [salida] * len(lista), [formatos] * len(lista),
+                                    chunksize=max(1, len(lista) // (procesos * 4))))
+    _indice(salida, paginas, data['HUELLA'])
+
+    manifiesto = {
+        'libro': ruta_libro,
+        'planta': data.get('PLANTA'),
+        'huella': data['HUELLA'],
+        'avisos': avisos,
+        'procesos': procesos,
+        'paginas': [{'ruta': ruta, 'titulo': titulo, 'segundos': round(segundos, 4)}
+                    for ruta, titulo, segundos in paginas],
+        'segundos': round(time.perf_counter() - inicio, 3),
+    }
+    with open(os.path.join(salida, 'manifiesto.json'), 'w', encoding='utf-8') as archivo:
+        json.dump(manifiesto, archivo, ensure_ascii=False, indent=2)
+    return manifiesto
+
+
+def main(argumentos=None):
+    parser = argparse.ArgumentParser(description="Genera el reporte estático del dashboard ICATEX")
+    parser.add_argument('--libro', default=RUTA_LIBRO, help="Libro de Excel de LINGO o base de icatex.almacen")
+    parser.add_argument('--planta', default=None, help="Planta a cargar de la base")
+    parser.add_argument('--salida', default='reporte', help="Directorio de salida")
+    parser.add_argument('--procesos', type=int, default=None, help="Procesos del pool (por defecto, uno por CPU)")
+    parser.add_argument('--formatos', nargs='*', default=FORMATOS, choices=FORMATOS,
+                        help="Formatos de las tablas además del HTML")
+    parser.add_argument('--secciones', nargs='*', default=None, choices=list(PAGINAS),
+                        help="Secciones a generar (por defecto, todas)")
+    opciones = parser.parse_args(argumentos)
+    manifiesto = generar_reporte(opciones.libro, opciones.salida, opciones.procesos,
+                                 opciones.formatos, opciones.secciones, opciones.planta)
+    for aviso in manifiesto['avisos']:
+        print(f"Aviso: {aviso}")
+    print(f"{len(manifiesto['paginas'])} páginas en {manifiesto['segundos']:.1f} s -> "
+          f"{os.path.join(opciones.salida, 'index.html')}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,75 @@
+import numpy as np
+import plotly.graph_objects as go
+
+# A partir de este número de puntos por traza se usa WebGL (Scattergl) en lugar de SVG
+UMBRAL_WEBGL = 1000
+
+# Puntos máximos que se envían al navegador por traza después de reducir
+PUNTOS_MAXIMOS = 2000
+
+METODOS = ['minmax', 'lttb']
+
+
+# Mínimo y máximo de cada tramo, en orden temporal: conserva picos y valles
+def _minmax(y, puntos):
+    n = len(y)
+    tramos = max((puntos - 2) // 2, 1)
+    inicio = (np.arange(tramos) * n) // tramos
+    tramo = np.repeat(np.arange(tramos), np.diff(np.append(inicio, n)))
+
+    def _primero(extremo):
+        posiciones = np.flatnonzero(y == extremo[tramo])
+        return posiciones[np.unique(tramo[posiciones], return_index=True)[1]]
+
+    indices = np.concatenate([[0, n - 1], _primero(np.minimum.reduceat(y, inicio)),
+                              _primero(np.maximum.reduceat(y, inicio))])
+    return np.unique(indices)
+
+
+# Largest-Triangle-Three-Buckets: en cada tramo elige el punto que forma el triángulo de
+# mayor área con el punto elegido antes y el promedio del tramo siguiente
+def _lttb(x, y, puntos):
+    n = len(y)
+    if puntos < 3:
+        return np.array([0, n - 1])
+    bordes = np.linspace(1, n - 1, puntos - 1).astype(int)
+    seleccion = [0]
+    a = 0
+    for k in range(puntos - 2):
+        inicio, fin = bordes[k], bordes[k + 1]
+        if k + 2 < len(bordes):
+            siguiente = slice(bordes[k + 1], bordes[k + 2])
+            mx, my = x[siguiente].mean(), y[siguiente].mean()
+        else:
+            mx, my = x[-1], y[-1]
+        area = np.abs((x[a] - mx) * (y[inicio:fin] - y[a]) - (x[a] - x[inicio:fin]) * (my - y[a]))
+        a = inicio + int(area.argmax())
+        seleccion.append(a)
+    seleccion.append(n - 1)
+    return np.array(seleccion)
+
+
+# Reduce una serie a lo sumo a `puntos` puntos dentro de `rango` (x mínimo, x máximo).
+# Al acotar el rango la misma cantidad de puntos cubre un tramo menor: más detalle.
+def reducir(x, y, puntos=PUNTOS_MAXIMOS, metodo='minmax', rango=None):
+    x = np.asarray(x)
+    y = np.asarray(y, dtype=float)
+    if rango is not None:
+        visibles = (x >= rango[0]) & (x <= rango[1])
+        x, y = x[visibles], y[visibles]
+    if len(y) <= puntos:
+        return x, y
+    if metodo == 'lttb':
+        posicion = x.astype(float) if np.issubdtype(x.dtype, np.number) else np.arange(len(x), dtype=float)
+        indices = _lttb(posicion, y, puntos)
+    else:
+        indices = _minmax(y, puntos)
+    return x[indices], y[indices]
+
+
+# Traza de una serie temporal lista para agregar a una figura: reducida en el servidor y
+# con WebGL cuando la serie original supera el umbral
+def traza_serie(x, y, puntos=PUNTOS_MAXIMOS, metodo='minmax', rango=None, umbral=UMBRAL_WEBGL, **kwargs):
+    x_reducida, y_reducida = reducir(x, y, puntos, metodo, rango)
+    tipo = go.Scattergl if len(np.asarray(y)) > umbral else go.Scatter
+    return tipo(x=x_reducida, y=y_reducida, mode=kwargs.pop('mode', 'lines'), **kwargs)
@@ -0,0 +1,324 @@
+import argparse
+import time
+from pathlib import Path
+
+import numpy as np
+import openpyxl
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from icatex.datos import AÑO_INICIAL, RUTA_LIBRO, cargar_datos
+from icatex.pronostico_demanda import MESES
+from icatex.tensores import construir_tensores
+
+# Generador de datasets sintéticos con el esquema del libro de LINGO (SET_*, DAT_*,
+# RESULTADOS, RES_HORAS_EXTRA) a cualquier escala, para pruebas de carga.
+#
+#   python -m icatex.sintetico grande.xlsx --productos 2000 --periodos 240 --insumos 300 --procesos 40
+#   python -m icatex.sintetico grande/ --formato parquet --productos 2000 --periodos 240
+#
+# Las distribuciones salen del libro real (calibrar): cada producto sintético toma como
+# arquetipo un producto real (nivel, estacionalidad, crecimiento, amplitud de la demanda,
+# precio, relación costo/precio, categoría y línea) con ruido; cada insumo y proceso toma
+# una columna real (densidad y valores de PI/PP, utilización y costo de horas extra).
+# Con la misma semilla y la misma calibración los datos generados son idénticos.
+# Las filas se generan y escriben por bloques de productos: el libro nunca está entero en memoria.
+
+# Productos por bloque. Fija la secuencia aleatoria de cada bloque: cambiarlo cambia los datos
+BLOQUE = 256
+
+ESCALAS = {
+    'pequeña': {'productos': 20, 'periodos': 48, 'insumos': 15, 'procesos': 5},
+    'mediana': {'productos': 200, 'periodos': 120, 'insumos': 60, 'procesos': 15},
+    'grande': {'productos': 2000, 'periodos': 240, 'insumos': 300, 'procesos': 40},
+}
+
+
+# Parámetros del generador medidos sobre un dataset real
+def calibrar(data):
+    t = construir_tensores(data)
+    fijos = data['DAT_PRODUCTOS_FIJOS']
+    mes = (t['periodos'] - 1) % 12
+    año = (t['periodos'] - 1) // 12
+    años = np.unique(año)
+
+    def anual(x):
+        return np.stack([x[:, año == a].mean(axis=1) for a in años], axis=1)
+
+    def crecimiento(x):
+        medias = anual(x)
+        return np.log(medias[:, 1:] / medias[:, :-1]).mean(axis=1) if len(años) > 1 else np.zeros(len(x))
+
+    demanda = t['demanda_min']
+    relativa = demanda / anual(demanda)[:, np.searchsorted(años, año)]
+    estacion = np.stack([relativa[:, mes == m].mean(axis=1) for m in range(12)], axis=1)
+    precio = t['precio']
+    tendencia_precio = precio / np.exp(crecimiento(precio)[:, None] * (t['periodos'] - 1) / 12)
+    rango = t['demanda_max'] - demanda
+    with np.errstate(divide='ignore', invalid='ignore'):
+        en_maximo = np.where(rango > 0, t['ventas'] >= t['demanda_max'], False).mean(axis=1)
+    uso = np.asarray(t['PP'].T @ t['produccion'])
+    PI, PP = t['PI'].toarray(), t['PP'].toarray()
+    km = data['DAT_KM_MATRIX']
+
+    return {
+        # Por producto real (arquetipos)
+        'nivel': demanda.mean(axis=1),
+        'estacion': estacion,
+        'crecimiento': crecimiento(demanda),
+        'ruido': float(np.log(relativa / estacion[:, mes]).std()),
+        'amplitud': (t['demanda_max'] / np.maximum(demanda, 1)).mean(axis=1),
+        'precio': tendencia_precio.mean(axis=1),
+        'crecimiento_precio': crecimiento(precio),
+        'ruido_precio': float(np.log(tendencia_precio / tendencia_precio.mean(axis=1, keepdims=True)).std()),
+        'relacion_costo': (t['costo'] / precio).mean(axis=1),
+        'ruido_costo': float((t['costo'] / precio).std(axis=1).mean()),
+        'ventas_en_maximo': en_maximo,
+        'inventario_frecuencia': float((t['inventario'] > 0).mean()),
+        'inventario_relativo': float(np.median(t['inventario'][t['inventario'] > 0]
+                                               / np.maximum(t['ventas'][t['inventario'] > 0], 1)))
+        if (t['inventario'] > 0).any() else 0.0,
+        'categoria': fijos['Categoria'].to_numpy(),
+        'linea': fijos['Linea'].to_numpy(),
+        'stock_inicial': t['stock_inicial'],
+        'costo_almacen': t['costo_almacen'],
+        # Por insumo y proceso real: densidad y valores no nulos de cada columna
+        'pi_densidad': (PI > 0).mean(axis=0),
+        'pi_valores': [PI[PI[:, i] > 0, i] for i in range(PI.shape[1])],
+        'pp_densidad': (PP > 0).mean(axis=0),
+        'pp_valores': [PP[PP[:, j] > 0, j] for j in range(PP.shape[1])],
+        'utilizacion': uso.mean(axis=1) / np.maximum(t['capacidad'].mean(axis=1), 1),
+        'costo_he': t['costo_he'].mean(axis=1),
+        'stock_disponible': float(km['StockDisponible'].mode().iloc[0]) if not km.empty else 999999.0,
+        'uso_minimo': float(km['UsoMinimo'].mode().iloc[0]) if not km.empty else 0.0,
+    }
+
+
+def _ids(prefijo, n):
+    return np.array([f"{prefijo}{k:0{max(3, len(str(n)))}d}" for k in range(1, n + 1)])
+
+
+# Columna real que imita cada insumo/proceso sintético: las primeras repiten las reales en
+# orden y las demás se sortean
+def _arquetipos(rng, n, reales):
+    return np.concatenate([np.arange(min(n, reales)), rng.integers(reales, size=max(n - reales, 0))])
+
+
+# Matriz [producto × columna] con la densidad y los valores de la columna arquetipo. Con
+# más columnas que las reales los valores se reparten (× reales / columnas) para que el
+# consumo total de cada producto (minutos, material) siga siendo el del libro real.
+def _consumos(rng, filas, arquetipos, densidad, valores):
+    matriz = np.zeros((filas, len(arquetipos)))
+    for k, a in enumerate(arquetipos):
+        usa = rng.random(filas) < densidad[a]
+        if usa.any() and len(valores[a]):
+            matriz[usa, k] = rng.choice(valores[a], size=usa.sum())
+    return np.round(matriz * min(1.0, len(densidad) / max(len(arquetipos), 1)), 4)
+
+
+# Bloque de productos [inicio, fin): catálogo, consumos y series [producto × periodo]
+def _bloque(c, inicio, fin, periodos, col_insumos, col_procesos, semilla):
+    rng = np.random.default_rng([semilla, 1, inicio // BLOQUE])
+    b = fin - inicio
+    a = rng.integers(len(c['nivel']), size=b)
+    t = np.arange(periodos)
+    mes = t % 12
+
+    nivel = c['nivel'][a] * np.exp(rng.normal(0, 0.25, b))
+    estacion = c['estacion'][a] * np.exp(rng.normal(0, c['ruido'], (b, 12)))
+    crecimiento = c['crecimiento'][a] + rng.normal(0, 0.005, b)
+    demanda_min = np.rint(nivel[:, None] * estacion[:, mes] * np.exp(crecimiento[:, None] * t / 12
+                                                                      + rng.normal(0, c['ruido'], (b, periodos))))
+    demanda_min = np.maximum(demanda_min, 1)
+    demanda_max = np.rint(demanda_min * c['amplitud'][a][:, None] * np.exp(rng.normal(0, 0.05, (b, periodos))))
+    demanda_max = np.maximum(demanda_max, demanda_min)
+
+    precio = (c['precio'][a] * np.exp(rng.normal(0, 0.05, b)))[:, None] \
+        * np.exp(c['crecimiento_precio'][a][:, None] * t / 12 + rng.normal(0, c['ruido_precio'], (b, periodos)))
+    costo = precio * (c['relacion_costo'][a][:, None] + rng.normal(0, c['ruido_costo'], (b, periodos)))
+
+    # Plan: vende el mínimo o el máximo de la demanda como el plan real y a veces deja
+    # inventario; el balance cierra con el stock inicial y la producción nunca es negativa
+    ventas = np.where(rng.random((b, periodos)) < c['ventas_en_maximo'][a][:, None], demanda_max, demanda_min)
+    objetivo = np.where(rng.random((b, periodos)) < c['inventario_frecuencia'],
+                        np.rint(ventas * c['inventario_relativo']), 0)
+    stock_inicial = c['stock_inicial'][a]
+    produccion = np.empty((b, periodos))
+    inventario = np.empty((b, periodos))
+    anterior = stock_inicial
+    for k in range(periodos):
+        produccion[:, k] = np.maximum(ventas[:, k] + objetivo[:, k] - anterior, 0)
+        inventario[:, k] = anterior + produccion[:, k] - ventas[:, k]
+        anterior = inventario[:, k]
+
+    PI = _consumos(rng, b, col_insumos, c['pi_densidad'], c['pi_valores'])
+    PP = _consumos(rng, b, col_procesos, c['pp_densidad'], c['pp_valores'])
+    return {
+        'categoria': c['categoria'][a], 'linea': c['linea'][a],
+        'stock_inicial': stock_inicial, 'costo_almacen': c['costo_almacen'][a],
+        'PI': PI, 'PP': PP,
+        'demanda_min': demanda_min, 'demanda_max': demanda_max,
+        'precio': np.round(precio, 2), 'costo': np.round(costo, 2),
+        'produccion': produccion, 'ventas': ventas, 'inventario': inventario,
+    }
+
+
+# Tablas del dataset en trozos (hoja, DataFrame), en un orden que se puede escribir en
+# streaming: conjuntos, luego por bloque de productos su catálogo, PI/PP, PM y resultados,
+# y al final insumos y procesos (la capacidad sale del uso acumulado de todos los bloques)
+def tablas(calibracion, productos=20, periodos=48, insumos=15, procesos=5, semilla=0):
+    rng = np.random.default_rng([semilla, 0])
+    id_productos, id_insumos, id_procesos = _ids('P', productos), _ids('I', insumos), _ids('PR', procesos)
+    col_insumos = _arquetipos(rng, insumos, len(calibracion['pi_densidad']))
+    col_procesos = _arquetipos(rng, procesos, len(calibracion['pp_densidad']))
+    indices = np.arange(1, periodos + 1)
+    meses = np.array(MESES)[(indices - 1) % 12]
+    años = AÑO_INICIAL + (indices - 1) // 12
+
+    yield 'SET_PRODUCTOS', pd.DataFrame({'ID_Producto': id_productos})
+    yield 'SET_MESES', pd.DataFrame({'Mes': [f"{m}-{a}" for m, a in zip(meses, años)]})
+    yield 'SET_INSUMOS', pd.DataFrame({'ID_Insumo': id_insumos})
+    yield 'SET_PROCESOS', pd.DataFrame({'ID_Proceso': id_procesos})
+
+    uso = np.zeros((procesos, periodos))
+    for inicio in range(0, productos, BLOQUE):
+        fin = min(inicio + BLOQUE, productos)
+        ids = id_productos[inicio:fin]
+        b = _bloque(calibracion, inicio, fin, periodos, col_insumos, col_procesos, semilla)
+        uso += b['PP'].T @ b['produccion']
+
+        yield 'DAT_PI_MATRIX', pd.concat([pd.DataFrame({'ID_Producto': ids}),
+                                          pd.DataFrame(b['PI'], columns=id_insumos)], axis=1)
+        yield 'DAT_PP_MATRIX', pd.concat([pd.DataFrame({'ID_Producto': ids}),
+                                          pd.DataFrame(b['PP'], columns=id_procesos)], axis=1)
+        yield 'DAT_PRODUCTOS_FIJOS', pd.DataFrame({
+            'ID_Producto': ids,
+            'Nombre_Producto': [f"{l} {c} {p}" for l, c, p in zip(b['linea'], b['categoria'], ids)],
+            'Categoria': b['categoria'],
+            'Linea': b['linea'],
+            'TiempoProd_Total(min)': b['PP'].sum(axis=1),
+            'StockInicial': b['stock_inicial'],
+            'CostoAlmacen': b['costo_almacen'],
+        })
+        largo = {'ID_Producto': np.repeat(ids, periodos), 'Periodo_Index': np.tile(indices, len(ids))}
+        yield 'DAT_PM_MATRIX', pd.DataFrame(dict(
+            largo, Mes=np.tile(meses, len(ids)),
+            DemandaMinima=b['demanda_min'].ravel(), DemandaMaxima=b['demanda_max'].ravel(),
+            PrecioVenta=b['precio'].ravel(), CostoInsumo=b['costo'].ravel()))
+        yield 'RESULTADOS', pd.DataFrame(dict(
+            largo, Produccion=b['produccion'].ravel(), Ventas=b['ventas'].ravel(),
+            Inventario=b['inventario'].ravel()))
+
+    yield 'DAT_KM_MATRIX', pd.DataFrame({
+        'ID_Insumo': np.repeat(id_insumos, periodos), 'Periodo_Index': np.tile(indices, insumos),
+        'StockDisponible': calibracion['stock_disponible'], 'UsoMinimo': calibracion['uso_minimo']})
+
+    # Capacidad constante por proceso con la utilización media del proceso arquetipo
+    capacidad = np.rint(uso.mean(axis=1) / np.maximum(calibracion['utilizacion'][col_procesos], 1e-9))
+    horas_extra = np.maximum(uso - capacidad[:, None], 0)
+    largo = {'ID_Proceso': np.repeat(id_procesos, periodos), 'Periodo_Index': np.tile(indices, procesos)}
+    yield 'DAT_PJM_MATRIX', pd.DataFrame(dict(
+        largo, Año=np.tile(años, procesos), CapacidadMinutos=np.repeat(capacidad, periodos),
+        CostoHoraExtra=np.repeat(calibracion['costo_he'][col_procesos], periodos)))
+    yield 'RES_H_EXTRAS', pd.DataFrame(dict(largo, HorasExtrasMinutos=np.rint(horas_extra).ravel()))
+
+
+# Hojas del libro en el orden del libro de LINGO; los resultados van sin identificadores
+HOJAS_LIBRO = [
+    'SET_PRODUCTOS', 'SET_MESES', 'SET_INSUMOS', 'SET_PROCESOS', 'DAT_PI_MATRIX', 'DAT_PP_MATRIX',
+    'DAT_PM_MATRIX', 'DAT_PJM_MATRIX', 'DAT_KM_MATRIX', 'DAT_PRODUCTOS_FIJOS', 'RESULTADOS', 'RES_HORAS_EXTRA'
+]
+_COLUMNAS_LIBRO = {
+    'RESULTADOS': (['Produccion', 'Ventas', 'Inventario'], None),
+    'RES_H_EXTRAS': (['HorasExtrasMinutos'], ['Tiempo Extra']),
+}
+
+
+# Filas con tipos de Python (openpyxl no acepta escalares de numpy)
+def _filas(df):
+    return zip(*(df[columna].tolist() for columna in df.columns))
+
+
+# Libro de Excel en modo solo escritura: cada trozo se vuelca a su hoja al generarse
+def escribir_libro(ruta, trozos):
+    libro = openpyxl.Workbook(write_only=True)
+    hojas = {nombre: libro.create_sheet(nombre) for nombre in HOJAS_LIBRO}
+    con_encabezado = set()
+    for hoja, df in trozos:
+        destino = 'RES_HORAS_EXTRA' if hoja == 'RES_H_EXTRAS' else hoja
+        if hoja in _COLUMNAS_LIBRO:
+            columnas, encabezado = _COLUMNAS_LIBRO[hoja]
+            df = df[columnas]
+            if encabezado:
+                df = df.set_axis(encabezado, axis=1)
+        if destino not in con_encabezado:
+            hojas[destino].append(list(df.columns))
+            con_encabezado.add(destino)
+        for fila in _filas(df):
+            hojas[destino].append(fila)
+    libro.save(ruta)
+
+
+# Directorio columnar (un <HOJA>.parquet por hoja, resultados en formato largo) que
+# cargar_datos lee directamente; cada trozo es un row group
+def escribir_columnar(ruta, trozos):
+    ruta = Path(ruta)
+    ruta.mkdir(parents=True, exist_ok=True)
+    escritores = {}
+    try:
+        for hoja, df in trozos:
+            partes = {hoja: df}
+            if hoja == 'RESULTADOS':
+                claves = ['ID_Producto', 'Periodo_Index']
+                partes = {destino: df[claves + [columna]] for destino, columna in
+                          [('RES_PRODUCCION', 'Produccion'), ('RES_VENTAS', 'Ventas'),
+                           ('RES_INVENTARIO', 'Inventario')]}
+            for destino, parte in partes.items():
+                tabla = pa.Table.from_pandas(parte, preserve_index=False)
+                if destino not in escritores:
+                    escritores[destino] = pq.ParquetWriter(ruta / f"{destino}.parquet", tabla.schema)
+                escritores[destino].write_table(tabla)
+    finally:
+        for escritor in escritores.values():
+            escritor.close()
+
+
+# Genera y escribe un dataset sintético calibrado con el libro `referencia`
+def generar(ruta, productos=20, periodos=48, insumos=15, procesos=5, semilla=0, formato='xlsx',
+            referencia=RUTA_LIBRO):
+    data, avisos = cargar_datos(referencia)
+    if data['DAT_PM_MATRIX'].empty or data['RES_PRODUCCION'].empty:
+        raise ValueError(f"No se puede calibrar con {referencia}: {'; '.join(avisos)}")
+    trozos = tablas(calibrar(data), productos, periodos, insumos, procesos, semilla)
+    if formato == 'parquet':
+        escribir_columnar(ruta, trozos)
+    else:
+        escribir_libro(ruta, trozos)
+    return ruta
+
+
+def main(argumentos=None):
+    parser = argparse.ArgumentParser(description="Genera datasets sintéticos con el esquema de ICATEX")
+    parser.add_argument('salida', help="Libro .xlsx o directorio (con --formato parquet)")
+    parser.add_argument('--escala', choices=list(ESCALAS), default=None,
+                        help="Dimensiones predefinidas (las opciones sueltas tienen prioridad)")
+    for dimension in ('productos', 'periodos', 'insumos', 'procesos'):
+        parser.add_argument(f'--{dimension}', type=int, default=None)
+    parser.add_argument('--semilla', type=int, default=0)
+    parser.add_argument('--formato', choices=['xlsx', 'parquet'], default='xlsx')
+    parser.add_argument('--referencia', default=RUTA_LIBRO, help="Libro real del que se calibran las distribuciones")
+    opciones = parser.parse_args(argumentos)
+
+    dimensiones = dict(ESCALAS[opciones.escala or 'pequeña'])
+    for dimension in dimensiones:
+        if getattr(opciones, dimension) is not None:
+            dimensiones[dimension] = getattr(opciones, dimension)
+    inicio = time.perf_counter()
+    generar(opciones.salida, semilla=opciones.semilla, formato=opciones.formato,
+            referencia=opciones.referencia, **dimensiones)
+    print(f"{opciones.salida}: {dimensiones} en {time.perf_counter() - inicio:.1f} s")
+
+
+if __name__ == '__main__':
+    main()
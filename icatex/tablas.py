@@ -0,0 +1,77 @@
+import warnings
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+
+from icatex.caches import CacheLRU
+
+# Posiciones de las filas filtradas y ordenadas por (huella, vista, columna, ascendente, filtro)
+_CACHE_ORDENES = CacheLRU('ordenes_tabla', max_entradas=256, max_bytes=64 * 1024 * 1024)
+
+# Páginas ya serializadas en Arrow IPC por (huella, vista, orden, filtro, página, tamaño)
+CACHE_PAGINAS = CacheLRU('paginas_tabla', max_entradas=1024, max_bytes=32 * 1024 * 1024)
+
+# Agregados por columna de las filas filtradas por (huella, vista, filtro)
+_CACHE_AGREGADOS = CacheLRU('agregados_tabla', max_entradas=256)
+
+
+# Filas cuyo texto en alguna columna no numérica contiene `filtro` (sin distinguir mayúsculas)
+def filas_filtradas(df, filtro):
+    if not filtro:
+        return np.ones(len(df), dtype=bool)
+    mascara = np.zeros(len(df), dtype=bool)
+    for columna in df.columns:
+        if not pd.api.types.is_numeric_dtype(df[columna]):
+            mascara |= df[columna].astype(str).str.contains(filtro, case=False, regex=False).to_numpy()
+    return mascara
+
+
+# Posiciones de las filas visibles en el orden pedido; se calcula una vez por combinación
+def orden_filas(huella, vista, df, columna=None, ascendente=True, filtro=''):
+    def calcular():
+        posiciones = np.flatnonzero(filas_filtradas(df, filtro))
+        if columna is None:
+            return posiciones
+        valores = df[columna].iloc[posiciones].reset_index(drop=True)
+        orden = valores.sort_values(ascending=ascendente, kind='stable', na_position='last').index
+        return posiciones[orden.to_numpy()]
+
+    return _CACHE_ORDENES.obtener_o_calcular((huella, vista, columna, ascendente, filtro),
+                                             calcular, lambda p: p.nbytes)
+
+
+# Página `pagina` (desde 0) serializada como flujo Arrow IPC
+def pagina_arrow(huella, vista, df, columna=None, ascendente=True, filtro='', pagina=0, filas_por_pagina=25):
+    def calcular():
+        posiciones = orden_filas(huella, vista, df, columna, ascendente, filtro)
+        bloque = posiciones[pagina * filas_por_pagina:(pagina + 1) * filas_por_pagina]
+        tabla = pa.Table.from_pandas(df.iloc[bloque], preserve_index=False)
+        salida = pa.BufferOutputStream()
+        with pa.ipc.new_stream(salida, tabla.schema) as escritor:
+            escritor.write_table(tabla)
+        return salida.getvalue().to_pybytes()
+
+    clave = (huella, vista, columna, ascendente, filtro, pagina, filas_por_pagina)
+    return CACHE_PAGINAS.obtener_o_calcular(clave, calcular, len)
+
+
+def leer_pagina(serializada):
+    return pa.ipc.open_stream(serializada).read_all()
+
+
+# Suma, promedio, mínimo y máximo de cada columna numérica sobre las filas filtradas
+def agregados_columnas(huella, vista, df, filtro=''):
+    def calcular():
+        numericas = df.select_dtypes('number')
+        valores = numericas.to_numpy(dtype=float)[filas_filtradas(df, filtro)]
+        if len(valores) == 0:
+            return pd.DataFrame(index=['Suma', 'Promedio', 'Mínimo', 'Máximo'], columns=numericas.columns)
+        # Las columnas sin ningún valor quedan en NaN
+        with warnings.catch_warnings():
+            warnings.simplefilter('ignore', RuntimeWarning)
+            return pd.DataFrame([np.nansum(valores, axis=0), np.nanmean(valores, axis=0),
+                                 np.nanmin(valores, axis=0), np.nanmax(valores, axis=0)],
+                                index=['Suma', 'Promedio', 'Mínimo', 'Máximo'], columns=numericas.columns)
+
+    return _CACHE_AGREGADOS.obtener_o_calcular((huella, vista, filtro), calcular)
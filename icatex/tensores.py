@@ -0,0 +1,151 @@
+import hashlib
+import threading
+
+import numpy as np
+import pandas as pd
+from scipy import sparse
+
+
+# Huella estable del conjunto de datos cargado, usada como clave de caché
+def huella_dataset(data):
+    h = hashlib.sha1()
+    for nombre in sorted(data):
+        df = data[nombre]
+        if not isinstance(df, pd.DataFrame):
+            continue
+        h.update(nombre.encode())
+        h.update(repr(list(df.columns)).encode())
+        if not df.empty:
+            h.update(pd.util.hash_pandas_object(df, index=False).values.tobytes())
+    return h.hexdigest()[:16]
+
+
+# Posición de cada fila de `columna` en `ids` (-1 si no está). Con identificadores
+# categóricos (icatex.esquema) se resuelven solo las categorías y se indexa con los códigos.
+def posiciones_ids(columna, ids):
+    if isinstance(columna.dtype, pd.CategoricalDtype):
+        posiciones = np.append(pd.Index(ids).get_indexer(columna.cat.categories), -1)
+        return posiciones[columna.cat.codes.to_numpy()]
+    return pd.Index(ids).get_indexer(columna)
+
+
+# Convierte un DataFrame en formato largo (entidad, periodo, valor) en una matriz densa
+# [entidad × periodo] usando códigos de índice en lugar de pivot_table
+def _matriz(df, col_id, col_valor, ids, periodos):
+    matriz = np.zeros((len(ids), len(periodos)))
+    if df.empty or col_valor not in df.columns:
+        return matriz
+    filas = posiciones_ids(df[col_id], ids)
+    cols = pd.Index(periodos).get_indexer(df['Periodo_Index'])
+    validos = (filas >= 0) & (cols >= 0)
+    matriz[filas[validos], cols[validos]] = df[col_valor].to_numpy(dtype=float)[validos]
+    return matriz
+
+
+# Convierte una matriz ancha (ID_Producto + una columna por insumo/proceso) en una matriz dispersa
+def _matriz_dispersa(df, productos, columnas):
+    if df.empty or 'ID_Producto' not in df.columns:
+        return sparse.csr_matrix((len(productos), len(columnas)))
+    ancha = df.set_index('ID_Producto').reindex(index=productos, columns=columnas).fillna(0)
+    return sparse.csr_matrix(ancha.to_numpy(dtype=float))
+
+
+# Series [entidad × periodo] de los tensores: hoja, columna de la entidad, columna del
+# valor y eje de entidades
+SERIES = {
+    'demanda_min': ('DAT_PM_MATRIX', 'ID_Producto', 'DemandaMinima', 'productos'),
+    'demanda_max': ('DAT_PM_MATRIX', 'ID_Producto', 'DemandaMaxima', 'productos'),
+    'precio': ('DAT_PM_MATRIX', 'ID_Producto', 'PrecioVenta', 'productos'),
+    'costo': ('DAT_PM_MATRIX', 'ID_Producto', 'CostoInsumo', 'productos'),
+    'produccion': ('RES_PRODUCCION', 'ID_Producto', 'Produccion', 'productos'),
+    'ventas': ('RES_VENTAS', 'ID_Producto', 'Ventas', 'productos'),
+    'inventario': ('RES_INVENTARIO', 'ID_Producto', 'Inventario', 'productos'),
+    'stock': ('DAT_KM_MATRIX', 'ID_Insumo', 'StockDisponible', 'insumos'),
+    'uso_minimo': ('DAT_KM_MATRIX', 'ID_Insumo', 'UsoMinimo', 'insumos'),
+    'capacidad': ('DAT_PJM_MATRIX', 'ID_Proceso', 'CapacidadMinutos', 'procesos'),
+    'costo_he': ('DAT_PJM_MATRIX', 'ID_Proceso', 'CostoHoraExtra', 'procesos'),
+    'horas_extra': ('RES_H_EXTRAS', 'ID_Proceso', 'HorasExtrasMinutos', 'procesos'),
+}
+
+
+# Identificadores de un conjunto; vacíos si la hoja no cargó (libro ausente u hoja ilegible)
+def _ids(df, columna):
+    return df[columna].to_numpy() if columna in df.columns else np.array([], dtype=object)
+
+
+# Arreglos [producto × periodo], [insumo × periodo] y [proceso × periodo] con ejes alineados,
+# más las matrices de consumo PI (producto × insumo) y PP (producto × proceso)
+def construir_tensores(data):
+    fijos = data['DAT_PRODUCTOS_FIJOS']
+    if 'ID_Producto' in fijos.columns and not fijos.empty:
+        productos = fijos['ID_Producto'].to_numpy()
+    else:
+        productos = _ids(data['SET_PRODUCTOS'], 'ID_Producto')
+    insumos = _ids(data['SET_INSUMOS'], 'ID_Insumo')
+    procesos = _ids(data['SET_PROCESOS'], 'ID_Proceso')
+
+    periodos = set()
+    for hoja in ['DAT_PM_MATRIX', 'DAT_KM_MATRIX', 'DAT_PJM_MATRIX', 'RES_PRODUCCION']:
+        if 'Periodo_Index' in data[hoja].columns:
+            periodos.update(data[hoja]['Periodo_Index'].unique().tolist())
+    periodos = np.array(sorted(periodos), dtype=int)
+
+    tensores = {
+        'productos': productos,
+        'insumos': insumos,
+        'procesos': procesos,
+        'periodos': periodos,
+        'PI': _matriz_dispersa(data['DAT_PI_MATRIX'], productos, insumos),
+        'PP': _matriz_dispersa(data['DAT_PP_MATRIX'], productos, procesos),
+    }
+    for clave, (hoja, col_id, col_valor, eje) in SERIES.items():
+        tensores[clave] = _matriz(data[hoja], col_id, col_valor, tensores[eje], periodos)
+
+    if 'ID_Producto' in fijos.columns and not fijos.empty:
+        tensores['costo_almacen'] = fijos['CostoAlmacen'].to_numpy(dtype=float)
+        tensores['stock_inicial'] = fijos['StockInicial'].to_numpy(dtype=float)
+    else:
+        tensores['costo_almacen'] = np.zeros(len(productos))
+        tensores['stock_inicial'] = np.zeros(len(productos))
+
+    return tensores
+
+
+_LOCK_RESERVA = threading.Lock()
+
+
+# Tensores con los periodos de `delta` (hojas con filas de periodos nuevos y consecutivos)
+# agregados al final. Las series viven en una reserva con capacidad de sobra: agregar un
+# periodo escribe solo sus columnas y las versiones anteriores siguen viendo su propio tramo.
+# Solo la última versión extiende la reserva; extender otra versión la copia primero.
+def extender_tensores(tensores, delta):
+    periodos = tensores['periodos']
+    nuevos = set()
+    for hoja, *_ in SERIES.values():
+        if hoja in delta and not delta[hoja].empty:
+            nuevos.update(delta[hoja]['Periodo_Index'].unique().tolist())
+    nuevos = np.array(sorted(nuevos), dtype=int)
+    if len(nuevos) == 0:
+        return tensores
+    ultimo = periodos[-1] if len(periodos) else 0
+    if not np.array_equal(nuevos, ultimo + np.arange(1, len(nuevos) + 1)):
+        raise ValueError(f"Los periodos {nuevos.tolist()} no continúan el periodo {ultimo}")
+
+    T, k = len(periodos), len(nuevos)
+    with _LOCK_RESERVA:
+        reserva = tensores.get('reserva')
+        if reserva is None or reserva['longitud'] != T or reserva['periodos'].shape[0] < T + k:
+            capacidad = max(2 * T, T + k)
+            reserva = {'longitud': T, 'periodos': np.zeros(capacidad, dtype=int)}
+            reserva['periodos'][:T] = periodos
+            for clave in SERIES:
+                reserva[clave] = np.zeros((tensores[clave].shape[0], capacidad))
+                reserva[clave][:, :T] = tensores[clave]
+        reserva['periodos'][T:T + k] = nuevos
+        extendidos = dict(tensores, reserva=reserva, periodos=reserva['periodos'][:T + k])
+        for clave, (hoja, col_id, col_valor, eje) in SERIES.items():
+            reserva[clave][:, T:T + k] = _matriz(delta.get(hoja, pd.DataFrame()), col_id, col_valor,
+                                                 tensores[eje], nuevos)
+            extendidos[clave] = reserva[clave][:, :T + k]
+        reserva['longitud'] = T + k
+    return extendidos
@@ -0,0 +1,45 @@
+import importlib
+import os
+import sys
+import time
+
+# Secciones del dashboard: etiqueta del menú -> módulo de `secciones`. Cada módulo se
+# importa la primera vez que se visita, con sus dependencias pesadas (plotly, motores).
+SECCIONES = {
+    "📈 Resumen General": 'resumen',
+    "👕 Productos": 'productos',
+    "📦 Insumos": 'insumos',
+    "🧾 Requerimientos (MRP)": 'requerimientos',
+    "⚙️ Procesos": 'procesos',
+    "📊 Demanda y Mercado": 'demanda',
+    "💰 Costos y Rentabilidad": 'costos',
+    "🔍 Modelo de Optimización": 'modelo',
+    "🎯 Simulaciones": 'simulaciones',
+    "🏁 Programación por Metas": 'metas',
+}
+
+# Con varias plantas (ICATEX_PLANTAS) se agrega la comparación entre ellas
+if os.environ.get('ICATEX_PLANTAS'):
+    SECCIONES["🏭 Comparación de Plantas"] = 'plantas'
+
+# Perfil de arranque del proceso: segundos de importación de cada módulo (incluye las
+# dependencias que importó por primera vez) y tiempo hasta la primera pintura
+PERFIL_ARRANQUE = {'importaciones': {}, 'primera_pintura': None}
+
+
+# import_module también cuando el módulo ya está en sys.modules: si el calentamiento lo
+# está importando en otro hilo, espera a que termine en lugar de devolverlo a medias
+def importar(nombre):
+    completo = f'secciones.{nombre}'
+    if completo in sys.modules:
+        return importlib.import_module(completo)
+    inicio = time.perf_counter()
+    modulo = importlib.import_module(completo)
+    PERFIL_ARRANQUE['importaciones'].setdefault(completo, time.perf_counter() - inicio)
+    return modulo
+
+
+# Registra, solo la primera vez en el proceso, cuánto tardó el script en pintar el menú
+def registrar_primera_pintura(inicio_script):
+    if PERFIL_ARRANQUE['primera_pintura'] is None:
+        PERFIL_ARRANQUE['primera_pintura'] = time.perf_counter() - inicio_script
@@ -0,0 +1,442 @@
+import os
+import threading
+from functools import partial, wraps
+
+import numpy as np
+import pandas as pd
+import streamlit as st
+
+from icatex import calentamiento, comparacion, motores, series, tablas
+from icatex import almacen, escenarios, filtros, incremental, memoria, perfil, plantas
+from icatex.datos import EXTENSIONES_ALMACEN, RUTA_LIBRO, cargar_datos
+from icatex.figuras import figura_cacheada
+from icatex.pronostico_demanda import MESES
+from streamlit.runtime import Runtime
+from streamlit.runtime.caching import get_data_cache_stats_provider
+from streamlit.runtime.scriptrunner import get_script_run_ctx
+
+from secciones import SECCIONES, importar
+
+# Piezas compartidas por las secciones: datos y motores cacheados, mapas de nombres y
+# componentes de interfaz. Las secciones lo importan al visitarse por primera vez.
+
+# Origen del dataset: el libro de Excel o una base de icatex.almacen (y la planta a cargar)
+ORIGEN = os.environ.get('ICATEX_ORIGEN', RUTA_LIBRO)
+PLANTA = os.environ.get('ICATEX_PLANTA')
+
+# Modo multiplanta: directorio, patrón o bases con un origen por planta (icatex.plantas)
+PLANTAS = os.environ.get('ICATEX_PLANTAS')
+
+# Log de reales mensuales que se aplican sobre el origen (icatex.incremental)
+INCREMENTOS = incremental.ruta_log(ORIGEN)
+
+# Almacén de escenarios guardados desde las simulaciones (icatex.escenarios)
+ESCENARIOS = escenarios.ruta_escenarios(ORIGEN)
+
+# Si desalojar las cachés LRU no baja el RSS del umbral, se vacían las copias de st.cache_data
+memoria.al_liberar(st.cache_data.clear)
+
+# Decorador de caché de Streamlit que, con el perfil activo, cuenta aciertos y fallos y
+# mide el tiempo de la llamada en `etapa`. La envoltura externa cuenta las consultas y el
+# cuerpo cacheado, que solo corre en un fallo, lo marca; `wraps` conserva la clave de la caché.
+def cacheada(decorador, etapa):
+    def aplicar(funcion):
+        if not perfil.ACTIVO:
+            return decorador(funcion)
+        capa = f"st.{funcion.__name__}"
+        estado = threading.local()
+
+        @wraps(funcion)
+        def cuerpo(*args, **kwargs):
+            estado.fallo = True
+            return funcion(*args, **kwargs)
+        en_cache = decorador(cuerpo)
+
+        @wraps(funcion)
+        def consulta(*args, **kwargs):
+            estado.fallo = False
+            with perfil.etapa(etapa):
+                valor = en_cache(*args, **kwargs)
+            perfil.contar(capa, not estado.fallo)
+            return valor
+        consulta.clear = en_cache.clear
+        return consulta
+    return aplicar
+
+# Dataset base leído del libro de Excel o de la base embebida (compartido entre sesiones)
+@cacheada(st.cache_resource, 'datos')
+def cargar_base():
+    return cargar_datos(ORIGEN, PLANTA)
+
+# Dataset vigente: la base con los segmentos del log aplicados. La versión es el número de
+# segmentos, así un mes registrado con `python -m icatex.incremental agregar` se ve en la
+# siguiente ejecución sin releer el libro. Con cada versión nueva se lanza el calentamiento
+# de cachés en segundo plano y, si ICATEX_API_PUERTO está definido, la API de indicadores
+# pasa a servir este dataset (compartido entre sesiones; solo lectura)
+@cacheada(st.cache_resource, 'datos')
+def datos_version(version):
+    data, avisos = cargar_base()
+    for aviso in avisos:
+        st.warning(aviso)
+    if version:
+        data = incremental.al_dia(data, INCREMENTOS)
+    iniciar_calentamiento(data)
+    if os.environ.get('ICATEX_API_PUERTO'):
+        from icatex import api
+        api.iniciar(data, int(os.environ['ICATEX_API_PUERTO']))
+    return data
+
+def load_data():
+    return datos_version(len(incremental.segmentos(INCREMENTOS)))
+
+# Arreglos producto × periodo / insumo × periodo compartidos entre sesiones (solo lectura).
+# Cada selección de los filtros globales tiene su huella, de ahí el tope de entradas.
+@cacheada(st.cache_resource(max_entries=32), 'datos')
+def obtener_tensores(huella, _data):
+    return motores.tensores(huella, _data)
+
+# Cubo de agregados (producto × año × mes) de precio, costo, margen y demanda, con
+# acumulados por categoría y línea; las vistas de Demanda y Costos son cortes del cubo
+@cacheada(st.cache_resource(max_entries=32), 'datos')
+def obtener_cubo(huella, _data):
+    return motores.cubo_agregados(huella, _data)
+
+# Las envolturas siguientes devuelven copias por sesión de los resultados de icatex.motores,
+# que quedan publicados en la caché compartida (y que el calentamiento rellena de antemano)
+
+# Explosión de materiales del plan óptimo para todos los insumos
+@cacheada(st.cache_data, 'agregacion')
+def calcular_mrp(huella, lead_time, _tensores):
+    return motores.requerimientos(huella, _tensores, lead_time)
+
+# Tendencias y quiebres de stock de todos los insumos, ajustados una vez por dataset
+@cacheada(st.cache_data, 'agregacion')
+def pronosticar_stock(huella, horizonte, estacional, _tensores):
+    return motores.quiebres_stock(huella, _tensores, horizonte, estacional)
+
+# Perfiles estacionales [producto × mes] de demanda y margen para todo el catálogo
+@cacheada(st.cache_data, 'agregacion')
+def perfiles_estacionales(huella, _tensores):
+    return motores.perfiles_estacionales(huella, _tensores)
+
+# Pronóstico de demanda y precios de todos los productos
+@cacheada(st.cache_data, 'agregacion')
+def pronosticar_demanda(huella, horizonte, modelo, nivel, _tensores):
+    return motores.pronostico(huella, _tensores, horizonte, modelo, nivel)
+
+# Benchmark de políticas de inventario simples para todo el catálogo
+@cacheada(st.cache_data, 'agregacion')
+def evaluar_politicas(huella, origen, replicas, lead_time, _tensores):
+    return motores.politicas(huella, _tensores, origen, replicas, lead_time)
+
+# Elasticidades precio-demanda de todo el catálogo
+@cacheada(st.cache_data, 'agregacion')
+def estimar_respuesta(huella, elasticidad_defecto, _tensores):
+    return motores.respuesta_precios(huella, _tensores, elasticidad_defecto)
+
+# Precios óptimos de todo el catálogo según la respuesta precio-demanda histórica
+@cacheada(st.cache_data, 'agregacion')
+def optimizar_precios(huella, elasticidad_defecto, limite_inferior, limite_superior,
+                      acoplar_capacidad, permitir_horas_extra, _tensores):
+    return motores.precios_optimos(huella, _tensores, elasticidad_defecto, limite_inferior, limite_superior,
+                                   acoplar_capacidad, permitir_horas_extra)
+
+# Función objetivo del modelo evaluada sobre el plan óptimo cargado
+@cacheada(st.cache_data, 'agregacion')
+def valor_objetivo(huella, _tensores):
+    return motores.valor_objetivo(huella, _tensores)
+
+# Calentamiento: primero tensores y cubo; después, en paralelo, cada sección se importa
+# y precalcula lo que muestra con sus selecciones por defecto (función `calentar`)
+def iniciar_calentamiento(data):
+    huella = data['HUELLA']
+    etapas = [
+        [('Tensores', lambda: motores.tensores(huella, data)),
+         ('Cubo de agregados', lambda: motores.cubo_agregados(huella, data)
+          if not data['DAT_PM_MATRIX'].empty else None)],
+        [(etiqueta, partial(_calentar_seccion, modulo, data)) for etiqueta, modulo in SECCIONES.items()],
+    ]
+    return calentamiento.calentar(huella, etapas)
+
+def _calentar_seccion(modulo, data):
+    seccion = importar(modulo)
+    if hasattr(seccion, 'calentar'):
+        seccion.calentar(data)
+
+# Filas de una hoja para la selección de una sección (listas de productos, insumos, procesos
+# o años). Con la base embebida el filtro se resuelve en la consulta y solo se lee el corte;
+# con el libro (o con meses del log aplicados, que la base no tiene) se filtra el DataFrame
+# ya cargado.
+@cacheada(st.cache_data, 'busqueda')
+def corte(huella, hoja, productos=None, insumos=None, procesos=None, años=None):
+    if not PLANTAS and ORIGEN.lower().endswith(EXTENSIONES_ALMACEN) and huella == cargar_base()[0]['HUELLA']:
+        return almacen.leer_corte(ORIGEN, datos_actuales()['PLANTA'], hoja, productos, insumos, procesos, años)
+    return almacen.filtrar(datos_actuales()[hoja], productos, insumos, procesos, años)
+
+# Datasets de todas las plantas, cargados en paralelo una vez por proceso y compartidos
+# entre sesiones (solo lectura), con los segundos de carga de cada una
+@cacheada(st.cache_resource, 'datos')
+def datos_plantas():
+    datos, avisos, segundos = plantas.cargar_plantas(plantas.descubrir(PLANTAS))
+    for planta, lista in avisos.items():
+        for aviso in lista:
+            st.warning(f"{planta}: {aviso}")
+    return datos, segundos
+
+# Utilidad, margen, utilización y horas extra de todas las plantas apiladas
+@cacheada(st.cache_resource, 'agregacion')
+def comparacion_plantas():
+    return plantas.comparar_plantas(datos_plantas()[0])
+
+# Planta que muestran las secciones en modo multiplanta
+def selector_planta():
+    return st.sidebar.selectbox("🏭 Planta:", list(datos_plantas()[0]), key='planta')
+
+# Dataset sin los filtros globales (el de la planta elegida en modo multiplanta)
+def datos_base():
+    if PLANTAS:
+        datos = datos_plantas()[0]
+        data = datos[st.session_state.get('planta') or next(iter(datos))]
+        iniciar_calentamiento(data)
+        return data
+    return load_data()
+
+# Los filtros necesitan el catálogo de productos y la matriz por periodo; sin ellos (libro
+# ausente u hojas que no cargaron) no se muestran y las secciones ven el dataset base
+def filtrable(data):
+    return not data['DAT_PRODUCTOS_FIJOS'].empty and not data['DAT_PM_MATRIX'].empty
+
+TITULOS_FILTROS = {'categoria': "Categoría", 'linea': "Línea", 'producto': "Producto", 'año': "Año", 'mes': "Mes"}
+
+# Barra de filtros globales de la barra lateral: sus selecciones se aplican a los datos,
+# tensores y cubo de todas las secciones
+def barra_filtros():
+    data = datos_base()
+    if not filtrable(data):
+        return
+    indice = motores.indice_filtros(data['HUELLA'], data)
+    nombres = data['DAT_PRODUCTOS_FIJOS'].set_index('ID_Producto')['Nombre_Producto'].to_dict()
+    etiquetas = {'producto': lambda p: nombres.get(p, p), 'mes': lambda m: MESES[m - 1]}
+    with st.sidebar.expander("🔎 Filtros globales", expanded=bool(seleccion_filtros())):
+        for dimension, titulo in TITULOS_FILTROS.items():
+            st.multiselect(titulo, filtros.valores(indice, dimension), key=f"filtro_{dimension}",
+                           format_func=etiquetas.get(dimension, str), placeholder="Todos")
+        if seleccion_filtros():
+            filtrado = datos_actuales()
+            if filtrado is data:
+                st.warning("La combinación de filtros no deja datos; se muestra todo.")
+            else:
+                st.caption(f"{filtrado['DAT_PRODUCTOS_FIJOS'].shape[0]} productos × "
+                           f"{filtrado['SET_MESES'].shape[0]} periodos")
+
+# Selección de los filtros globales como tupla ((dimensión, valores), ...) sin las vacías
+def seleccion_filtros():
+    return tuple((dimension, tuple(st.session_state[f"filtro_{dimension}"])) for dimension in filtros.DIMENSIONES
+                 if st.session_state.get(f"filtro_{dimension}"))
+
+# Datos, tensores y cubo del libro cargado con los filtros globales aplicados. Cada
+# fragmento los obtiene al ejecutarse, así una re-ejecución parcial no depende de variables
+# del script principal
+def datos_actuales():
+    data = datos_base()
+    seleccion = seleccion_filtros()
+    if not seleccion or not filtrable(data):
+        return data
+    filtrado = motores.datos_filtrados(data['HUELLA'], data, seleccion)
+    return data if filtrado is None else filtrado
+
+def tensores_actuales():
+    data = datos_actuales()
+    return obtener_tensores(data['HUELLA'], data)
+
+def cubo_actual():
+    data = datos_actuales()
+    return obtener_cubo(data['HUELLA'], data) if not data['DAT_PM_MATRIX'].empty else None
+
+# Función para formatear números
+def format_currency(value):
+    return f"$ {value:,.2f}"
+
+# Con series más largas que el máximo de puntos por traza, un rango de períodos hace de
+# zoom: el tramo elegido se vuelve a reducir en el servidor y se ve con más detalle
+def rango_zoom(clave, x):
+    x = np.asarray(x)
+    if len(x) <= series.PUNTOS_MAXIMOS:
+        return None
+    return st.slider("Rango de períodos (zoom):", int(x.min()), int(x.max()),
+                     (int(x.min()), int(x.max())), key=f"{clave}_zoom")
+
+# Ejecución perfilada de una sección o fragmento (icatex.perfil), con la sesión de Streamlit
+def perfilada(seccion):
+    def aplicar(mostrar):
+        if not perfil.ACTIVO:
+            return mostrar
+
+        @wraps(mostrar)
+        def envoltura(*args, **kwargs):
+            contexto = get_script_run_ctx()
+            with perfil.ejecucion(contexto.session_id if contexto else None, seccion):
+                return mostrar(*args, **kwargs)
+        return envoltura
+    return aplicar
+
+# Emisión de figuras y tablas: con el perfil activo se mide, por widget, lo que tarda
+# Streamlit en serializarlas
+def grafico(figura, **opciones):
+    with perfil.etapa('serializacion', (figura.layout.title.text or 'figura') if perfil.ACTIVO else None):
+        return st.plotly_chart(figura, **opciones)
+
+def tabla(df, **opciones):
+    with perfil.etapa('serializacion', f"tabla {df.shape[0]}×{df.shape[1]}" if perfil.ACTIVO else None):
+        return st.dataframe(df, **opciones)
+
+# Panel de depuración de la barra lateral (solo con ICATEX_PERFIL): últimas ejecuciones de
+# esta sesión por etapa y aciertos de cada capa de caché del proceso
+def panel_depuracion():
+    if not st.sidebar.toggle("🐞 Panel de depuración", key='perfil_panel'):
+        return
+    contexto = get_script_run_ctx()
+    ejecuciones = perfil.tabla_ejecuciones(perfil.recientes(contexto.session_id if contexto else None))
+    with st.sidebar:
+        st.caption(f"Log: {perfil.RUTA_LOG}")
+        if not ejecuciones.empty:
+            st.dataframe(ejecuciones.drop(columns=['fecha', 'sesion']).tail(20).round(1), hide_index=True)
+            st.dataframe(ejecuciones.groupby('seccion').mean(numeric_only=True).round(1))
+        st.dataframe(perfil.capas().round(3), hide_index=True)
+
+# Bytes de cada función de st.cache_data (Streamlit guarda los resultados serializados)
+def memoria_cache_data():
+    tamanos = {}
+    for stats in get_data_cache_stats_provider().get_stats().values():
+        for stat in stats:
+            tamanos[stat.cache_name] = tamanos.get(stat.cache_name, 0) + stat.byte_length
+    return pd.DataFrame(sorted(tamanos.items(), key=lambda t: -t[1]), columns=['Función', 'Bytes'])
+
+# Bytes del session_state de cada sesión activa (claves propias y de widgets con clave).
+# Streamlit no publica el gestor de sesiones; sin él (p. ej. en AppTest) la tabla queda vacía.
+def memoria_sesiones():
+    gestor = getattr(Runtime.instance(), '_session_mgr', None) if Runtime.exists() else None
+    filas = []
+    for info in gestor.list_active_sessions() if gestor is not None else []:
+        estado = info.session.session_state.filtered_state
+        filas.append({'Sesión': info.session.id, 'Claves': len(estado), 'Bytes': memoria.bytes_objeto(estado)})
+    return pd.DataFrame(filas, columns=['Sesión', 'Claves', 'Bytes']).sort_values('Bytes', ascending=False)
+
+# Panel de memoria de la barra lateral: RSS contra el límite del contenedor, bytes del
+# dataset y los tensores, de cada caché y de cada sesión, e instantáneas de tracemalloc
+def panel_memoria():
+    if not st.sidebar.toggle("🧠 Memoria", key='memoria_panel'):
+        return
+    data = datos_actuales()
+    estado = memoria.estado()
+    legible = lambda tabla: tabla.assign(Bytes=tabla['Bytes'].map(memoria.formato_bytes))
+    with st.sidebar:
+        rss = memoria.formato_bytes(estado['rss']) if estado['rss'] is not None else "?"
+        if estado['limite']:
+            st.progress(min(1.0, estado['uso']), text=f"RSS {rss} de {memoria.formato_bytes(estado['limite'])} "
+                                                       f"(libera al {estado['umbral']:.0%})")
+        else:
+            st.caption(f"RSS {rss}; sin límite de contenedor")
+        dataset = memoria.cuentas_dataset(data)
+        st.caption(f"Dataset: {memoria.formato_bytes(dataset['Bytes'].sum())}")
+        st.dataframe(legible(dataset), hide_index=True)
+        tensores = memoria.cuentas_tensores(tensores_actuales())
+        st.caption(f"Tensores: {memoria.formato_bytes(tensores['Bytes'].sum())}")
+        st.dataframe(legible(tensores), hide_index=True)
+        caches = memoria.cuentas_caches()
+        presupuesto = caches.attrs['presupuesto_global']
+        st.caption(f"Cachés LRU: {memoria.formato_bytes(caches['bytes'].sum())}"
+                   + (f" de {memoria.formato_bytes(presupuesto)}" if presupuesto else ""))
+        st.dataframe(caches[['cache', 'entradas', 'bytes', 'desalojos', 'max_bytes']], hide_index=True)
+        st.caption("st.cache_data")
+        st.dataframe(legible(memoria_cache_data()), hide_index=True)
+        st.caption("Sesiones activas")
+        st.dataframe(legible(memoria_sesiones()), hide_index=True)
+        for evento in list(memoria.EVENTOS)[-3:]:
+            st.caption(f"⚠️ {evento['fecha']}: {evento['motivo']} "
+                       f"({memoria.formato_bytes(evento['bytes_caches'])} desalojados)")
+        if st.button("📸 Instantánea tracemalloc", key='memoria_instantanea'):
+            iniciado = estado['rastreando']
+            top, cambios = memoria.instantanea()
+            if not iniciado:
+                st.caption("Rastreo iniciado; la próxima instantánea mostrará las asignaciones")
+            else:
+                st.dataframe(legible(top), hide_index=True)
+                if not cambios.empty:
+                    st.dataframe(legible(cambios), hide_index=True)
+        if st.button("🧹 Liberar cachés", key='memoria_liberar'):
+            st.caption(f"{memoria.formato_bytes(memoria.liberar())} desalojados")
+
+# Tabla paginada en el servidor: el filtro, el orden y los agregados se calculan aquí y
+# solo la página visible (serializada en Arrow y cacheada) viaja al navegador.
+# `vista` identifica el contenido de `df` dentro del dataset cargado.
+@st.fragment
+@perfilada('tabla_paginada')
+def tabla_paginada(vista, df, clave, orden=None, ascendente=True, filas_por_pagina=25):
+    data = datos_actuales()
+    columnas = [None] + list(df.columns)
+    col1, col2, col3, col4 = st.columns([3, 2, 1, 1])
+    with col1:
+        filtro = st.text_input("Filtrar:", key=f"{clave}_filtro", placeholder="Texto en cualquier columna")
+    with col2:
+        columna = st.selectbox("Ordenar por:", columnas, index=columnas.index(orden),
+                               format_func=lambda c: "(orden original)" if c is None else c,
+                               key=f"{clave}_orden")
+    with col3:
+        ascendente = st.toggle("Ascendente", ascendente, key=f"{clave}_ascendente")
+    
+    with perfil.etapa('busqueda'):
+        total = len(tablas.orden_filas(data['HUELLA'], vista, df, columna, ascendente, filtro))
+    paginas = max(1, -(-total // filas_por_pagina))
+    # Si el filtro reduce las páginas, se vuelve a la última disponible
+    st.session_state[f"{clave}_pagina"] = min(st.session_state.get(f"{clave}_pagina", 1), paginas)
+    with col4:
+        pagina = st.number_input("Página:", 1, paginas, key=f"{clave}_pagina")
+    
+    with perfil.etapa('busqueda'):
+        serializada = tablas.pagina_arrow(data['HUELLA'], vista, df, columna, ascendente, filtro,
+                                          pagina - 1, filas_por_pagina)
+    tabla(tablas.leer_pagina(serializada), use_container_width=True, hide_index=True)
+    inicio = (pagina - 1) * filas_por_pagina
+    st.caption(f"Filas {min(inicio + 1, total)}-{min(inicio + filas_por_pagina, total)} de {total:,}")
+    
+    with st.expander("Agregados por columna"):
+        with perfil.etapa('agregacion'):
+            agregados = tablas.agregados_columnas(data['HUELLA'], vista, df, filtro)
+        tabla(agregados, use_container_width=True)
+
+# Modo de comparación de varios productos de una sección: las series de `variables` de
+# toda la selección salen de un gather del almacén de productos (icatex.comparacion) y se
+# muestran como múltiplos pequeños y como ranking con los indicadores de `columnas`.
+# Devuelve True si el modo está activo; la sección omite entonces su vista de un producto.
+def comparacion_productos(clave, variables, columnas, orden, titulo):
+    if not st.toggle("Comparar varios productos", key=f"{clave}_comparar"):
+        return False
+    data = datos_actuales()
+    tensores = tensores_actuales()
+    fijos = data['DAT_PRODUCTOS_FIJOS']
+    nombres = dict(zip(fijos['ID_Producto'].astype(str), fijos['Nombre_Producto'].astype(str)))
+    opciones = np.asarray(tensores['productos']).astype(str).tolist()
+    # Los primeros productos al entrar; con los filtros globales pueden desaparecer productos
+    # ya elegidos
+    previos = st.session_state.get(f"{clave}_multi", opciones[:4])
+    st.session_state[f"{clave}_multi"] = [p for p in previos if p in opciones]
+    elegidos = st.multiselect("Productos a comparar:", opciones, key=f"{clave}_multi",
+                              format_func=lambda p: nombres.get(p, p), max_selections=comparacion.MAXIMO_PRODUCTOS)
+    if not elegidos:
+        st.info("Elige uno o más productos para compararlos")
+        return True
+    
+    seleccion = tuple(elegidos)
+    resultado = motores.comparacion_productos(data['HUELLA'], tensores, seleccion)
+    rango = rango_zoom(f"{clave}_comparacion", tensores['periodos'])
+    figura = figura_cacheada(data['HUELLA'], f"comparacion.{clave}", (seleccion, tuple(variables), rango),
+                             lambda: comparacion.figura_multiplos(resultado, variables, nombres, rango,
+                                                                  f"{titulo} - {len(seleccion)} productos"))
+    grafico(figura, use_container_width=True)
+    
+    st.subheader(f"🏆 Ranking - {titulo}")
+    orden = st.selectbox("Ordenar ranking por:", columnas, index=columnas.index(orden), key=f"{clave}_ranking")
+    ranking = comparacion.ranking(resultado, orden, columnas, nombres)
+    tabla(ranking.round(2), use_container_width=True, hide_index=True)
+    return True
@@ -0,0 +1,177 @@
+from functools import partial
+
+import plotly.express as px
+import plotly.graph_objects as go
+import streamlit as st
+
+from icatex import cubo, motores
+from icatex.figuras import figura_cacheada
+from secciones.comun import (datos_actuales, cubo_actual, format_currency, tabla_paginada,
+                             perfilada, grafico)
+
+# Figuras de la sección para un año: cada una es un corte del cubo de agregados
+def construir_fig_tendencias(cubo_agregados, año_seleccionado):
+    costos_agregados = cubo.serie_mensual(cubo_agregados, año_seleccionado)
+    fig_tendencias = go.Figure()
+    fig_tendencias.add_trace(go.Scatter(x=costos_agregados['Periodo_Index'], 
+                                      y=costos_agregados['PrecioVenta'], 
+                                      name='Precio Venta', 
+                                      line=dict(color='green')))
+    fig_tendencias.add_trace(go.Scatter(x=costos_agregados['Periodo_Index'], 
+                                      y=costos_agregados['CostoInsumo'], 
+                                      name='Costo Insumo', 
+                                      line=dict(color='red')))
+    fig_tendencias.add_trace(go.Scatter(x=costos_agregados['Periodo_Index'], 
+                                      y=costos_agregados['Margen'], 
+                                      name='Margen', 
+                                      line=dict(color='blue')))
+    fig_tendencias.update_layout(title=f"Evolución de Precios, Costos y Margenes - {año_seleccionado}")
+    return fig_tendencias
+
+def construir_fig_margen_tendencia(cubo_agregados, año_seleccionado):
+    costos_agregados = cubo.serie_mensual(cubo_agregados, año_seleccionado)
+    fig_margen_tendencia = px.line(costos_agregados, x='Periodo_Index', y='Margen_Porcentaje',
+                                  title=f"Evolución del Margen Porcentual - {año_seleccionado}")
+    return fig_margen_tendencia
+
+def construir_fig_top_porc(cubo_agregados, año_seleccionado):
+    rentabilidad_productos = cubo.resumen_productos(cubo_agregados, año_seleccionado)
+    top_margen_porc = rentabilidad_productos.nlargest(10, 'Margen_Porcentaje')
+    fig_top_porc = px.bar(top_margen_porc, x='Nombre_Producto', y='Margen_Porcentaje',
+                         title="Top 10 Productos por Margen %",
+                         color='Categoria')
+    fig_top_porc.update_layout(xaxis_tickangle=-45)
+    return fig_top_porc
+
+def construir_fig_top_abs(cubo_agregados, año_seleccionado):
+    rentabilidad_productos = cubo.resumen_productos(cubo_agregados, año_seleccionado)
+    top_margen_abs = rentabilidad_productos.nlargest(10, 'Margen')
+    fig_top_abs = px.bar(top_margen_abs, x='Nombre_Producto', y='Margen',
+                        title="Top 10 Productos por Margen Absoluto",
+                        color='Categoria')
+    fig_top_abs.update_layout(xaxis_tickangle=-45)
+    return fig_top_abs
+
+def construir_fig_cat_margen(cubo_agregados, año_seleccionado):
+    rentabilidad_categoria = cubo.resumen_grupos(cubo_agregados, 'categoria', año_seleccionado)
+    fig_cat_margen = px.bar(rentabilidad_categoria, x='Categoria', y='Margen_Porcentaje',
+                           title="Margen Porcentual Promedio por Categoría",
+                           color='Categoria')
+    return fig_cat_margen
+
+def construir_fig_cat_precio_costo(cubo_agregados, año_seleccionado):
+    rentabilidad_categoria = cubo.resumen_grupos(cubo_agregados, 'categoria', año_seleccionado)
+    fig_cat_precio_costo = go.Figure()
+    fig_cat_precio_costo.add_trace(go.Bar(x=rentabilidad_categoria['Categoria'], 
+                                         y=rentabilidad_categoria['PrecioVenta'],
+                                         name='Precio Venta Promedio',
+                                         marker_color='green'))
+    fig_cat_precio_costo.add_trace(go.Bar(x=rentabilidad_categoria['Categoria'], 
+                                         y=rentabilidad_categoria['CostoInsumo'],
+                                         name='Costo Insumo Promedio',
+                                         marker_color='red'))
+    fig_cat_precio_costo.update_layout(title="Precio vs Costo por Categoría",
+                                      barmode='group')
+    return fig_cat_precio_costo
+
+FIGURAS = {
+    'tendencias': construir_fig_tendencias,
+    'margen': construir_fig_margen_tendencia,
+    'top_porcentaje': construir_fig_top_porc,
+    'top_absoluto': construir_fig_top_abs,
+    'categoria_margen': construir_fig_cat_margen,
+    'categoria_precio_costo': construir_fig_cat_precio_costo,
+}
+
+def figura(data, cubo_agregados, nombre, año_seleccionado):
+    return figura_cacheada(data['HUELLA'], 'costos', (nombre, año_seleccionado),
+                           partial(FIGURAS[nombre], cubo_agregados, año_seleccionado))
+
+# Calentamiento en segundo plano: figuras del año que se muestra por defecto (el primero)
+def calentar(data):
+    if not data['DAT_PM_MATRIX'].empty:
+        cubo_agregados = motores.cubo_agregados(data['HUELLA'], data)
+        año_seleccionado = cubo.años_disponibles(cubo_agregados)[0]
+        for nombre in FIGURAS:
+            figura(data, cubo_agregados, nombre, año_seleccionado)
+
+# ===== SECCIÓN 6: COSTOS Y RENTABILIDAD =====
+@st.fragment
+@perfilada('costos')
+def mostrar():
+    data = datos_actuales()
+    cubo_agregados = cubo_actual()
+    st.header("💰 Análisis de Costos y Rentabilidad")
+    
+    if not data['DAT_PM_MATRIX'].empty:
+        # Filtro por año
+        años_disponibles = cubo.años_disponibles(cubo_agregados)
+        año_seleccionado = st.selectbox("Selecciona el año:", años_disponibles, key="costos_year")
+        
+        # Métricas agregadas por periodo: corte del acumulado total del cubo
+        costos_agregados = cubo.serie_mensual(cubo_agregados, año_seleccionado)
+        
+        # Métricas de costos
+        col1, col2, col3, col4 = st.columns(4)
+        with col1:
+            precio_promedio = costos_agregados['PrecioVenta'].mean()
+            st.metric("Precio Venta Promedio", format_currency(precio_promedio))
+        with col2:
+            costo_promedio = costos_agregados['CostoInsumo'].mean()
+            st.metric("Costo Insumo Promedio", format_currency(costo_promedio))
+        with col3:
+            margen_promedio = costos_agregados['Margen'].mean()
+            st.metric("Margen Promedio", format_currency(margen_promedio))
+        with col4:
+            margen_porc_promedio = costos_agregados['Margen_Porcentaje'].mean()
+            st.metric("Margen % Promedio", f"{margen_porc_promedio:.1f}%")
+        
+        # Gráficos de tendencias
+        st.subheader("📈 Tendencias de Costos y Margenes")
+        
+        col1, col2 = st.columns(2)
+        
+        with col1:
+            grafico(figura(data, cubo_agregados, 'tendencias', año_seleccionado),
+                            use_container_width=True)
+        
+        with col2:
+            grafico(figura(data, cubo_agregados, 'margen', año_seleccionado),
+                            use_container_width=True)
+        
+        # Análisis por producto
+        st.subheader("🏆 Productos Más Rentables")
+        
+        # Rentabilidad por producto (con nombre y categoría) desde el cubo
+        rentabilidad_productos = cubo.resumen_productos(cubo_agregados, año_seleccionado)
+        
+        col1, col2 = st.columns(2)
+        
+        with col1:
+            # Top productos por margen porcentual
+            grafico(figura(data, cubo_agregados, 'top_porcentaje', año_seleccionado),
+                            use_container_width=True)
+        
+        with col2:
+            # Top productos por margen absoluto
+            grafico(figura(data, cubo_agregados, 'top_absoluto', año_seleccionado),
+                            use_container_width=True)
+        
+        # Análisis por categoría
+        st.subheader("📊 Rentabilidad por Categoría")
+        
+        col1, col2 = st.columns(2)
+        
+        with col1:
+            grafico(figura(data, cubo_agregados, 'categoria_margen', año_seleccionado),
+                            use_container_width=True)
+        
+        with col2:
+            grafico(figura(data, cubo_agregados, 'categoria_precio_costo', año_seleccionado),
+                            use_container_width=True)
+        
+        # Tabla de rentabilidad por producto
+        st.subheader("📋 Tabla de Rentabilidad por Producto")
+        tabla_paginada(('rentabilidad', año_seleccionado),
+                       rentabilidad_productos[['Nombre_Producto', 'Categoria', 'PrecioVenta', 'CostoInsumo', 'Margen', 'Margen_Porcentaje']],
+                       "tabla_rentabilidad", orden='Margen_Porcentaje', ascendente=False)
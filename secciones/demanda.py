@@ -0,0 +1,199 @@
+import numpy as np
+import pandas as pd
+import plotly.express as px
+import plotly.graph_objects as go
+import streamlit as st
+
+from icatex import cubo, motores, pronostico_demanda, series
+from secciones.comun import (datos_actuales, tensores_actuales, cubo_actual, format_currency,
+                             perfiles_estacionales, pronosticar_demanda, perfilada, grafico, tabla,
+                             comparacion_productos)
+
+# Indicadores del ranking en el modo de comparación
+INDICADORES_COMPARACION = ['Demanda_Min_Promedio', 'Demanda_Max_Promedio', 'Precio_Promedio', 'Costo_Promedio',
+                           'Ventas_Total', 'Ingresos', 'Margen', 'Margen_%']
+
+# Calentamiento en segundo plano: perfiles estacionales y pronóstico con el modelo por defecto
+def calentar(data):
+    tensores = motores.tensores(data['HUELLA'], data)
+    motores.perfiles_estacionales(data['HUELLA'], tensores)
+    motores.pronostico(data['HUELLA'], tensores, 12, 'holt_winters', 0.9)
+
+# ===== SECCIÓN 5: DEMANDA Y MERCADO =====
+@st.fragment
+@perfilada('demanda')
+def mostrar():
+    data = datos_actuales()
+    tensores = tensores_actuales()
+    cubo_agregados = cubo_actual()
+    st.header("📊 Análisis de Demanda y Mercado")
+    
+    if not data['DAT_PM_MATRIX'].empty:
+        # Comparación de varios productos: demanda mínima y máxima e indicadores de mercado
+        if comparacion_productos('demanda', ('demanda_min', 'demanda_max'), INDICADORES_COMPARACION,
+                                 'Demanda_Max_Promedio', "Demanda por producto"):
+            return
+        
+        # Selector de producto para análisis de demanda
+        productos = data['DAT_PRODUCTOS_FIJOS']['Nombre_Producto'].tolist()
+        producto_demanda = st.selectbox("Selecciona producto para análisis:", productos, key="demanda_prod")
+        
+        if producto_demanda:
+            producto_id = data['DAT_PRODUCTOS_FIJOS'][
+                data['DAT_PRODUCTOS_FIJOS']['Nombre_Producto'] == producto_demanda
+            ]['ID_Producto'].iloc[0]
+            
+            # Filtro por año (años con datos del producto según el cubo)
+            años_disponibles = cubo.años_disponibles(cubo_agregados, producto_id)
+            año_seleccionado = st.selectbox("Selecciona el año:", años_disponibles, key="demanda_year_filter")
+            
+            # Corte del cubo: detalle mensual del producto en el año seleccionado
+            demanda_filtrada = cubo.detalle_producto(cubo_agregados, producto_id, año_seleccionado)
+            
+            # Métricas de demanda
+            col1, col2, col3, col4 = st.columns(4)
+            with col1:
+                demanda_min_promedio = demanda_filtrada['DemandaMinima'].mean()
+                st.metric("Demanda Mínima Promedio", f"{demanda_min_promedio:,.0f} uds")
+            with col2:
+                demanda_max_promedio = demanda_filtrada['DemandaMaxima'].mean()
+                st.metric("Demanda Máxima Promedio", f"{demanda_max_promedio:,.0f} uds")
+            with col3:
+                precio_promedio = demanda_filtrada['PrecioVenta'].mean()
+                st.metric("Precio Venta Promedio", format_currency(precio_promedio))
+            with col4:
+                costo_promedio = demanda_filtrada['CostoInsumo'].mean()
+                st.metric("Costo Insumo Promedio", format_currency(costo_promedio))
+            
+            st.subheader(f"📈 Evolución de la Demanda - {producto_demanda} - {año_seleccionado}")
+            
+            # Crear gráfico de demanda mínima y máxima
+            fig_demanda = go.Figure()
+            fig_demanda.add_trace(go.Scatter(x=demanda_filtrada['Mes'], 
+                                           y=demanda_filtrada['DemandaMinima'], 
+                                           name='Demanda Mínima', 
+                                           line=dict(color='orange'),
+                                           fill=None))
+            fig_demanda.add_trace(go.Scatter(x=demanda_filtrada['Mes'], 
+                                           y=demanda_filtrada['DemandaMaxima'], 
+                                           name='Demanda Máxima', 
+                                           line=dict(color='red'),
+                                           fill='tonexty',
+                                           fillcolor='rgba(255,0,0,0.1)'))
+            fig_demanda.update_layout(title=f"Rango de Demanda - {producto_demanda} - {año_seleccionado}",
+                                     xaxis_title="Mes", yaxis_title="Unidades Demandadas",
+                                     showlegend=True)
+            grafico(fig_demanda, use_container_width=True)
+            
+            # Precios y costos
+            st.subheader("💰 Evolución de Precios y Costos")
+            
+            fig_precios = go.Figure()
+            fig_precios.add_trace(go.Scatter(x=demanda_filtrada['Mes'], 
+                                           y=demanda_filtrada['PrecioVenta'], 
+                                           name='Precio Venta', 
+                                           line=dict(color='green')))
+            fig_precios.add_trace(go.Scatter(x=demanda_filtrada['Mes'], 
+                                           y=demanda_filtrada['CostoInsumo'], 
+                                           name='Costo Insumo', 
+                                           line=dict(color='red')))
+            fig_precios.update_layout(title=f"Evolución de Precios y Costos - {producto_demanda} - {año_seleccionado}",
+                                     xaxis_title="Mes", yaxis_title="Valor ($)")
+            grafico(fig_precios, use_container_width=True)
+            
+            # Margen porcentual (ya incluido en el corte del cubo)
+            fig_margen = go.Figure()
+            fig_margen.add_trace(go.Scatter(x=demanda_filtrada['Mes'], 
+                                          y=demanda_filtrada['Margen_Porcentaje'], 
+                                          name='Margen %', 
+                                          line=dict(color='blue')))
+            fig_margen.update_layout(title=f"Evolución del Margen Porcentual - {producto_demanda} - {año_seleccionado}",
+                                    xaxis_title="Mes", yaxis_title="Margen (%)")
+            grafico(fig_margen, use_container_width=True)
+            
+            # Análisis estacionalidad - CORREGIDO
+            st.subheader("🔄 Análisis de Estacionalidad")
+            
+            # Perfil mensual tomado del cálculo conjunto de todos los productos
+            p = tensores['productos'].tolist().index(producto_id)
+            perfiles = perfiles_estacionales(data['HUELLA'], tensores)
+            demanda_estacional = pd.DataFrame({
+                'Mes': np.arange(1, 13),
+                'DemandaMinima': perfiles['DemandaMinima'][p],
+                'DemandaMaxima': perfiles['DemandaMaxima'][p],
+                'Margen_Porcentaje': perfiles['Margen_Porcentaje'][p],
+            })
+            
+            col1, col2 = st.columns(2)
+            
+            with col1:
+                fig_estacional_demanda = go.Figure()
+                fig_estacional_demanda.add_trace(go.Scatter(x=demanda_estacional['Mes'], 
+                                                          y=demanda_estacional['DemandaMinima'], 
+                                                          name='Demanda Mínima Promedio', 
+                                                          line=dict(color='lightblue')))
+                fig_estacional_demanda.add_trace(go.Scatter(x=demanda_estacional['Mes'], 
+                                                          y=demanda_estacional['DemandaMaxima'], 
+                                                          name='Demanda Máxima Promedio', 
+                                                          line=dict(color='darkblue')))
+                fig_estacional_demanda.update_layout(title="Patrón Estacional de Demanda")
+                grafico(fig_estacional_demanda, use_container_width=True)
+            
+            with col2:
+                fig_estacional_margen = px.line(demanda_estacional, x='Mes', y='Margen_Porcentaje',
+                                               title="Patrón Estacional del Margen")
+                grafico(fig_estacional_margen, use_container_width=True)
+            
+            # Pronóstico de demanda (ajustado para todo el catálogo en un solo lote)
+            st.subheader("🔮 Pronóstico de Demanda y Precios")
+            
+            # Los modelos necesitan una historia de meses consecutivos (un filtro global de
+            # mes la corta)
+            periodos_consecutivos = np.all(np.diff(tensores['periodos']) == 1)
+            if len(tensores['periodos']) < 12 or not periodos_consecutivos:
+                st.info("El pronóstico necesita al menos 12 meses consecutivos de historia; "
+                        "quite el filtro global de mes para verlo.")
+            else:
+                col1, col2, col3 = st.columns(3)
+                with col1:
+                    modelo_pronostico = st.selectbox("Modelo de pronóstico:", list(pronostico_demanda.MODELOS),
+                                                     format_func=lambda x: pronostico_demanda.MODELOS[x],
+                                                     index=1, key="pronostico_modelo")
+                with col2:
+                    horizonte_pronostico = st.slider("Meses a pronosticar:", 3, 24, 12, key="pronostico_horizonte")
+                with col3:
+                    nivel_pronostico = st.selectbox("Nivel del intervalo:", [0.8, 0.9, 0.95], index=1,
+                                                    format_func=lambda x: f"{x:.0%}", key="pronostico_nivel")
+            
+                pronostico = pronosticar_demanda(data['HUELLA'], horizonte_pronostico, modelo_pronostico,
+                                                 nivel_pronostico, tensores)
+            
+                fig_pronostico = go.Figure()
+                for variable, nombre, color in [('demanda_min', 'Demanda Mínima', 'orange'),
+                                                ('demanda_max', 'Demanda Máxima', 'red')]:
+                    fig_pronostico.add_trace(series.traza_serie(tensores['periodos'], tensores[variable][p],
+                                                                name=f"{nombre} (Histórica)", line=dict(color=color)))
+                    fig_pronostico.add_trace(go.Scatter(x=pronostico['futuros'], y=pronostico[variable]['superior'][p],
+                                                        line=dict(width=0), showlegend=False, hoverinfo='skip'))
+                    fig_pronostico.add_trace(go.Scatter(x=pronostico['futuros'], y=pronostico[variable]['inferior'][p],
+                                                        line=dict(width=0), fill='tonexty',
+                                                        fillcolor='rgba(128,128,128,0.2)',
+                                                        name=f"Intervalo {nombre}"))
+                    fig_pronostico.add_trace(go.Scatter(x=pronostico['futuros'], y=pronostico[variable]['pronostico'][p],
+                                                        name=f"{nombre} (Pronóstico)", line=dict(color=color, dash='dash')))
+                fig_pronostico.update_layout(title=f"Pronóstico de Demanda - {producto_demanda} - {pronostico_demanda.MODELOS[modelo_pronostico]}",
+                                             xaxis_title="Período", yaxis_title="Unidades")
+                grafico(fig_pronostico, use_container_width=True)
+            
+                # Filas futuras de DAT_PM_MATRIX para el modelo de planificación
+                filas_futuras = pronostico_demanda.filas_pm_matrix(pronostico, tensores)
+                st.download_button("⬇️ Descargar pronóstico como filas DAT_PM_MATRIX (CSV)",
+                                   filas_futuras.to_csv(index=False).encode('utf-8'),
+                                   file_name=f"DAT_PM_MATRIX_pronostico_{modelo_pronostico}.csv",
+                                   mime="text/csv", key="pronostico_descarga")
+            
+            # Tabla de datos de demanda
+            st.subheader("📋 Datos Detallados de Demanda")
+            columnas_a_mostrar = ['Mes', 'DemandaMinima', 'DemandaMaxima', 'PrecioVenta', 'CostoInsumo']
+            columnas_disponibles = [col for col in columnas_a_mostrar if col in demanda_filtrada.columns]
+            tabla(demanda_filtrada[columnas_disponibles])
@@ -0,0 +1,140 @@
+import pandas as pd
+import plotly.express as px
+import plotly.graph_objects as go
+import streamlit as st
+
+from icatex import motores, pronostico_stock, series
+from icatex.datos import nombres_insumos
+from secciones.comun import (datos_actuales, tensores_actuales, rango_zoom, pronosticar_stock,
+                             corte, perfilada, grafico, tabla)
+
+# Calentamiento en segundo plano: quiebres de stock con el horizonte y la tendencia por defecto
+def calentar(data):
+    tensores = motores.tensores(data['HUELLA'], data)
+    motores.quiebres_stock(data['HUELLA'], tensores, 12, True)
+
+# ===== SECCIÓN 3: INSUMOS =====
+@st.fragment
+@perfilada('insumos')
+def mostrar():
+    data = datos_actuales()
+    tensores = tensores_actuales()
+    st.header("📦 Gestión de Insumos y Materiales")
+    
+    if not data['DAT_KM_MATRIX'].empty:
+        # Ranking de insumos en riesgo (todos los insumos ajustados en una sola pasada)
+        st.subheader("⚠️ Insumos en Riesgo de Quiebre de Stock")
+        col1, col2 = st.columns(2)
+        with col1:
+            horizonte_stock = st.selectbox("Horizonte de proyección (meses):", [6, 12, 24], index=1, key="stock_horizonte")
+        with col2:
+            tendencia_estacional = st.checkbox("Tendencia con estacionalidad mensual", value=True, key="stock_estacional")
+        
+        prediccion_stock = pronosticar_stock(data['HUELLA'], horizonte_stock, tendencia_estacional, tensores)
+        ranking_stock = pronostico_stock.ranking_riesgo(prediccion_stock, tensores, nombres_insumos)
+        
+        en_riesgo = ranking_stock[ranking_stock['En_Riesgo']]
+        if not en_riesgo.empty:
+            st.error(f"❌ {len(en_riesgo)} insumos proyectan quiebre de stock en los próximos {horizonte_stock} meses")
+        else:
+            st.success(f"✅ Ningún insumo proyecta quiebre de stock en los próximos {horizonte_stock} meses")
+        tabla(ranking_stock)
+        
+        # Selector de insumo - mostrar nombres en lugar de códigos
+        insumos_options = [(cod, nombres_insumos.get(cod, cod)) for cod in data['SET_INSUMOS']['ID_Insumo'].tolist()]
+        insumo_seleccionado_cod = st.selectbox(
+            "Selecciona un insumo:", 
+            options=[opt[0] for opt in insumos_options],
+            format_func=lambda x: next((name for cod, name in insumos_options if cod == x), x)
+        )
+        
+        if insumo_seleccionado_cod:
+            nombre_insumo = nombres_insumos.get(insumo_seleccionado_cod, insumo_seleccionado_cod)
+            
+            # Filtrar datos del insumo seleccionado
+            insumo_data = corte(data['HUELLA'], 'DAT_KM_MATRIX', insumos=(insumo_seleccionado_cod,))
+            
+            col1, col2, col3, col4 = st.columns(4)
+            with col1:
+                stock_promedio = insumo_data['StockDisponible'].mean()
+                st.metric("Stock Promedio", f"{stock_promedio:,.0f} unidades")
+            with col2:
+                stock_max = insumo_data['StockDisponible'].max()
+                st.metric("Stock Máximo", f"{stock_max:,.0f} unidades")
+            with col3:
+                stock_min = insumo_data['StockDisponible'].min()
+                st.metric("Stock Mínimo", f"{stock_min:,.0f} unidades")
+            with col4:
+                uso_minimo = insumo_data['UsoMinimo'].mean()
+                st.metric("Uso Mínimo Promedio", f"{uso_minimo:,.0f} unidades")
+            
+            st.subheader(f"📊 Evolución de Stock - {nombre_insumo}")
+            
+            # Gráfico de stock disponible por período
+            fig_stock = px.area(insumo_data, x='Periodo_Index', y='StockDisponible',
+                               title=f"Stock Disponible de {nombre_insumo} por Período",
+                               labels={'StockDisponible': 'Stock Disponible', 'Periodo_Index': 'Período'})
+            grafico(fig_stock, use_container_width=True)
+            
+            # Uso en productos
+            st.subheader("👕 Productos que utilizan este insumo")
+            if not data['DAT_PI_MATRIX'].empty:
+                productos_uso = []
+                for _, row in data['DAT_PI_MATRIX'].iterrows():
+                    if row[insumo_seleccionado_cod] > 0:
+                        producto_nombre = data['DAT_PRODUCTOS_FIJOS'][
+                            data['DAT_PRODUCTOS_FIJOS']['ID_Producto'] == row['ID_Producto']
+                        ]['Nombre_Producto'].iloc[0]
+                        productos_uso.append({
+                            'Producto': producto_nombre,
+                            'Cantidad_Usada': row[insumo_seleccionado_cod]
+                        })
+                
+                if productos_uso:
+                    df_uso = pd.DataFrame(productos_uso)
+                    
+                    col1, col2 = st.columns(2)
+                    
+                    with col1:
+                        fig_uso = px.bar(df_uso, x='Producto', y='Cantidad_Usada',
+                                        title=f"Uso de {nombre_insumo} en Productos",
+                                        color='Producto')
+                        fig_uso.update_layout(xaxis_tickangle=-45)
+                        grafico(fig_uso, use_container_width=True)
+                    
+                    with col2:
+                        fig_uso_pie = px.pie(df_uso, values='Cantidad_Usada', names='Producto',
+                                            title=f"Distribución de Uso - {nombre_insumo}")
+                        grafico(fig_uso_pie, use_container_width=True)
+            
+            # Análisis de tendencias de stock
+            st.subheader("📈 Análisis de Tendencia de Stock")
+            
+            # Tendencia tomada del ajuste conjunto de todos los insumos
+            i = tensores['insumos'].tolist().index(insumo_seleccionado_cod)
+            rango = rango_zoom("tendencia_stock", tensores['periodos'])
+            
+            fig_tendencia = go.Figure()
+            fig_tendencia.add_trace(series.traza_serie(tensores['periodos'], 
+                                             tensores['stock'][i], rango=rango,
+                                             name='Stock Real',
+                                             line=dict(color='blue')))
+            fig_tendencia.add_trace(series.traza_serie(tensores['periodos'], 
+                                             prediccion_stock['ajuste']['ajustado'][i], rango=rango,
+                                             name='Tendencia',
+                                             line=dict(color='red', dash='dash')))
+            fig_tendencia.add_trace(go.Scatter(x=prediccion_stock['futuros'], 
+                                             y=prediccion_stock['stock_proyectado'][i],
+                                             name='Stock Proyectado',
+                                             line=dict(color='purple', dash='dot')))
+            fig_tendencia.add_trace(go.Scatter(x=prediccion_stock['futuros'], 
+                                             y=prediccion_stock['consumo'][i],
+                                             name='Consumo Proyectado del Plan',
+                                             line=dict(color='orange')))
+            fig_tendencia.update_layout(title=f"Tendencia de Stock - {nombre_insumo}",
+                                       xaxis_title="Período", yaxis_title="Stock")
+            grafico(fig_tendencia, use_container_width=True)
+            
+            # Tabla de datos del insumo
+            st.subheader("📋 Datos Detallados del Insumo")
+            tabla(insumo_data[['Periodo_Index', 'StockDisponible', 'UsoMinimo']])
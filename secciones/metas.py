@@ -0,0 +1,210 @@
+import plotly.graph_objects as go
+import streamlit as st
+
+from icatex import escenarios
+from icatex.escenarios import METAS_LINGO
+from icatex.objetivo import META_HORAS_EXTRA, META_UTILIDAD, cumplimiento_metas
+from secciones.comun import ESCENARIOS, datos_base, format_currency, perfilada, grafico
+
+# ===== SECCIÓN 9: PROGRAMACIÓN POR METAS =====
+@st.fragment
+@perfilada('metas')
+def mostrar():
+    st.header("🎯 Análisis de Cumplimiento de Metas Estratégicas")
+    st.markdown("""
+    Este módulo evalúa el desempeño de la empresa frente a objetivos conflictivos utilizando el enfoque de 
+    **Programación por Metas**, que permite balancear múltiples objetivos estratégicos simultáneamente.
+    """)
+    
+    # Resultados del modelo LINGO (escenario de referencia armado en memoria a partir del
+    # dataset) o de cualquier escenario guardado desde las simulaciones
+    st.subheader("📊 Resultados del Modelo de Programación por Metas")
+    referencia = escenarios.referencia_metas_lingo(datos_base())
+    guardados = escenarios.listar(ESCENARIOS)
+    opciones = [METAS_LINGO] + [e for e in (guardados['Escenario'].tolist() if not guardados.empty else [])
+                                if e != METAS_LINGO]
+    nombre_escenario = st.selectbox("Escenario:", opciones, index=0, key="metas_escenario")
+    if nombre_escenario == METAS_LINGO:
+        kpis = referencia['kpis']
+        if st.button("💾 Guardar en el almacén de escenarios", key="metas_guardar"):
+            try:
+                escenarios.guardar_escenario(ESCENARIOS, METAS_LINGO, solucionador=referencia['solucionador'],
+                                             kpis=kpis, huella=referencia['huella'])
+                st.success(f"Escenario «{METAS_LINGO}» guardado en {ESCENARIOS}")
+            except OSError as e:
+                st.error(f"No se pudo guardar el escenario: {e}")
+    else:
+        kpis = guardados.set_index('Escenario').loc[nombre_escenario].to_dict()
+
+    # Metas establecidas en LINGO
+    meta_utilidad = META_UTILIDAD
+    meta_he = META_HORAS_EXTRA
+
+    # Logros y desviaciones del escenario (D_UTIL_NEG y D_HE_POS)
+    logro_utilidad = kpis['Z']
+    logro_he = kpis['Horas_Extra']
+    falta_utilidad = max(meta_utilidad - logro_utilidad, 0.0)
+    exceso_he = max(logro_he - meta_he, 0.0)
+
+    col1, col2 = st.columns(2)
+
+    with col1:
+        st.subheader("💰 Meta Financiera")
+        fig_util = go.Figure(go.Indicator(
+            mode = "number+gauge+delta",
+            value = logro_utilidad,
+            domain = {'x': [0, 1], 'y': [0, 1]},
+            title = {'text': "Utilidad Alcanzada ($)"},
+            delta = {'reference': meta_utilidad, 'relative': False},
+            gauge = {
+                'axis': {'range': [None, meta_utilidad * 1.2]},
+                'bar': {'color': "darkblue"},
+                'steps': [
+                    {'range': [0, meta_utilidad * 0.8], 'color': "lightgray"},
+                    {'range': [meta_utilidad * 0.8, meta_utilidad], 'color': "lightgreen"}],
+                'threshold': {
+                    'line': {'color': "red", 'width': 4},
+                    'thickness': 0.75,
+                    'value': meta_utilidad}}))
+        fig_util.update_layout(height=300)
+        grafico(fig_util, use_container_width=True)
+        
+        st.metric("Utilidad Alcanzada", format_currency(logro_utilidad), 
+                 delta=f"-{format_currency(falta_utilidad)}", delta_color="inverse")
+        st.metric("Meta de Utilidad", format_currency(meta_utilidad))
+        
+        if falta_utilidad > 0:
+            st.error(f"❌ No se alcanzó la meta por {format_currency(falta_utilidad)}")
+            st.info(f"**Cumplimiento:** {(logro_utilidad/meta_utilidad*100):.1f}%")
+        else:
+            st.success("✅ ¡Meta Financiera Cumplida!")
+
+    with col2:
+        st.subheader("👷 Meta Laboral (Horas Extras)")
+        # Gráfico de barras simple para comparar
+        fig_he = go.Figure(data=[
+            go.Bar(name='Meta Máxima', x=['Horas Extras'], y=[meta_he], marker_color='green', width=0.3),
+            go.Bar(name='Real Usado', x=['Horas Extras'], y=[logro_he], 
+                  marker_color='red', width=0.3)
+        ])
+        fig_he.update_layout(
+            title_text='Uso de Horas Extras (Minutos)',
+            yaxis_title="Minutos",
+            height=300
+        )
+        grafico(fig_he, use_container_width=True)
+        
+        st.metric("Horas Extra Utilizadas", f"{logro_he:,.0f} min", 
+                 delta=f"+{exceso_he:,.0f} min", delta_color="inverse")
+        st.metric("Límite de Horas Extra", f"{meta_he:,.0f} min")
+        
+        if exceso_he > 0:
+            st.error(f"❌ Se excedió el límite de fatiga laboral en {exceso_he:,.0f} minutos.")
+            st.info(f"**Exceso:** {(exceso_he/meta_he*100):.1f}% sobre la meta")
+        else:
+            st.success("✅ ¡Meta Laboral Cumplida!")
+    
+    # Análisis de trade-offs
+    st.markdown("---")
+    st.subheader("⚖️ Análisis de Trade-offs Estratégicos")
+    
+    col1, col2 = st.columns(2)
+    
+    with col1:
+        st.markdown(f"""
+        ### 🎯 Enfoque de Programación por Metas
+        
+        **Objetivos en Conflicto:**
+        - 📈 **Maximizar utilidades** (Meta: $12,000,000)
+        - 👷 **Minimizar horas extra** (Meta: 50,000 min)
+        
+        **Resultados del Modelo:**
+        - Utilidad Alcanzada: ${logro_utilidad:,.0f}
+        - Horas Extra Utilizadas: {logro_he:,.0f} min
+        
+        **Interpretación:**
+        El modelo priorizó el bienestar laboral (peso 5) sobre la utilidad (peso 1), 
+        pero aun así se excedió enormemente en horas extra. Esto indica que las restricciones 
+        operativas y de demanda obligaron a usar horas extra masivamente.
+        """)
+    
+    with col2:
+        # Gráfico de trade-off conceptual
+        fig_tradeoff = go.Figure()
+        
+        # Puntos conceptuales de diferentes estrategias
+        estrategias = ['Solo Utilidad', 'Balanceado (Modelo)', 'Solo Bienestar']
+        utilidades = [13000000, logro_utilidad, 9000000]
+        horas_extra = [80000, logro_he, 30000]
+        
+        fig_tradeoff.add_trace(go.Scatter(
+            x=horas_extra, y=utilidades, text=estrategias,
+            mode='markers+text', textposition='top center',
+            marker=dict(size=15, color=['red', 'blue', 'green'])
+        ))
+        
+        fig_tradeoff.update_layout(
+            title="Trade-off: Utilidad vs Horas Extra",
+            xaxis_title="Horas Extra (minutos)",
+            yaxis_title="Utilidad ($)",
+            height=400
+        )
+        grafico(fig_tradeoff, use_container_width=True)
+    
+    # Resumen ejecutivo
+    st.markdown("---")
+    st.subheader("📋 Resumen Ejecutivo de Cumplimiento")
+    
+    # Puntuación general ponderada según la función objetivo (5:1 a favor de horas extra)
+    cumplimiento = cumplimiento_metas(logro_utilidad, logro_he)
+    cumplimiento_utilidad = cumplimiento['Cumplimiento_Utilidad_%']
+    cumplimiento_he = cumplimiento['Cumplimiento_Horas_Extra_%']
+    puntuacion_general = cumplimiento['Puntuacion_Ponderada_%']
+    
+    col1, col2, col3 = st.columns(3)
+    
+    with col1:
+        st.metric("Cumplimiento Meta Utilidad", f"{cumplimiento_utilidad:.1f}%")
+    
+    with col2:
+        st.metric("Cumplimiento Meta Horas Extra", f"{cumplimiento_he:.1f}%")
+    
+    with col3:
+        st.metric("Puntuación General Ponderada", f"{puntuacion_general:.1f}%")
+    
+    # Recomendaciones basadas en el análisis
+    st.markdown("### 💡 Recomendaciones Estratégicas")
+    
+    st.warning("""
+    **Escenario: Baja Utilidad + Exceso Extremo de Horas Extra**
+    
+    **Diagnóstico:** 
+    - La empresa no pudo acercarse a la meta de utilidad y tuvo un exceso masivo de horas extra.
+    - Esto indica graves cuellos de botella en la capacidad productiva y posiblemente una demanda muy por encima de la capacidad.
+    
+    **Recomendaciones:**
+    - 🔧 **Inversión en Capacidad:** Urgente necesidad de expandir la capacidad productiva permanente.
+    - 📊 **Revisión de Metas:** Las metas actuales pueden ser poco realistas dadas las restricciones operativas.
+    - 🔄 **Revisión de Prioridades:** Repensar la ponderación de metas: ¿es realista priorizar tanto las horas extra si la demanda es tan alta?
+    - 🏭 **Automatización:** Evaluar inversiones en automatización para reducir la dependencia de horas extra.
+    """)
+    
+    # Explicación del modelo
+    st.markdown("---")
+    st.subheader("🔍 Explicación del Modelo LINGO")
+    
+    st.markdown(f"""
+    **Función Objetivo del Modelo:**
+    ```
+    MIN = (1 × D_UTIL_NEG) + (5 × D_HE_POS)
+    ```
+    
+    **Donde:**
+    - **D_UTIL_NEG**: Desviación negativa de la meta de utilidad (${falta_utilidad:,.2f})
+    - **D_HE_POS**: Desviación positiva de la meta de horas extra ({exceso_he:,.0f} min)
+    - **Pesos**: 5:1 a favor del bienestar laboral sobre la utilidad
+    
+    **Restricciones de Metas:**
+    1. Utilidad: Ingresos - Costos + D_UTIL_NEG - D_UTIL_POS = 12,000,000
+    2. Horas Extra: Total Minutos Extra + D_HE_NEG - D_HE_POS = 50,000
+    """)
@@ -0,0 +1,425 @@
+import plotly.express as px
+import plotly.graph_objects as go
+import streamlit as st
+
+from icatex import motores, politicas_inventario, series
+from icatex.datos import nombres_procesos
+from secciones.comun import (datos_actuales, tensores_actuales, format_currency,
+                             rango_zoom, tabla_paginada, evaluar_politicas, valor_objetivo, corte,
+                             perfilada, grafico, tabla, comparacion_productos)
+
+# Calentamiento en segundo plano: función objetivo del plan y benchmark de políticas por defecto
+def calentar(data):
+    tensores = motores.tensores(data['HUELLA'], data)
+    motores.valor_objetivo(data['HUELLA'], tensores)
+    motores.politicas(data['HUELLA'], tensores, 'media', 20, 1)
+
+# ===== SECCIÓN 7: MODELO DE OPTIMIZACIÓN =====
+@st.fragment
+@perfilada('modelo')
+def mostrar():
+    data = datos_actuales()
+    st.header("🔍 Modelo de Optimización LINGO")
+    
+    st.markdown("""
+    ### 📋 Descripción Detallada del Modelo de Optimización
+    
+    El modelo implementado en LINGO resuelve el problema de planificación de producción para maximizar 
+    la rentabilidad de ICATEX considerando todas las restricciones operativas y de mercado.
+    """)
+    
+    # Explicación detallada de la función objetivo
+    st.subheader("🎯 Función Objetivo Detallada")
+    
+    st.markdown(r"""
+    **MAXIMIZAR:** 
+    ```
+    Z = ∑(i∈PRODUCTOS, t∈PERIODOS) [PrecioVenta(i,t) × Ventas(i,t)] 
+        - ∑(i∈PRODUCTOS, t∈PERIODOS) [CostoInsumo(i,t) × Produccion(i,t)]
+        - ∑(i∈PRODUCTOS, t∈PERIODOS) [CostoAlmacen(i) × Inventario(i,t)]
+        - ∑(p∈PROCESOS, t∈PERIODOS) [CostoHoraExtra(p,t) × HorasExtrasMinutos(p,t)]
+    ```
+    
+    **Donde:**
+    - **Ingresos por Ventas:** $\sum_{i=1}^{20} \sum_{t=1}^{48} PrecioVenta_{i,t} \times Ventas_{i,t}$
+    - **Costos de Insumos:** $\sum_{i=1}^{20} \sum_{t=1}^{48} CostoInsumo_{i,t} \times Produccion_{i,t}$
+    - **Costos de Almacenamiento:** $\sum_{i=1}^{20} \sum_{t=1}^{48} CostoAlmacen_i \times Inventario_{i,t}$
+    - **Costos de Horas Extra:** $\sum_{p=1}^{5} \sum_{t=1}^{48} CostoHoraExtra_{p,t} \times HorasExtrasMinutos_{p,t}$
+    """)
+    
+    # Restricciones detalladas
+    st.subheader("⚖️ Restricciones del Modelo")
+    
+    col1, col2 = st.columns(2)
+    
+    with col1:
+        st.markdown("""
+        **1. Balance de Inventarios:**
+        ```
+        Para t = 1:
+        Inventario(i,1) = StockInicial(i) + Produccion(i,1) - Ventas(i,1)
+        
+        Para t > 1:
+        Inventario(i,t) = Inventario(i,t-1) + Produccion(i,t) - Ventas(i,t)
+        ```
+        
+        **2. Límites de Mercado:**
+        ```
+        DemandaMinima(i,t) ≤ Ventas(i,t) ≤ DemandaMaxima(i,t)
+        ```
+        """)
+    
+    with col2:
+        st.markdown("""
+        **3. Capacidad de Procesos:**
+        ```
+        ∑(i∈PRODUCTOS) [TiempoProceso(i,p) × Produccion(i,t)] 
+        ≤ CapacidadMinutos(p,t) × EficienciaOperativa + HorasExtrasMinutos(p,t)
+        ```
+        
+        **4. Disponibilidad de Insumos:**
+        ```
+        ∑(i∈PRODUCTOS) [ConsumoInsumo(i,k) × Produccion(i,t)] ≤ StockDisponible(k,t)
+        ```
+        
+        **5. No Negatividad:**
+        ```
+        Produccion(i,t) ≥ 0, Ventas(i,t) ≥ 0, Inventario(i,t) ≥ 0
+        ```
+        """)
+    
+    # Resultados de la optimización - MEJORADO
+    st.subheader("📈 Resultados de la Optimización")
+    
+    # Mostrar valor de la función objetivo si está disponible
+    st.markdown("### 🎯 Valor de la Función Objetivo")
+    
+    # Función objetivo evaluada sobre el plan de LINGO (precalculada en segundo plano)
+    valor_z = 0
+    resultados_disponibles = not data['RES_PRODUCCION'].empty
+    
+    if resultados_disponibles:
+        objetivo = valor_objetivo(data['HUELLA'], tensores_actuales())
+        valor_z = objetivo['Z']
+        st.success(f"**Valor óptimo de Z:** {format_currency(valor_z)}")
+        col1, col2, col3, col4 = st.columns(4)
+        col1.metric("Ingresos", format_currency(objetivo['Ingresos']))
+        col2.metric("Costo de Insumos", format_currency(objetivo['Costo_Insumos']))
+        col3.metric("Costo de Almacenamiento", format_currency(objetivo['Costo_Almacenamiento']))
+        col4.metric("Costo de Horas Extra", format_currency(objetivo['Costo_Horas_Extra']))
+    else:
+        st.warning("Ejecute el modelo en LINGO para obtener el valor de la función objetivo")
+    
+    # Mostrar resultados detallados
+    st.markdown("### 📊 Resultados Detallados")
+    
+    # Pestañas de resultados: solo se ejecuta la pestaña visible
+    pestaña = st.radio("Resultados:", list(PESTAÑAS_MODELO), horizontal=True,
+                       label_visibility="collapsed", key="modelo_pestaña")
+    PESTAÑAS_MODELO[pestaña]()
+    
+    # Resumen ejecutivo
+    st.markdown("### 📋 Resumen Ejecutivo")
+    
+    if resultados_disponibles:
+        col1, col2, col3, col4 = st.columns(4)
+        
+        with col1:
+            if not data['RES_PRODUCCION'].empty:
+                produccion_total = data['RES_PRODUCCION']['Produccion'].sum()
+                st.metric("Producción Total", f"{produccion_total:,.0f} uds")
+        
+        with col2:
+            if not data['RES_VENTAS'].empty:
+                ventas_total = data['RES_VENTAS']['Ventas'].sum()
+                st.metric("Ventas Totales", f"{ventas_total:,.0f} uds")
+        
+        with col3:
+            if not data['RES_INVENTARIO'].empty:
+                inventario_promedio = data['RES_INVENTARIO']['Inventario'].mean()
+                st.metric("Inventario Promedio", f"{inventario_promedio:,.0f} uds")
+        
+        with col4:
+            st.metric("Utilidad Total", format_currency(valor_z))
+    else:
+        st.info("Ejecute el modelo en LINGO para ver el resumen ejecutivo")
+
+# Resultado de una pestaña guardado en la sesión: solo el último de cada pestaña, que se
+# reutiliza mientras no cambien el dataset ni la selección
+def resultado_pestaña(pestaña, seleccion, calcular):
+    data = datos_actuales()
+    memoria = st.session_state.setdefault('resultados_modelo', {})
+    clave = (data['HUELLA'], seleccion)
+    if pestaña not in memoria or memoria[pestaña][0] != clave:
+        memoria[pestaña] = (clave, calcular())
+    return memoria[pestaña][1]
+
+# Pestañas de resultados del modelo (cada una se re-ejecuta por separado)
+@st.fragment
+@perfilada('modelo.pestaña_produccion')
+def pestaña_produccion():
+    data = datos_actuales()
+    tensores = tensores_actuales()
+    st.subheader("Plan de Producción Óptimo")
+    if not data['RES_PRODUCCION'].empty:
+        # Comparación del plan de producción de varios productos
+        if comparacion_productos('prod_opt', ('produccion',), ['Produccion_Total', 'Produccion_Promedio',
+                                 'Produccion_Maxima', 'Produccion_Minima'], 'Produccion_Total', "Producción"):
+            return
+        
+        # Selector de producto
+        productos_options = data['DAT_PRODUCTOS_FIJOS']['Nombre_Producto'].tolist()
+        producto_seleccionado = st.selectbox("Selecciona un producto:", productos_options, key="prod_opt")
+        
+        if producto_seleccionado:
+            producto_id = data['DAT_PRODUCTOS_FIJOS'][
+                data['DAT_PRODUCTOS_FIJOS']['Nombre_Producto'] == producto_seleccionado
+            ]['ID_Producto'].iloc[0]
+            
+            # Filtrar datos del producto seleccionado y construir su gráfico (una vez por sesión)
+            p = tensores['productos'].tolist().index(producto_id)
+            rango = rango_zoom("plan_produccion", tensores['periodos'])
+            def calcular():
+                filtrado = corte(data['HUELLA'], 'RES_PRODUCCION', productos=(producto_id,))
+                figura = go.Figure(series.traza_serie(tensores['periodos'], tensores['produccion'][p],
+                                                      rango=rango, name='Produccion'))
+                figura.update_layout(title=f"Producción Mensual - {producto_seleccionado}",
+                                     xaxis_title="Período", yaxis_title="Unidades")
+                return filtrado, figura
+            produccion_producto, fig_produccion = resultado_pestaña('produccion', (producto_id, rango), calcular)
+            
+            # Mostrar métricas
+            col1, col2, col3, col4 = st.columns(4)
+            with col1:
+                produccion_total = produccion_producto['Produccion'].sum()
+                st.metric("Producción Total", f"{produccion_total:,.0f} uds")
+            with col2:
+                produccion_promedio = produccion_producto['Produccion'].mean()
+                st.metric("Producción Promedio", f"{produccion_promedio:,.1f} uds/mes")
+            with col3:
+                produccion_max = produccion_producto['Produccion'].max()
+                st.metric("Producción Máxima", f"{produccion_max:,.0f} uds")
+            with col4:
+                produccion_min = produccion_producto['Produccion'].min()
+                st.metric("Producción Mínima", f"{produccion_min:,.0f} uds")
+            
+            # Gráfico de producción por período
+            grafico(fig_produccion, use_container_width=True)
+            
+            # Mostrar tabla detallada
+            st.subheader(f"📋 Plan de Producción Detallado - {producto_seleccionado}")
+            tabla_paginada(('produccion', producto_id), produccion_producto[['Periodo_Index', 'Produccion']],
+                           "tabla_produccion")
+    else:
+        st.info("Los resultados de producción se cargarán automáticamente desde LINGO")
+
+@st.fragment
+@perfilada('modelo.pestaña_ventas')
+def pestaña_ventas():
+    data = datos_actuales()
+    tensores = tensores_actuales()
+    st.subheader("Plan de Ventas Óptimo")
+    if not data['RES_VENTAS'].empty:
+        # Comparación del plan de ventas de varios productos
+        if comparacion_productos('ventas_opt', ('ventas',), ['Ventas_Total', 'Ingresos', 'Margen', 'Margen_%'],
+                                 'Ventas_Total', "Ventas"):
+            return
+        
+        # Selector de producto
+        productos_options = data['DAT_PRODUCTOS_FIJOS']['Nombre_Producto'].tolist()
+        producto_seleccionado = st.selectbox("Selecciona un producto:", productos_options, key="ventas_opt")
+        
+        if producto_seleccionado:
+            producto_id = data['DAT_PRODUCTOS_FIJOS'][
+                data['DAT_PRODUCTOS_FIJOS']['Nombre_Producto'] == producto_seleccionado
+            ]['ID_Producto'].iloc[0]
+            
+            # Filtrar datos del producto seleccionado y construir su gráfico (una vez por sesión)
+            p = tensores['productos'].tolist().index(producto_id)
+            rango = rango_zoom("plan_ventas", tensores['periodos'])
+            def calcular():
+                filtrado = corte(data['HUELLA'], 'RES_VENTAS', productos=(producto_id,))
+                figura = go.Figure(series.traza_serie(tensores['periodos'], tensores['ventas'][p],
+                                                      rango=rango, name='Ventas'))
+                figura.update_layout(title=f"Ventas Mensuales - {producto_seleccionado}",
+                                     xaxis_title="Período", yaxis_title="Unidades")
+                return filtrado, figura
+            ventas_producto, fig_ventas = resultado_pestaña('ventas', (producto_id, rango), calcular)
+            
+            # Mostrar métricas
+            col1, col2, col3, col4 = st.columns(4)
+            with col1:
+                ventas_total = ventas_producto['Ventas'].sum()
+                st.metric("Ventas Total", f"{ventas_total:,.0f} uds")
+            with col2:
+                ventas_promedio = ventas_producto['Ventas'].mean()
+                st.metric("Ventas Promedio", f"{ventas_promedio:,.1f} uds/mes")
+            with col3:
+                ventas_max = ventas_producto['Ventas'].max()
+                st.metric("Ventas Máxima", f"{ventas_max:,.0f} uds")
+            with col4:
+                ventas_min = ventas_producto['Ventas'].min()
+                st.metric("Ventas Mínima", f"{ventas_min:,.0f} uds")
+            
+            # Gráfico de ventas por período
+            grafico(fig_ventas, use_container_width=True)
+            
+            # Mostrar tabla detallada
+            st.subheader(f"📋 Plan de Ventas Detallado - {producto_seleccionado}")
+            tabla_paginada(('ventas', producto_id), ventas_producto[['Periodo_Index', 'Ventas']],
+                           "tabla_ventas")
+    else:
+        st.info("Los resultados de ventas se cargarán automáticamente desde LINGO")
+
+@st.fragment
+@perfilada('modelo.pestaña_inventario')
+def pestaña_inventario():
+    data = datos_actuales()
+    tensores = tensores_actuales()
+    st.subheader("Niveles de Inventario Óptimos")
+    if not data['RES_INVENTARIO'].empty:
+        # Comparación de los niveles de inventario de varios productos
+        if comparacion_productos('inv_opt', ('inventario',), ['Inventario_Promedio', 'Rotacion', 'Ventas_Total'],
+                                 'Rotacion', "Inventario"):
+            panel_politicas_inventario()
+            return
+        
+        # Selector de producto
+        productos_options = data['DAT_PRODUCTOS_FIJOS']['Nombre_Producto'].tolist()
+        producto_seleccionado = st.selectbox("Selecciona un producto:", productos_options, key="inv_opt")
+        
+        if producto_seleccionado:
+            producto_id = data['DAT_PRODUCTOS_FIJOS'][
+                data['DAT_PRODUCTOS_FIJOS']['Nombre_Producto'] == producto_seleccionado
+            ]['ID_Producto'].iloc[0]
+            
+            # Filtrar datos del producto seleccionado y construir su gráfico (una vez por sesión)
+            p = tensores['productos'].tolist().index(producto_id)
+            rango = rango_zoom("plan_inventario", tensores['periodos'])
+            def calcular():
+                filtrado = corte(data['HUELLA'], 'RES_INVENTARIO', productos=(producto_id,))
+                figura = go.Figure(series.traza_serie(tensores['periodos'], tensores['inventario'][p],
+                                                      rango=rango, name='Inventario', fill='tozeroy'))
+                figura.update_layout(title=f"Inventario Mensual - {producto_seleccionado}",
+                                     xaxis_title="Período", yaxis_title="Unidades")
+                return filtrado, figura
+            inventario_producto, fig_inventario = resultado_pestaña('inventario', (producto_id, rango), calcular)
+            
+            # Mostrar métricas
+            col1, col2, col3, col4 = st.columns(4)
+            with col1:
+                inventario_promedio = inventario_producto['Inventario'].mean()
+                st.metric("Inventario Promedio", f"{inventario_promedio:,.1f} uds")
+            with col2:
+                inventario_max = inventario_producto['Inventario'].max()
+                st.metric("Inventario Máximo", f"{inventario_max:,.0f} uds")
+            with col3:
+                inventario_min = inventario_producto['Inventario'].min()
+                st.metric("Inventario Mínimo", f"{inventario_min:,.0f} uds")
+            with col4:
+                # Calcular rotación si hay datos de ventas
+                if not data['RES_VENTAS'].empty:
+                    ventas_producto = corte(data['HUELLA'], 'RES_VENTAS', productos=(producto_id,))
+                    ventas_total = ventas_producto['Ventas'].sum()
+                    rotacion = ventas_total / inventario_promedio if inventario_promedio > 0 else 0
+                    st.metric("Rotación", f"{rotacion:.2f}")
+                else:
+                    st.metric("Rotación", "N/A")
+            
+            # Gráfico de inventario por período
+            grafico(fig_inventario, use_container_width=True)
+            
+            # Mostrar tabla detallada
+            st.subheader(f"📋 Niveles de Inventario Detallado - {producto_seleccionado}")
+            tabla_paginada(('inventario', producto_id), inventario_producto[['Periodo_Index', 'Inventario']],
+                           "tabla_inventario")
+        
+        # Benchmark de políticas simples frente al plan óptimo
+        panel_politicas_inventario()
+    else:
+        st.info("Los resultados de inventario se cargarán automáticamente desde LINGO")
+
+@st.fragment
+@perfilada('modelo.pestaña_horas_extra')
+def pestaña_horas_extra():
+    data = datos_actuales()
+    st.subheader("Horas Extra Requeridas")
+    if not data['RES_H_EXTRAS'].empty:
+        def calcular():
+            # Procesar resultados de horas extra
+            horas_extra_df = data['RES_H_EXTRAS'].copy()
+            
+            # Mapear los procesos a nombres
+            horas_extra_df['Proceso'] = horas_extra_df['ID_Proceso'].map(nombres_procesos)
+            
+            # Mostrar resumen gráfico
+            horas_resumen = horas_extra_df.groupby('Proceso')['HorasExtrasMinutos'].sum().reset_index()
+            
+            fig_horas = px.bar(horas_resumen, x='Proceso', y='HorasExtrasMinutos',
+                              title="Horas Extra Requeridas por Proceso",
+                              color='Proceso',
+                              labels={'HorasExtrasMinutos': 'Minutos de Horas Extra'})
+            return horas_extra_df, fig_horas
+        horas_extra_df, fig_horas = resultado_pestaña('horas_extra', None, calcular)
+        grafico(fig_horas, use_container_width=True)
+        
+        # Mostrar tabla detallada
+        tabla_paginada('horas_extra', horas_extra_df, "tabla_horas_extra")
+    else:
+        st.info("Los resultados de horas extra se cargarán automáticamente desde LINGO")
+
+# Benchmark de políticas de inventario frente al plan óptimo
+@st.fragment
+@perfilada('modelo.panel_politicas_inventario')
+def panel_politicas_inventario():
+    data = datos_actuales()
+    tensores = tensores_actuales()
+    st.subheader("🧪 Benchmark de Políticas de Inventario")
+
+    col1, col2, col3 = st.columns(3)
+    with col1:
+        origen_demanda = st.selectbox("Demanda de referencia:", ['media', 'minima', 'maxima', 'simulada'],
+                                      format_func=lambda x: {'media': 'Media de la banda',
+                                                             'minima': 'Demanda mínima',
+                                                             'maxima': 'Demanda máxima',
+                                                             'simulada': 'Simulada (uniforme en la banda)'}[x],
+                                      key="politicas_demanda")
+    with col2:
+        lead_time_politicas = st.slider("Tiempo de reposición (períodos):", 0, 4, 1, key="politicas_lead")
+    with col3:
+        replicas_politicas = st.slider("Réplicas simuladas:", 5, 50, 20, key="politicas_replicas",
+                                       disabled=origen_demanda != 'simulada')
+
+    resultado_politicas, indicadores_lp = evaluar_politicas(data['HUELLA'], origen_demanda,
+                                                            replicas_politicas, lead_time_politicas, tensores)
+    resultado_politicas['Tipo'] = resultado_politicas['Politica'].map(politicas_inventario.POLITICAS)
+
+    fig_politicas = px.scatter(resultado_politicas, x='Costo_Almacenamiento', y='Nivel_Servicio_%',
+                               color='Tipo', hover_data=['s', 'S', 'R', 'Rotacion'],
+                               title=f"Costo de Almacenamiento vs Nivel de Servicio ({len(resultado_politicas):,} combinaciones)",
+                               labels={'Costo_Almacenamiento': 'Costo de Almacenamiento ($)',
+                                       'Nivel_Servicio_%': 'Nivel de Servicio (%)'})
+    fig_politicas.add_trace(go.Scatter(x=[indicadores_lp['Costo_Almacenamiento']],
+                                       y=[indicadores_lp['Nivel_Servicio_%']],
+                                       mode='markers', name='Plan Óptimo LINGO',
+                                       marker=dict(size=15, color='black', symbol='star')))
+    grafico(fig_politicas, use_container_width=True)
+
+    col1, col2, col3 = st.columns(3)
+    with col1:
+        st.metric("Costo Almacenamiento Plan LINGO", format_currency(indicadores_lp['Costo_Almacenamiento']))
+    with col2:
+        st.metric("Nivel de Servicio Plan LINGO", f"{indicadores_lp['Nivel_Servicio_%']:.1f}%")
+    with col3:
+        st.metric("Rotación Plan LINGO", f"{indicadores_lp['Rotacion']:.2f}")
+
+    st.markdown("**Políticas eficientes (menor costo para cada nivel de servicio):**")
+    tabla(politicas_inventario.frontera_eficiente(resultado_politicas)[
+        ['Tipo', 's', 'S', 'R', 'Costo_Almacenamiento', 'Nivel_Servicio_%', 'Rotacion', 'Pedidos']])
+
+PESTAÑAS_MODELO = {
+    "📦 Producción": pestaña_produccion,
+    "🛒 Ventas": pestaña_ventas,
+    "📦 Inventario": pestaña_inventario,
+    "⏰ Horas Extra": pestaña_horas_extra,
+}
@@ -0,0 +1,76 @@
+import numpy as np
+import pandas as pd
+import plotly.express as px
+import plotly.graph_objects as go
+import streamlit as st
+
+from icatex import plantas
+from icatex.datos import nombres_procesos
+from secciones.comun import (comparacion_plantas, datos_plantas, format_currency, perfilada,
+                             grafico, tabla)
+
+# Figuras de la comparación: cada una es un corte de los arreglos apilados por planta
+def construir_fig_margen(comparacion, m):
+    margen = pd.DataFrame(comparacion['margen_porcentaje'][:, m].T, columns=comparacion['plantas'])
+    margen['Periodo_Index'] = comparacion['periodos'][m]
+    return px.line(margen, x='Periodo_Index', y=list(comparacion['plantas']),
+                   labels={'value': 'Margen %', 'variable': 'Planta'},
+                   title="Margen Porcentual por Periodo y Planta")
+
+def construir_fig_utilizacion(comparacion, m):
+    utilizacion = np.nanmean(comparacion['utilizacion'][:, :, m], axis=2)
+    procesos = [nombres_procesos.get(c, c) for c in comparacion['procesos']]
+    return px.imshow(utilizacion, x=procesos, y=list(comparacion['plantas']), text_auto='.0f',
+                     color_continuous_scale='RdYlGn_r', aspect='auto',
+                     labels={'color': 'Utilización %'},
+                     title="Utilización Media de la Capacidad por Proceso (%)")
+
+def construir_fig_horas_extra(comparacion, m):
+    horas_extra = comparacion['horas_extra'][:, :, m].sum(axis=2) / 60
+    fig = go.Figure()
+    for j, proceso in enumerate(comparacion['procesos']):
+        fig.add_trace(go.Bar(x=list(comparacion['plantas']), y=horas_extra[:, j],
+                             name=nombres_procesos.get(proceso, proceso)))
+    fig.update_layout(title="Horas Extra por Planta y Proceso", barmode='stack',
+                      yaxis_title="Horas")
+    return fig
+
+# ===== COMPARACIÓN DE PLANTAS =====
+@st.fragment
+@perfilada('plantas')
+def mostrar():
+    st.header("🏭 Comparación de Plantas")
+    datos, segundos = datos_plantas()
+    if len(datos) < 2:
+        st.info("Se necesitan al menos dos plantas para comparar (ICATEX_PLANTAS).")
+        return
+    comparacion = comparacion_plantas()
+
+    st.caption(f"{len(datos)} plantas cargadas en paralelo; la más lenta tardó "
+               f"{max(segundos.values()):.2f} s (suma de cargas {sum(segundos.values()):.2f} s)")
+
+    años = [None] + plantas.años(comparacion).tolist()
+    año = st.selectbox("Selecciona el año:", años, format_func=lambda a: "Todos" if a is None else str(a),
+                       key="plantas_year")
+    m = plantas.periodos_año(comparacion, año)
+    resumen = plantas.resumen_plantas(comparacion, año)
+
+    col1, col2, col3 = st.columns(3)
+    mejor = resumen.loc[resumen['Margen_%'].idxmax()]
+    with col1:
+        st.metric("Mejor Margen", f"{mejor['Planta']}", f"{mejor['Margen_%']:.1f}%")
+    with col2:
+        st.metric("Utilidad Total", format_currency(resumen['Utilidad'].sum()))
+    with col3:
+        st.metric("Horas Extra Totales", f"{resumen['HorasExtrasMinutos'].sum() / 60:,.0f} h")
+
+    grafico(construir_fig_margen(comparacion, m), use_container_width=True)
+
+    col1, col2 = st.columns(2)
+    with col1:
+        grafico(construir_fig_utilizacion(comparacion, m), use_container_width=True)
+    with col2:
+        grafico(construir_fig_horas_extra(comparacion, m), use_container_width=True)
+
+    st.subheader("📋 Resumen por Planta")
+    tabla(resumen.sort_values('Utilidad', ascending=False), use_container_width=True, hide_index=True)
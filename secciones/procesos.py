@@ -0,0 +1,121 @@
+import pandas as pd
+import plotly.express as px
+import streamlit as st
+
+from icatex.datos import nombres_procesos
+from secciones.comun import (datos_actuales, format_currency, corte, perfilada,
+                             grafico, tabla)
+
+# ===== SECCIÓN 4: PROCESOS =====
+@st.fragment
+@perfilada('procesos')
+def mostrar():
+    data = datos_actuales()
+    st.header("⚙️ Procesos Productivos")
+    
+    if not data['DAT_PJM_MATRIX'].empty:
+        # Selector de proceso - mostrar nombres en lugar de códigos
+        procesos_options = [(cod, nombres_procesos.get(cod, cod)) for cod in data['SET_PROCESOS']['ID_Proceso'].tolist()]
+        proceso_seleccionado_cod = st.selectbox(
+            "Selecciona un proceso:", 
+            options=[opt[0] for opt in procesos_options],
+            format_func=lambda x: next((name for cod, name in procesos_options if cod == x), x)
+        )
+        
+        if proceso_seleccionado_cod:
+            nombre_proceso = nombres_procesos.get(proceso_seleccionado_cod, proceso_seleccionado_cod)
+            
+            # Filtrar datos del proceso seleccionado
+            proceso_data = corte(data['HUELLA'], 'DAT_PJM_MATRIX', procesos=(proceso_seleccionado_cod,))
+            
+            # Métricas del proceso
+            col1, col2, col3, col4 = st.columns(4)
+            with col1:
+                capacidad_promedio = proceso_data['CapacidadMinutos'].mean()
+                st.metric("Capacidad Promedio", f"{capacidad_promedio:,.0f} min")
+            with col2:
+                costo_extra_promedio = proceso_data['CostoHoraExtra'].mean()
+                st.metric("Costo Hora Extra Promedio", format_currency(costo_extra_promedio))
+            with col3:
+                capacidad_max = proceso_data['CapacidadMinutos'].max()
+                st.metric("Capacidad Máxima", f"{capacidad_max:,.0f} min")
+            with col4:
+                capacidad_min = proceso_data['CapacidadMinutos'].min()
+                st.metric("Capacidad Mínima", f"{capacidad_min:,.0f} min")
+            
+            col1, col2 = st.columns(2)
+            
+            with col1:
+                # Capacidad por período
+                fig_capacidad = px.line(proceso_data, x='Periodo_Index', y='CapacidadMinutos',
+                                       title=f"Capacidad de {nombre_proceso}",
+                                       labels={'CapacidadMinutos': 'Capacidad (minutos)', 'Periodo_Index': 'Período'})
+                grafico(fig_capacidad, use_container_width=True)
+            
+            with col2:
+                # Costo de hora extra
+                fig_costo_extra = px.line(proceso_data, x='Periodo_Index', y='CostoHoraExtra',
+                                         title=f"Costo Hora Extra - {nombre_proceso}",
+                                         labels={'CostoHoraExtra': 'Costo Hora Extra ($)', 'Periodo_Index': 'Período'})
+                grafico(fig_costo_extra, use_container_width=True)
+            
+            # Productos que usan este proceso
+            st.subheader("👕 Productos que utilizan este proceso")
+            if not data['DAT_PP_MATRIX'].empty:
+                productos_proceso = []
+                for _, row in data['DAT_PP_MATRIX'].iterrows():
+                    if row[proceso_seleccionado_cod] > 0:
+                        producto_nombre = data['DAT_PRODUCTOS_FIJOS'][
+                            data['DAT_PRODUCTOS_FIJOS']['ID_Producto'] == row['ID_Producto']
+                        ]['Nombre_Producto'].iloc[0]
+                        productos_proceso.append({
+                            'Producto': producto_nombre,
+                            'Tiempo_Requerido': row[proceso_seleccionado_cod]
+                        })
+                
+                if productos_proceso:
+                    df_proceso = pd.DataFrame(productos_proceso)
+                    
+                    col1, col2 = st.columns(2)
+                    
+                    with col1:
+                        fig_proceso = px.bar(df_proceso, x='Producto', y='Tiempo_Requerido',
+                                            title=f"Tiempo en {nombre_proceso} por Producto",
+                                            color='Producto')
+                        fig_proceso.update_layout(xaxis_tickangle=-45)
+                        grafico(fig_proceso, use_container_width=True)
+                    
+                    with col2:
+                        # Tiempo total por producto
+                        fig_tiempo_total = px.pie(df_proceso, values='Tiempo_Requerido', names='Producto',
+                                                 title=f"Distribución de Tiempo Total - {nombre_proceso}")
+                        grafico(fig_tiempo_total, use_container_width=True)
+            
+            # Análisis comparativo de procesos
+            st.subheader("📊 Análisis Comparativo de Procesos")
+            
+            # Calcular métricas por proceso
+            procesos_comparativa = data['DAT_PJM_MATRIX'].groupby('ID_Proceso').agg({
+                'CapacidadMinutos': 'mean',
+                'CostoHoraExtra': 'mean'
+            }).reset_index()
+            
+            procesos_comparativa['Proceso'] = procesos_comparativa['ID_Proceso'].map(nombres_procesos)
+            
+            col1, col2 = st.columns(2)
+            
+            with col1:
+                fig_capacidad_comp = px.bar(procesos_comparativa, x='Proceso', y='CapacidadMinutos',
+                                           title="Capacidad Promedio por Proceso",
+                                           color='Proceso')
+                grafico(fig_capacidad_comp, use_container_width=True)
+            
+            with col2:
+                fig_costo_comp = px.bar(procesos_comparativa, x='Proceso', y='CostoHoraExtra',
+                                       title="Costo Hora Extra Promedio por Proceso",
+                                       color='Proceso')
+                grafico(fig_costo_comp, use_container_width=True)
+            
+            # Tabla de datos del proceso
+            st.subheader("📋 Datos Detallados del Proceso")
+            tabla(proceso_data[['Periodo_Index', 'CapacidadMinutos', 'CostoHoraExtra']])
@@ -0,0 +1,160 @@
+import pandas as pd
+import plotly.express as px
+import plotly.graph_objects as go
+import streamlit as st
+
+from icatex import cubo
+from icatex.datos import nombres_insumos, nombres_procesos
+from secciones.comun import (datos_actuales, cubo_actual, format_currency, corte, perfilada, grafico, tabla, comparacion_productos)
+
+# Indicadores del ranking en el modo de comparación
+INDICADORES_COMPARACION = ['Produccion_Total', 'Produccion_Promedio', 'Produccion_Maxima', 'Produccion_Minima',
+                           'Ventas_Total', 'Inventario_Promedio', 'Rotacion', 'Ingresos', 'Margen', 'Margen_%']
+
+# ===== SECCIÓN 2: PRODUCTOS =====
+@st.fragment
+@perfilada('productos')
+def mostrar():
+    data = datos_actuales()
+    cubo_agregados = cubo_actual()
+    st.header("👕 Análisis Detallado de Productos")
+    
+    if not data['DAT_PRODUCTOS_FIJOS'].empty:
+        # Comparación de varios productos: plan óptimo e indicadores de toda la selección
+        if comparacion_productos('productos', ('produccion', 'ventas', 'inventario'), INDICADORES_COMPARACION,
+                                 'Margen', "Plan por producto"):
+            return
+        
+        # Selector de producto - mostrar nombres en lugar de códigos
+        productos_options = data['DAT_PRODUCTOS_FIJOS']['Nombre_Producto'].tolist()
+        producto_seleccionado = st.selectbox("Selecciona un producto:", productos_options)
+        
+        if producto_seleccionado:
+            producto_info = data['DAT_PRODUCTOS_FIJOS'][data['DAT_PRODUCTOS_FIJOS']['Nombre_Producto'] == producto_seleccionado].iloc[0]
+            producto_id = producto_info['ID_Producto']
+            
+            col1, col2, col3, col4 = st.columns(4)
+            with col1:
+                st.metric("Categoría", producto_info['Categoria'])
+            with col2:
+                st.metric("Línea", producto_info['Linea'])
+            with col3:
+                st.metric("Tiempo Producción", f"{producto_info['TiempoProd_Total(min)']} min")
+            with col4:
+                st.metric("Costo Almacen", format_currency(producto_info['CostoAlmacen']))
+            
+            # Información de insumos del producto
+            st.subheader("📦 Insumos Requeridos")
+            if not data['DAT_PI_MATRIX'].empty:
+                # Filtrar insumos para el producto seleccionado
+                insumos_producto = corte(data['HUELLA'], 'DAT_PI_MATRIX', productos=(producto_id,))
+                
+                if not insumos_producto.empty:
+                    # Transformar datos para visualización
+                    insumos_data = []
+                    for col in insumos_producto.columns[1:]:  # Excluir ID_Producto
+                        cantidad = insumos_producto[col].iloc[0]
+                        if cantidad > 0:
+                            nombre_insumo = nombres_insumos.get(col, col)
+                            insumos_data.append({
+                                'Insumo': nombre_insumo,
+                                'Código': col,
+                                'Cantidad': cantidad
+                            })
+                    
+                    if insumos_data:
+                        df_insumos = pd.DataFrame(insumos_data)
+                        
+                        col1, col2 = st.columns(2)
+                        
+                        with col1:
+                            fig_insumos = px.bar(df_insumos, x='Insumo', y='Cantidad',
+                                                title=f"Insumos para {producto_seleccionado}",
+                                                color='Insumo')
+                            grafico(fig_insumos, use_container_width=True)
+                        
+                        with col2:
+                            fig_insumos_pie = px.pie(df_insumos, values='Cantidad', names='Insumo',
+                                                    title=f"Distribución de Insumos - {producto_seleccionado}")
+                            grafico(fig_insumos_pie, use_container_width=True)
+                        
+                        # Mostrar tabla detallada
+                        tabla(df_insumos[['Insumo', 'Código', 'Cantidad']])
+            
+            # Tiempos por proceso
+            st.subheader("⚙️ Tiempos por Proceso")
+            if not data['DAT_PP_MATRIX'].empty:
+                tiempos_proceso = corte(data['HUELLA'], 'DAT_PP_MATRIX', productos=(producto_id,))
+                
+                if not tiempos_proceso.empty:
+                    # Transformar datos para visualización
+                    procesos_data = []
+                    for col in tiempos_proceso.columns[1:]:  # Excluir ID_Producto
+                        tiempo = tiempos_proceso[col].iloc[0]
+                        nombre_proceso = nombres_procesos.get(col, col)
+                        procesos_data.append({
+                            'Proceso': nombre_proceso,
+                            'Código': col,
+                            'Tiempo_Minutos': tiempo
+                        })
+                    
+                    df_procesos = pd.DataFrame(procesos_data)
+                    
+                    col1, col2 = st.columns(2)
+                    
+                    with col1:
+                        fig_procesos = px.bar(df_procesos, x='Proceso', y='Tiempo_Minutos',
+                                             title=f"Tiempos de Proceso para {producto_seleccionado}",
+                                             color='Proceso')
+                        grafico(fig_procesos, use_container_width=True)
+                    
+                    with col2:
+                        fig_procesos_pie = px.pie(df_procesos, values='Tiempo_Minutos', names='Proceso',
+                                                 title=f"Distribución de Tiempos - {producto_seleccionado}")
+                        grafico(fig_procesos_pie, use_container_width=True)
+            
+            # Análisis histórico de demanda CON FILTRO POR AÑO
+            st.subheader("📈 Comportamiento Histórico de Demanda")
+            if not data['DAT_PM_MATRIX'].empty:
+                años_disponibles = cubo.años_disponibles(cubo_agregados, producto_id)
+                
+                if años_disponibles:
+                    # Filtro por año
+                    año_seleccionado = st.selectbox("Selecciona el año:", años_disponibles, key="demanda_year")
+                    
+                    demanda_filtrada = cubo.detalle_producto(cubo_agregados, producto_id, año_seleccionado)
+                    
+                    # Meses con datos en el año seleccionado
+                    meses_año = demanda_filtrada['Mes']
+                    
+                    fig_demanda = go.Figure()
+                    fig_demanda.add_trace(go.Scatter(x=meses_año, 
+                                                   y=demanda_filtrada['DemandaMinima'], 
+                                                   name='Demanda Mínima', 
+                                                   line=dict(color='orange'),
+                                                   fill=None))
+                    fig_demanda.add_trace(go.Scatter(x=meses_año, 
+                                                   y=demanda_filtrada['DemandaMaxima'], 
+                                                   name='Demanda Máxima', 
+                                                   line=dict(color='red'),
+                                                   fill='tonexty',
+                                                   fillcolor='rgba(255,0,0,0.1)'))
+                    fig_demanda.update_layout(title=f"Demanda Mínima y Máxima - {producto_seleccionado} - {año_seleccionado}",
+                                             xaxis_title="Mes", yaxis_title="Unidades",
+                                             showlegend=True)
+                    grafico(fig_demanda, use_container_width=True)
+                    
+                    # Evolución de precios y costos para el producto
+                    st.subheader("💰 Evolución de Precios y Costos")
+                    fig_precios_producto = go.Figure()
+                    fig_precios_producto.add_trace(go.Scatter(x=meses_año, 
+                                                            y=demanda_filtrada['PrecioVenta'], 
+                                                            name='Precio Venta', 
+                                                            line=dict(color='green')))
+                    fig_precios_producto.add_trace(go.Scatter(x=meses_año, 
+                                                            y=demanda_filtrada['CostoInsumo'], 
+                                                            name='Costo Insumo', 
+                                                            line=dict(color='red')))
+                    fig_precios_producto.update_layout(title=f"Precios y Costos - {producto_seleccionado} - {año_seleccionado}",
+                                                      xaxis_title="Mes", yaxis_title="Valor ($)")
+                    grafico(fig_precios_producto, use_container_width=True)
@@ -0,0 +1,112 @@
+import numpy as np
+import plotly.express as px
+import plotly.graph_objects as go
+import streamlit as st
+
+from icatex import motores, mrp, series
+from icatex.datos import nombres_insumos
+from secciones.comun import (datos_actuales, tensores_actuales, format_currency,
+                             rango_zoom, tabla_paginada, calcular_mrp, perfilada, grafico, tabla)
+
+# Calentamiento en segundo plano: explosión de materiales con el tiempo de entrega por defecto
+def calentar(data):
+    tensores = motores.tensores(data['HUELLA'], data)
+    motores.requerimientos(data['HUELLA'], tensores, 1)
+
+# ===== SECCIÓN 3B: REQUERIMIENTOS DE INSUMOS (MRP) =====
+@st.fragment
+@perfilada('requerimientos')
+def mostrar():
+    data = datos_actuales()
+    tensores = tensores_actuales()
+    st.header("🧾 Plan de Requerimientos de Insumos (MRP)")
+    
+    if not data['RES_PRODUCCION'].empty and not data['DAT_PI_MATRIX'].empty:
+        lead_time = st.slider("Tiempo de entrega de insumos (períodos):", 0, 6, 1, key="mrp_lead")
+        
+        resultado_mrp = calcular_mrp(data['HUELLA'], lead_time, tensores)
+        resumen_mrp = mrp.resumen_requerimientos(resultado_mrp, tensores, nombres_insumos)
+        
+        # Métricas globales del plan
+        col1, col2, col3, col4 = st.columns(4)
+        with col1:
+            st.metric("Insumos con Faltante", int((resumen_mrp['Periodos_Faltante'] > 0).sum()))
+        with col2:
+            st.metric("Períodos con Faltante", int(resumen_mrp['Periodos_Faltante'].sum()))
+        with col3:
+            st.metric("Costo de Insumos del Plan", format_currency(resumen_mrp['Costo_Asignado'].sum()))
+        with col4:
+            st.metric("Margen en Riesgo", format_currency(resumen_mrp['Exposicion'].sum()))
+        
+        # Mapa de cobertura: requerimiento como porcentaje del stock disponible
+        st.subheader("🗺️ Uso del Stock Disponible por Insumo y Período")
+        with np.errstate(divide='ignore', invalid='ignore'):
+            uso_stock = np.where(tensores['stock'] > 0,
+                                 resultado_mrp['requerido'] / tensores['stock'] * 100, 0)
+        fig_cobertura = px.imshow(uso_stock,
+                                  x=tensores['periodos'],
+                                  y=[nombres_insumos.get(i, i) for i in tensores['insumos']],
+                                  labels={'x': 'Período', 'y': 'Insumo', 'color': '% del Stock'},
+                                  color_continuous_scale='Reds', aspect='auto',
+                                  title="Requerimiento / Stock Disponible (%)")
+        grafico(fig_cobertura, use_container_width=True)
+        
+        # Tabla resumen por insumo
+        st.subheader("📋 Resumen de Requerimientos por Insumo")
+        tabla(resumen_mrp)
+        
+        faltantes = mrp.faltantes_requerimientos(resultado_mrp, tensores)
+        if not faltantes.empty:
+            st.subheader("🚨 Faltantes Detectados")
+            faltantes['Insumo'] = faltantes['ID_Insumo'].map(nombres_insumos)
+            tabla_paginada(('faltantes', lead_time), faltantes, "tabla_faltantes",
+                           orden='Exposicion', ascendente=False)
+        else:
+            st.success("✅ El stock disponible cubre el plan de producción en todos los períodos")
+        
+        # Detalle de un insumo
+        st.subheader("🔍 Detalle por Insumo")
+        insumo_mrp = st.selectbox(
+            "Selecciona un insumo:",
+            options=tensores['insumos'].tolist(),
+            format_func=lambda x: nombres_insumos.get(x, x),
+            key="mrp_insumo"
+        )
+        
+        if insumo_mrp:
+            i = tensores['insumos'].tolist().index(insumo_mrp)
+            nombre_insumo = nombres_insumos.get(insumo_mrp, insumo_mrp)
+            
+            rango = rango_zoom("mrp_requerimiento", tensores['periodos'])
+            
+            fig_req = go.Figure()
+            # Barras solo mientras la serie sea corta; las largas se dibujan como área reducida
+            if len(tensores['periodos']) <= series.UMBRAL_WEBGL:
+                fig_req.add_trace(go.Bar(x=tensores['periodos'], y=resultado_mrp['requerido'][i],
+                                         name='Requerimiento', marker_color='steelblue'))
+            else:
+                fig_req.add_trace(series.traza_serie(tensores['periodos'], resultado_mrp['requerido'][i],
+                                                     rango=rango, name='Requerimiento', fill='tozeroy',
+                                                     line=dict(color='steelblue')))
+            fig_req.add_trace(series.traza_serie(tensores['periodos'], tensores['stock'][i], rango=rango,
+                                                 name='Stock Disponible', line=dict(color='green')))
+            fig_req.add_trace(series.traza_serie(tensores['periodos'], tensores['uso_minimo'][i], rango=rango,
+                                                 name='Uso Mínimo', line=dict(color='orange', dash='dash')))
+            fig_req.update_layout(title=f"Requerimiento vs Stock - {nombre_insumo}",
+                                  xaxis_title="Período", yaxis_title="Unidades")
+            grafico(fig_req, use_container_width=True)
+            
+            contribucion = mrp.contribucion_productos(tensores, insumo_mrp)
+            if not contribucion.empty:
+                nombres_productos = data['DAT_PRODUCTOS_FIJOS'].set_index('ID_Producto')['Nombre_Producto']
+                contribucion_total = contribucion.sum(axis=1).rename('Requerido').reset_index()
+                contribucion_total.columns = ['ID_Producto', 'Requerido']
+                contribucion_total['Producto'] = contribucion_total['ID_Producto'].map(nombres_productos)
+                fig_contrib = px.bar(contribucion_total.sort_values('Requerido', ascending=False),
+                                     x='Producto', y='Requerido',
+                                     title=f"Requerimiento Total de {nombre_insumo} por Producto",
+                                     color='Producto')
+                fig_contrib.update_layout(xaxis_tickangle=-45)
+                grafico(fig_contrib, use_container_width=True)
+    else:
+        st.info("El plan de requerimientos necesita los resultados de producción de LINGO y la matriz de insumos")
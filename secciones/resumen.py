@@ -0,0 +1,118 @@
+from functools import partial
+
+import plotly.express as px
+import streamlit as st
+
+from icatex.figuras import figura_cacheada
+from secciones.comun import datos_actuales, perfilada, grafico, tabla
+
+# Figuras de la sección (dependen solo del libro cargado), por nombre
+def construir_fig_cat(data):
+    cat_dist = data['DAT_PRODUCTOS_FIJOS']['Categoria'].value_counts()
+    fig_cat = px.pie(values=cat_dist.values, names=cat_dist.index, 
+                    title="Distribución de Productos por Categoría",
+                    color_discrete_sequence=px.colors.qualitative.Set3)
+    fig_cat.update_traces(textposition='inside', textinfo='percent+label')
+    return fig_cat
+
+def construir_fig_linea(data):
+    linea_dist = data['DAT_PRODUCTOS_FIJOS']['Linea'].value_counts()
+    return px.bar(x=linea_dist.index, y=linea_dist.values,
+                  title="Productos por Línea de Producción",
+                  labels={'x': 'Línea', 'y': 'Cantidad de Productos'},
+                  color=linea_dist.index)
+
+def construir_fig_tiempos(data):
+    return px.box(data['DAT_PRODUCTOS_FIJOS'], y='TiempoProd_Total(min)', 
+                  title="Distribución de Tiempos de Producción Total")
+
+def construir_fig_tiempo_cat(data):
+    tiempo_categoria = data['DAT_PRODUCTOS_FIJOS'].groupby('Categoria')['TiempoProd_Total(min)'].mean().reset_index()
+    return px.bar(tiempo_categoria, x='Categoria', y='TiempoProd_Total(min)',
+                  title="Tiempo Promedio de Producción por Categoría",
+                  color='Categoria')
+
+def construir_fig_almacen(data):
+    costos_almacen = data['DAT_PRODUCTOS_FIJOS'][['Nombre_Producto', 'CostoAlmacen']].sort_values('CostoAlmacen', ascending=False)
+    fig_almacen = px.bar(costos_almacen, x='Nombre_Producto', y='CostoAlmacen',
+                        title="Costo de Almacenamiento por Producto",
+                        labels={'CostoAlmacen': 'Costo Almacenamiento ($)', 'Nombre_Producto': 'Producto'})
+    fig_almacen.update_layout(xaxis_tickangle=-45)
+    return fig_almacen
+
+FIGURAS = {
+    'categoria': construir_fig_cat,
+    'linea': construir_fig_linea,
+    'tiempos': construir_fig_tiempos,
+    'tiempo_categoria': construir_fig_tiempo_cat,
+    'almacen': construir_fig_almacen,
+}
+
+def figura(data, nombre):
+    return figura_cacheada(data['HUELLA'], 'resumen', nombre, partial(FIGURAS[nombre], data))
+
+# Calentamiento en segundo plano: todas las figuras de la sección
+def calentar(data):
+    if not data['DAT_PRODUCTOS_FIJOS'].empty:
+        for nombre in FIGURAS:
+            figura(data, nombre)
+
+# ===== SECCIÓN 1: RESUMEN GENERAL =====
+@st.fragment
+@perfilada('resumen')
+def mostrar():
+    data = datos_actuales()
+    st.header("📈 Resumen General - ICATEX")
+    
+    # Métricas clave
+    col1, col2, col3, col4 = st.columns(4)
+    
+    with col1:
+        total_productos = len(data['SET_PRODUCTOS'])
+        st.metric("Total de Productos", total_productos)
+    
+    with col2:
+        total_insumos = len(data['SET_INSUMOS'])
+        st.metric("Total de Insumos", total_insumos)
+    
+    with col3:
+        total_procesos = len(data['SET_PROCESOS'])
+        st.metric("Procesos Productivos", total_procesos)
+    
+    with col4:
+        total_periodos = len(data['SET_MESES'])
+        st.metric("Meses de Planificación", total_periodos)
+    
+    # Información de productos fijos
+    if not data['DAT_PRODUCTOS_FIJOS'].empty:
+        st.subheader("📦 Distribución de Productos")
+        
+        col1, col2 = st.columns(2)
+        
+        with col1:
+            # Distribución por categoría
+            grafico(figura(data, 'categoria'), use_container_width=True)
+        
+        with col2:
+            # Distribución por línea
+            grafico(figura(data, 'linea'), use_container_width=True)
+        
+        # Tiempos de producción
+        st.subheader("⏱️ Análisis de Tiempos de Producción")
+        
+        col1, col2 = st.columns(2)
+        
+        with col1:
+            grafico(figura(data, 'tiempos'), use_container_width=True)
+        
+        with col2:
+            # Tiempo promedio por categoría
+            grafico(figura(data, 'tiempo_categoria'), use_container_width=True)
+        
+        # Análisis de costos de almacenamiento
+        st.subheader("💰 Costos de Almacenamiento por Producto")
+        grafico(figura(data, 'almacen'), use_container_width=True)
+        
+        # Tabla resumen de productos
+        st.subheader("📋 Resumen de Productos")
+        tabla(data['DAT_PRODUCTOS_FIJOS'][['Nombre_Producto', 'Categoria', 'Linea', 'TiempoProd_Total(min)', 'CostoAlmacen']])
@@ -0,0 +1,331 @@
+import time
+
+import numpy as np
+import plotly.express as px
+import plotly.graph_objects as go
+import streamlit as st
+
+from icatex import escenarios, motores, precios
+from icatex.datos import nombres_procesos
+from secciones.comun import (ESCENARIOS, datos_actuales, tensores_actuales, format_currency,
+                             tabla_paginada, optimizar_precios, estimar_respuesta, corte, perfilada,
+                             grafico, tabla)
+
+# Calentamiento en segundo plano: precios óptimos del catálogo con los parámetros por defecto
+def calentar(data):
+    tensores = motores.tensores(data['HUELLA'], data)
+    motores.precios_optimos(data['HUELLA'], tensores, -1.5, 0.5, 1.5, False, True)
+
+# ===== SECCIÓN 8: SIMULACIONES =====
+@st.fragment
+@perfilada('simulaciones')
+def mostrar():
+    st.header("🎯 Simulador de Escenarios")
+    
+    st.info("""
+    **Simulador de Optimización de Producción**
+    Ajusta los parámetros para simular diferentes escenarios de producción y su impacto en costos y rentabilidad.
+    """)
+    
+    panel_simulador_producto()
+    
+    # Optimización de precios de todo el catálogo
+    st.markdown("---")
+    panel_precios_catalogo()
+
+    # Escenarios guardados y su comparación
+    st.markdown("---")
+    panel_escenarios()
+
+# Formulario para guardar en el almacén el escenario que arma `plan` (devuelve el plan,
+# los parámetros y los datos del motor); solo se calcula al enviarlo
+def formulario_escenario(clave, nombre_sugerido, plan):
+    with st.form(f"form_{clave}", clear_on_submit=False):
+        nombre = st.text_input("Nombre del escenario:", value=nombre_sugerido, key=f"nombre_{clave}")
+        if st.form_submit_button("💾 Guardar escenario"):
+            if not nombre.strip():
+                st.warning("El escenario necesita un nombre")
+                return
+            data = datos_actuales()
+            tensores = tensores_actuales()
+            inicio = time.perf_counter()
+            arreglos, parametros, solucionador = plan(tensores)
+            solucionador = dict(solucionador, segundos=time.perf_counter() - inicio)
+            escenarios.guardar_escenario(ESCENARIOS, nombre.strip(), tensores, arreglos, parametros,
+                                         solucionador, huella=data['HUELLA'])
+            st.success(f"Escenario «{nombre.strip()}» guardado")
+
+# Simulador de un producto (sus sliders solo re-ejecutan este panel)
+@st.fragment
+@perfilada('simulaciones.panel_simulador_producto')
+def panel_simulador_producto():
+    data = datos_actuales()
+    if data['DAT_PRODUCTOS_FIJOS'].empty:
+        st.warning("No hay productos cargados para simular")
+        return
+    tensores = tensores_actuales()
+    col1, col2 = st.columns(2)
+    
+    with col1:
+        # Parámetros de simulación
+        st.subheader("⚙️ Parámetros de Simulación")
+        
+        producto_sim = st.selectbox("Producto a simular:", 
+                                   data['DAT_PRODUCTOS_FIJOS']['Nombre_Producto'].tolist(),
+                                   key="sim_product")
+        
+        if producto_sim:
+            producto_id = data['DAT_PRODUCTOS_FIJOS'][data['DAT_PRODUCTOS_FIJOS']['Nombre_Producto'] == producto_sim].iloc[0]['ID_Producto']
+            producto_info = data['DAT_PRODUCTOS_FIJOS'][data['DAT_PRODUCTOS_FIJOS']['Nombre_Producto'] == producto_sim].iloc[0]
+            
+            # Obtener datos históricos
+            datos_historicos = corte(data['HUELLA'], 'DAT_PM_MATRIX', productos=(producto_id,))
+            
+            if not datos_historicos.empty:
+                # Calcular promedios históricos
+                precio_promedio = datos_historicos['PrecioVenta'].mean()
+                costo_promedio = datos_historicos['CostoInsumo'].mean()
+                demanda_min_promedio = datos_historicos['DemandaMinima'].mean()
+                demanda_max_promedio = datos_historicos['DemandaMaxima'].mean()
+                
+                st.metric("Precio Promedio Histórico", format_currency(precio_promedio))
+                st.metric("Costo Promedio Histórico", format_currency(costo_promedio))
+                st.metric("Demanda Mínima Promedio", f"{demanda_min_promedio:.0f} uds")
+                st.metric("Demanda Máxima Promedio", f"{demanda_max_promedio:.0f} uds")
+                
+                # Controles de simulación
+                st.subheader("🎛️ Ajustes de Simulación")
+                
+                nuevo_precio = st.slider("Nuevo precio de venta ($):", 
+                                        float(precio_promedio * 0.5), 
+                                        float(precio_promedio * 1.5), 
+                                        float(precio_promedio),
+                                        key="precio_sim")
+                
+                reduccion_costos = st.slider("Reducción en costos de insumos (%):", 0, 50, 0,
+                                           key="costo_sim")
+                
+                mejora_eficiencia = st.slider("Mejora en eficiencia de procesos (%):", 0, 30, 0,
+                                            key="eficiencia_sim")
+                
+                volumen_produccion = st.slider("Volumen de producción objetivo (unidades):", 
+                                             int(demanda_min_promedio), 
+                                             int(demanda_max_promedio * 1.2), 
+                                             int(demanda_min_promedio),
+                                             key="volumen_sim")
+    
+    with col2:
+        st.subheader("📊 Resultados de la Simulación")
+        
+        if producto_sim and not datos_historicos.empty:
+            # Cálculos de simulación
+            nuevo_costo = costo_promedio * (1 - reduccion_costos/100)
+            margen_actual = precio_promedio - costo_promedio
+            margen_simulado = nuevo_precio - nuevo_costo
+            
+            margen_porc_actual = (margen_actual / precio_promedio) * 100
+            margen_porc_simulado = (margen_simulado / nuevo_precio) * 100
+            
+            # Calcular impacto de eficiencia
+            tiempo_actual = producto_info['TiempoProd_Total(min)']
+            tiempo_simulado = tiempo_actual * (1 - mejora_eficiencia/100)
+            
+            # Mostrar resultados comparativos
+            col_res1, col_res2 = st.columns(2)
+            
+            with col_res1:
+                st.metric("Situación Actual", format_currency(margen_actual), 
+                         delta=f"{margen_porc_actual:.1f}%")
+                st.metric("Tiempo Producción Actual", f"{tiempo_actual} min")
+                
+            with col_res2:
+                st.metric("Situación Simulada", format_currency(margen_simulado), 
+                         delta=f"{margen_porc_simulado:.1f}%", 
+                         delta_color="inverse" if margen_simulado < margen_actual else "normal")
+                st.metric("Tiempo Producción Simulado", f"{tiempo_simulado:.1f} min",
+                         delta=f"-{mejora_eficiencia}%")
+            
+            # Gráfico comparativo
+            fig_comparativo = go.Figure()
+            
+            fig_comparativo.add_trace(go.Indicator(
+                mode = "number+delta",
+                value = margen_porc_simulado,
+                number = {'suffix': "%"},
+                delta = {'reference': margen_porc_actual, 'relative': False},
+                title = {"text": "Margen<br>Simulado vs Actual"},
+                domain = {'row': 0, 'column': 0}))
+            
+            fig_comparativo.add_trace(go.Indicator(
+                mode = "number+delta",
+                value = nuevo_costo,
+                number = {'prefix': "$"},
+                delta = {'reference': costo_promedio, 'relative': False},
+                title = {"text": "Costo Unitario<br>Simulado vs Actual"},
+                domain = {'row': 0, 'column': 1}))
+            
+            fig_comparativo.update_layout(
+                grid = {'rows': 1, 'columns': 2, 'pattern': "independent"})
+            
+            grafico(fig_comparativo, use_container_width=True)
+            
+            # Impacto financiero total
+            utilidad_actual = margen_actual * volumen_produccion
+            utilidad_simulada = margen_simulado * volumen_produccion
+            mejora_utilidad = utilidad_simulada - utilidad_actual
+            
+            # Eficiencia en tiempo
+            tiempo_total_actual = tiempo_actual * volumen_produccion
+            tiempo_total_simulado = tiempo_simulado * volumen_produccion
+            ahorro_tiempo = tiempo_total_actual - tiempo_total_simulado
+            
+            st.success(f"**Impacto en Utilidad Total:** {format_currency(mejora_utilidad)}")
+            st.info(f"**Ahorro de Tiempo Total:** {ahorro_tiempo:.0f} minutos ({ahorro_tiempo/60:.1f} horas)")
+            
+            # Análisis de sensibilidad
+            st.subheader("📈 Análisis de Sensibilidad")
+            
+            # Simular diferentes escenarios de precio
+            precios_test = np.linspace(precio_promedio * 0.7, precio_promedio * 1.3, 10)
+            utilidades_test = [(precio - nuevo_costo) * volumen_produccion for precio in precios_test]
+            
+            # Misma curva cuando el volumen responde al precio según la elasticidad estimada
+            respuesta_precio = estimar_respuesta(data['HUELLA'], -1.5, tensores)
+            elasticidad_producto = respuesta_precio['elasticidad'][tensores['productos'].tolist().index(producto_id)]
+            utilidades_respuesta = [(precio - nuevo_costo) * volumen_produccion * (precio / precio_promedio) ** elasticidad_producto
+                                    for precio in precios_test]
+            
+            fig_sensibilidad = px.line(x=precios_test, y=utilidades_test,
+                                      title="Sensibilidad de Utilidad vs Precio de Venta",
+                                      labels={'x': 'Precio de Venta ($)', 'y': 'Utilidad Total ($)'})
+            fig_sensibilidad.data[0].name = 'Volumen fijo'
+            fig_sensibilidad.data[0].showlegend = True
+            fig_sensibilidad.add_trace(go.Scatter(x=precios_test, y=utilidades_respuesta,
+                                                  name=f'Volumen con elasticidad {elasticidad_producto:.2f}',
+                                                  line=dict(color='orange', dash='dot')))
+            fig_sensibilidad.add_vline(x=nuevo_precio, line_dash="dash", line_color="red",
+                                     annotation_text="Precio Simulado")
+            grafico(fig_sensibilidad, use_container_width=True)
+
+            # El plan del escenario escala la fila del producto en todos los periodos
+            produccion_media = tensores['produccion'][tensores['productos'].tolist().index(producto_id)].mean()
+            parametros = {'producto': producto_id, 'precio': nuevo_precio / precio_promedio,
+                          'costo': 1 - reduccion_costos / 100, 'tiempo': 1 - mejora_eficiencia / 100,
+                          'volumen': volumen_produccion / produccion_media if produccion_media > 0 else 1.0}
+            formulario_escenario(
+                'simulador', f"{producto_sim} · precio {nuevo_precio:,.0f}",
+                lambda t: (escenarios.plan_ajustes(t, **parametros), parametros, {'motor': 'simulador_producto'}))
+
+# Optimización de precios de todo el catálogo
+@st.fragment
+@perfilada('simulaciones.panel_precios_catalogo')
+def panel_precios_catalogo():
+    data = datos_actuales()
+    st.subheader("💲 Optimización de Precios del Catálogo")
+    if data['DAT_PRODUCTOS_FIJOS'].empty or data['DAT_PM_MATRIX'].empty:
+        st.warning("Se necesitan los productos y su historia de precios para optimizar el catálogo")
+        return
+    tensores = tensores_actuales()
+    
+    col1, col2, col3 = st.columns(3)
+    with col1:
+        rango_precios = st.slider("Rango permitido (× precio actual):", 0.5, 1.5, (0.5, 1.5), 0.05,
+                                  key="precios_rango")
+    with col2:
+        elasticidad_defecto = st.slider("Elasticidad por defecto:", -4.0, -1.1, -1.5, 0.1,
+                                        key="precios_elasticidad",
+                                        help="Se usa cuando la historia no permite estimar una elasticidad negativa")
+    with col3:
+        acoplar_capacidad = st.checkbox("Considerar capacidad de procesos", value=False, key="precios_capacidad")
+        permitir_horas_extra = st.checkbox("Permitir horas extra", value=True, key="precios_horas_extra",
+                                           disabled=not acoplar_capacidad)
+    
+    optimo_precios = optimizar_precios(data['HUELLA'], elasticidad_defecto, rango_precios[0], rango_precios[1],
+                                       acoplar_capacidad, permitir_horas_extra, tensores)
+    nombres_productos = data['DAT_PRODUCTOS_FIJOS'].set_index('ID_Producto')['Nombre_Producto'].to_dict()
+    oportunidades = precios.ranking_oportunidades(optimo_precios, tensores, nombres_productos)
+    
+    col1, col2, col3 = st.columns(3)
+    with col1:
+        st.metric("Utilidad Actual del Catálogo", format_currency(oportunidades['Utilidad_Actual'].sum()))
+    with col2:
+        st.metric("Utilidad con Precios Óptimos", format_currency(oportunidades['Utilidad_Optima'].sum()))
+    with col3:
+        st.metric("Productos con Elasticidad Histórica", f"{(oportunidades['Fuente'] == 'Histórico').sum()} / {len(oportunidades)}")
+    
+    fig_oportunidades = px.bar(oportunidades.head(10), x='Producto', y='Ganancia', color='Cambio_Precio_%',
+                               title="Top 10 Oportunidades de Precio (Ganancia de Utilidad)",
+                               color_continuous_scale='RdYlGn',
+                               labels={'Ganancia': 'Ganancia de Utilidad ($)', 'Cambio_Precio_%': 'Cambio de Precio (%)'})
+    fig_oportunidades.update_layout(xaxis_tickangle=-45)
+    grafico(fig_oportunidades, use_container_width=True)
+    
+    tabla_paginada(('oportunidades', elasticidad_defecto, rango_precios, acoplar_capacidad, permitir_horas_extra),
+                   oportunidades, "tabla_oportunidades")
+
+    parametros = {'limite_inferior': rango_precios[0], 'limite_superior': rango_precios[1],
+                  'elasticidad_defecto': elasticidad_defecto, 'acoplar_capacidad': acoplar_capacidad,
+                  'permitir_horas_extra': permitir_horas_extra}
+    solucionador = {'motor': 'precios.optimizar_precios', 'iteraciones': 200 if acoplar_capacidad else 0}
+    formulario_escenario(
+        'precios', f"Precios óptimos {rango_precios[0]:.2f}-{rango_precios[1]:.2f} · e {elasticidad_defecto:.1f}",
+        lambda t: (escenarios.plan_precios(t, optimo_precios), parametros, solucionador))
+
+# Escenarios guardados: indicadores de cada uno y comparación de N planes contra una
+# referencia, con las celdas producto/proceso × periodo que más cambian
+@st.fragment
+@perfilada('simulaciones.panel_escenarios')
+def panel_escenarios():
+    data = datos_actuales()
+    tensores = tensores_actuales()
+    st.subheader("📚 Escenarios Guardados")
+    guardados = escenarios.listar(ESCENARIOS)
+    if guardados.empty or not guardados['Plan'].any():
+        st.info("Guarde escenarios desde el simulador o la optimización de precios para compararlos aquí.")
+        return
+
+    columnas = [c for c in ('Escenario', 'Fecha', 'Motor', 'Z', 'Ingresos', 'Horas_Extra', 'Inventario',
+                            'Puntuacion_Ponderada_%', 'Bytes') if c in guardados.columns]
+    tabla(guardados[columnas], use_container_width=True, hide_index=True)
+    st.caption(f"{len(guardados)} escenarios en {ESCENARIOS} "
+               f"({guardados['Bytes'].sum() / 1024:,.1f} KB)")
+
+    comparables = guardados.loc[guardados['Plan'] & (guardados['Huella'] == data['HUELLA']), 'Escenario'].tolist()
+    if not comparables:
+        st.info("Ningún escenario guardado tiene un plan sobre el dataset actual.")
+        return
+    col1, col2 = st.columns([3, 1])
+    with col1:
+        seleccion = st.multiselect("Escenarios a comparar:", comparables, default=comparables[:2],
+                                   key="escenarios_comparar")
+    with col2:
+        referencia = st.selectbox("Referencia:", seleccion or ['—'], key="escenarios_referencia")
+    if len(seleccion) < 2:
+        st.info("Elija al menos dos escenarios para compararlos.")
+        return
+
+    comparacion = escenarios.comparar(ESCENARIOS, seleccion, tensores, data['HUELLA'],
+                                      seleccion.index(referencia))
+    cambios = comparacion['cambios_kpis'][['Z', 'Ingresos', 'Costo_Horas_Extra', 'Horas_Extra', 'Inventario']]
+    tabla(cambios.round(0), use_container_width=True)
+
+    nombres_productos = data['DAT_PRODUCTOS_FIJOS'].set_index('ID_Producto')['Nombre_Producto'].to_dict()
+    otros = [e for e in seleccion if e != referencia]
+    escenario = st.selectbox("Detalle del escenario:", otros, key="escenarios_detalle")
+    k = seleccion.index(escenario)
+    fig_utilidad = px.imshow(comparacion['cambios']['utilidad'][k],
+                             x=comparacion['periodos'],
+                             y=[nombres_productos.get(p, p) for p in comparacion['productos']],
+                             color_continuous_scale='RdYlGn', color_continuous_midpoint=0, aspect='auto',
+                             title=f"Cambio de utilidad por producto y periodo: {escenario} vs {referencia}",
+                             labels={'x': 'Periodo', 'y': 'Producto', 'color': 'Cambio ($)'})
+    grafico(fig_utilidad, use_container_width=True)
+
+    st.markdown("**Mayores cambios (utilidad, horas extra e inventario)**")
+    mayores = escenarios.mayores_cambios(comparacion, 10)
+    mayores['Entidad'] = mayores['Entidad'].map(lambda e: nombres_productos.get(e, nombres_procesos.get(e, e)))
+    tabla(mayores, use_container_width=True, hide_index=True)
+
+    if st.button(f"🗑️ Eliminar «{escenario}»", key="escenarios_eliminar"):
+        escenarios.eliminar(ESCENARIOS, escenario)
+        st.rerun(scope='fragment')
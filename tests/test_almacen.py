@@ -0,0 +1,23 @@
+import numpy as np
+import pandas as pd
+
+from icatex import almacen
+
+
+# Un corte con más identificadores que variables ligadas admite SQLite se lee por trozos, en
+# el orden de importación y con los identificadores categóricos del catálogo de la planta
+def test_corte_con_muchos_productos(tmp_path):
+    ids = [f"P{i:04d}" for i in range(1500)]
+    data = {
+        'SET_PRODUCTOS': pd.DataFrame({'ID_Producto': ids}),
+        'RES_PRODUCCION': pd.DataFrame({'ID_Producto': np.repeat(ids, 2),
+                                        'Periodo_Index': np.tile([1, 2], len(ids)),
+                                        'Produccion': np.arange(2 * len(ids), dtype=float)}),
+    }
+    ruta = tmp_path / 'plantas.db'
+    almacen.guardar_datos(ruta, data)
+    pedidos = ids[::-1][:1200]
+    corte = almacen.leer_corte(ruta, almacen.PLANTA_DEFECTO, 'RES_PRODUCCION', productos=pedidos)
+    assert len(corte) == 2 * len(pedidos)
+    assert corte['Produccion'].is_monotonic_increasing
+    assert list(corte['ID_Producto'].cat.categories) == ids
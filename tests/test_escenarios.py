@@ -0,0 +1,23 @@
+import pandas as pd
+
+from icatex import escenarios
+from icatex.datos import HOJA_METAS, cargar_datos
+
+
+# Las desviaciones de las metas salen de la hoja RES_METAS del dataset si la trae, y ver la
+# referencia de LINGO no escribe nada en el almacén
+def test_metas_desde_el_dataset(tmp_path):
+    pd.DataFrame({'Desviacion': ['D_UTIL_NEG', 'D_HE_POS'], 'Valor': [1000000.0, 20000.0]}).to_parquet(
+        tmp_path / f"{HOJA_METAS}.parquet")
+    data, _ = cargar_datos(tmp_path)
+    referencia = escenarios.referencia_metas_lingo(data)
+    assert referencia['kpis']['Z'] == 11000000.0
+    assert referencia['kpis']['D_HE_POS'] == 20000.0
+    assert referencia['huella'] == data['HUELLA']
+    assert escenarios.archivos(tmp_path / 'escenarios') == []
+
+
+def test_metas_sin_hoja_usan_la_corrida_de_lingo(tmp_path):
+    data, _ = cargar_datos(tmp_path)
+    assert HOJA_METAS not in data
+    assert escenarios.kpis_metas_lingo(data)['D_UTIL_NEG'] == escenarios.DESVIACIONES_LINGO['D_UTIL_NEG']
@@ -0,0 +1,24 @@
+import numpy as np
+
+from icatex.datos import cargar_datos
+from icatex.tensores import construir_tensores
+
+
+# Sin libro (o con hojas que no cargaron) los tensores quedan con ejes vacíos en lugar de
+# fallar, y las secciones pueden mostrar los avisos de carga
+def test_libro_ausente_da_tensores_vacios(tmp_path):
+    data, avisos = cargar_datos(tmp_path / 'no_existe.xlsx')
+    assert avisos
+    tensores = construir_tensores(data)
+    for eje in ('productos', 'insumos', 'procesos', 'periodos'):
+        assert len(tensores[eje]) == 0
+    assert tensores['produccion'].shape == (0, 0)
+    assert tensores['horas_extra'].shape == (0, 0)
+    assert tensores['PI'].shape == (0, 0)
+    assert np.asarray(tensores['costo_almacen']).shape == (0,)
+
+
+def test_conjunto_sin_columna_de_id():
+    data, _ = cargar_datos('no_existe.xlsx')
+    data['SET_PRODUCTOS'] = data['SET_PRODUCTOS'].assign(Otra=[])
+    assert len(construir_tensores(data)['productos']) == 0